@@ -0,0 +1,63 @@
+"""Benchmark JSON decoding of the recorded API responses.
+
+Run from the repository root::
+
+    python benchmarks/bench_decoder.py
+"""
+
+import json
+from os import path
+import os
+import sys
+import timeit
+
+from requests import Response
+
+sys.path.insert(0, path.join(path.dirname(__file__), ".."))
+
+from sunweg.decoder import decode_json_orjson, decode_json_stdlib  # noqa: E402
+from sunweg.decoder import orjson  # noqa: E402
+
+RESPONSES = path.join(path.dirname(__file__), "..", "tests", "responses")
+
+
+def recorded_responses() -> dict[str, bytes]:
+    """Read the recorded JSON responses, plus an inverter with many strings."""
+    contents = {}
+    for file in sorted(os.listdir(RESPONSES)):
+        if file.endswith(".json"):
+            with open(path.join(RESPONSES, file), "rb") as f:
+                contents[file] = f.read()
+    inverter = json.loads(contents["inverter_success_response.json"])
+    inverter["stringmppt"] = inverter["stringmppt"] * 100
+    contents["inverter_x100 (synthetic)"] = json.dumps(inverter).encode()
+    return contents
+
+
+def response_json(content: bytes) -> object:
+    """Decode like `Response.json`, going through text."""
+    response = Response()
+    response._content = content
+    response.encoding = "utf-8"
+    return response.json()
+
+
+def main(number: int = 2000) -> None:
+    """Print the time per decode of each decoder."""
+    decoders = {"Response.json": response_json, "json bytes": decode_json_stdlib}
+    if orjson is not None:
+        decoders["orjson bytes"] = decode_json_orjson
+    print("%-36s %8s " % ("response", "bytes") + " ".join("%14s" % n for n in decoders))
+    for name, content in recorded_responses().items():
+        times = [
+            timeit.timeit(lambda: decoder(content), number=number) / number * 1e6
+            for decoder in decoders.values()
+        ]
+        print(
+            "%-36s %8d " % (name, len(content))
+            + " ".join("%12.1fus" % time for time in times)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark the memory used by each model object.
+
+Compares the slotted models with the same classes backed by an instance
+``__dict__``, as they were before. Run from the repository root::
+
+    python benchmarks/bench_memory.py
+"""
+
+from datetime import date, datetime
+from os import path
+import sys
+import tracemalloc
+
+sys.path.insert(0, path.join(path.dirname(__file__), ".."))
+
+from sunweg.device import MPPT, Inverter, Phase, String  # noqa: E402
+from sunweg.plant import Plant  # noqa: E402
+from sunweg.util import ProductionStats, Status  # noqa: E402
+
+ARGS = {
+    Plant: (1, "Plant", 1.0, 0.0, 0.0, 0.0, 1.0, "kWh", 1.0, 0.0, datetime.now()),
+    Inverter: (1, "Inverter", "SN", Status.OK, 40.0),
+    MPPT: ("MPPT1",),
+    String: ("STR1", 1.0, 2.0, Status.OK),
+    Phase: ("A", 220.0, 1.0, Status.OK, Status.OK),
+    ProductionStats: (date(2024, 5, 1), 1.0, 2.0),
+}
+
+
+def bytes_per_object(cls: type, args: tuple, number: int) -> float:
+    """Measure the memory allocated by each new object."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [cls(*args) for _ in range(number)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return size / number
+
+
+def main(number: int = 20000) -> None:
+    """Print the bytes per object of each model, with and without slots."""
+    print("%-16s %10s %10s %8s" % ("model", "dict", "slots", "saved"))
+    for cls, args in ARGS.items():
+        unslotted = type(cls.__name__, (), {"__init__": cls.__init__})
+        dict_size = bytes_per_object(unslotted, args, number)
+        slots_size = bytes_per_object(cls, args, number)
+        print(
+            "%-16s %10.0f %10.0f %7.0f%%"
+            % (cls.__name__, dict_size, slots_size, 100 * (1 - slots_size / dict_size))
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the value/metric and timestamp parsers.
+
+Compares the fast paths with the general split and dateutil parsing on the
+formats of the recorded responses. Run from the repository root::
+
+    python benchmarks/bench_parsers.py
+"""
+
+from os import path
+import sys
+import timeit
+
+from dateutil import parser
+
+sys.path.insert(0, path.join(path.dirname(__file__), ".."))
+
+from sunweg.util import parse_date, parse_datetime, separate_value_metric  # noqa: E402
+
+
+def split_value_metric(
+    value_with_metric: str | None, default_metric: str = "", metric_before: bool = False
+) -> tuple[float, str]:
+    """Separate value and metric as the API helper used to."""
+    if value_with_metric is None or len(value_with_metric) == 0:
+        return (0.0, default_metric)
+    split = value_with_metric.split(" ")
+    if metric_before:
+        return (
+            (
+                float(split[0].replace(",", "."))
+                if len(split) < 2
+                else float(split[1].replace(",", "."))
+            ),
+            default_metric if len(split) < 2 else split[0],
+        )
+    return (
+        float(split[0].replace(",", ".")),
+        default_metric if len(split) < 2 else split[1],
+    )
+
+
+CASES = [
+    (
+        "value/metric",
+        "1,23 kWh",
+        lambda value: split_value_metric(value, "kWh"),
+        lambda value: separate_value_metric(value, "kWh"),
+    ),
+    (
+        "metric/value",
+        "R$ 12,78",
+        lambda value: split_value_metric(value, metric_before=True),
+        lambda value: separate_value_metric(value, metric_before=True),
+    ),
+    (
+        "ISO date",
+        "2024-05-29",
+        lambda value: parser.parse(value).date(),
+        parse_date,
+    ),
+    (
+        "RFC 1123 date",
+        "Fri, 03 May 2024 00:00:00 GMT",
+        lambda value: parser.parse(value).date(),
+        parse_date,
+    ),
+    (
+        "date and time",
+        "2023-02-25 08:04:22",
+        parser.parse,
+        parse_datetime,
+    ),
+]
+
+
+def main(number: int = 20000) -> None:
+    """Print the time per value of the general and fast parsers."""
+    print("%-16s %12s %12s %8s" % ("format", "general", "fast", "speedup"))
+    for name, value, general, fast in CASES:
+        assert general(value) == fast(value)
+        general_time, fast_time = (
+            timeit.timeit(lambda: parse(value), number=number) / number * 1e6
+            for parse in (general, fast)
+        )
+        print(
+            "%-16s %10.2fus %10.2fus %7.1fx"
+            % (name, general_time, fast_time, general_time / fast_time)
+        )
+
+
+if __name__ == "__main__":
+    main()
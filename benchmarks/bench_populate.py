@@ -0,0 +1,56 @@
+"""Benchmark filling an inverter from the recorded inverter response.
+
+Compares filling the readings arrays only with also building the MPPT, string
+and phase objects. Run from the repository root::
+
+    python benchmarks/bench_populate.py
+"""
+
+import json
+from os import path
+import sys
+import timeit
+
+sys.path.insert(0, path.join(path.dirname(__file__), ".."))
+
+from sunweg.api import populate_mppt  # noqa: E402
+from sunweg.device import Inverter  # noqa: E402
+from sunweg.util import Status  # noqa: E402
+
+RESPONSE = path.join(
+    path.dirname(__file__), "..", "tests", "responses", "inverter_success_response.json"
+)
+
+
+def populate(result: dict, build_objects: bool) -> Inverter:
+    """Populate a new inverter, optionally building the object graph."""
+    inverter = Inverter(1, "Inverter", "SN", Status.OK, 40.0)
+    populate_mppt(result, inverter)
+    if build_objects:
+        inverter.mppts
+        inverter.phases
+    return inverter
+
+
+def main(number: int = 2000) -> None:
+    """Print the time per inverter with and without building objects."""
+    with open(RESPONSE) as f:
+        result = json.load(f)
+    for scale in (1, 50):
+        scaled = dict(result, stringmppt=result["stringmppt"] * scale)
+        for build_objects in (False, True):
+            seconds = timeit.timeit(
+                lambda: populate(scaled, build_objects), number=number // scale
+            )
+            print(
+                "strings x%-3d %-16s %10.1fus"
+                % (
+                    scale,
+                    "objects" if build_objects else "readings only",
+                    seconds / (number // scale) * 1e6,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,12 @@ requires = [
     "requests",
 ]
 
+extras_require = {
+    "async": ["aiohttp"],
+    "numpy": ["numpy"],
+    "orjson": ["orjson"],
+}
+
 setuptools.setup(
     name="sunweg",
     version="3.1.0",
@@ -22,6 +28,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/rokam/sunweg",
     install_requires=requires,
+    extras_require=extras_require,
     packages=setuptools.find_packages(exclude=["tests", "tests.*"]),
     python_requires=">=3.10",
     classifiers=[
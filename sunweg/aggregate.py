@@ -0,0 +1,309 @@
+"""Sunweg API fleet rollups over plants and inverters."""
+
+from collections import Counter
+from collections.abc import Iterable
+import math
+
+from .device import Inverter, String
+from .plant import Plant
+from .util import Status, slots_dict
+
+StringKey = tuple[int, int, str]
+"""Plant id, inverter id and MPPT name of a string"""
+
+_SEVERITY = {Status.OK.value: 0, Status.WARN.value: 1, Status.ERROR.value: 2}
+
+
+def _is_worse(status: int, power: float, worst: tuple[int, float] | None) -> bool:
+    """Compare a string with the worst one so far, by severity then lowest power."""
+    if worst is None:
+        return True
+    severity = _SEVERITY[status]
+    return severity > worst[0] or (severity == worst[0] and power < worst[1])
+
+
+def _worst_strings(inverter: Inverter) -> dict[str, String]:
+    """
+    Find the worst string of each MPPT of an inverter.
+
+    The readings arrays are scanned when the inverter has readings, so no string
+    objects are built except for the worst ones.
+    """
+    readings = inverter.readings
+    if readings is None:
+        worst_strings: dict[str, String] = {}
+        for mppt in inverter.mppts:
+            worst: tuple[int, float] | None = None
+            for string in mppt.strings:
+                power = string.voltage * string.amperage
+                if _is_worse(string.status.value, power, worst):
+                    worst = (_SEVERITY[string.status.value], power)
+                    worst_strings[mppt.name] = string
+        return worst_strings
+
+    worst_index: dict[int, int] = {}
+    worst_rank: dict[int, tuple[int, float]] = {}
+    for index, (mppt, voltage, amperage, status) in enumerate(
+        zip(
+            readings.string_mppt,
+            readings.string_voltage,
+            readings.string_amperage,
+            readings.string_status,
+        )
+    ):
+        power = voltage * amperage
+        if _is_worse(status, power, worst_rank.get(mppt)):
+            worst_rank[mppt] = (_SEVERITY[status], power)
+            worst_index[mppt] = index
+    return {
+        readings.mppt_names[mppt]: String(
+            readings.string_names[index],
+            readings.string_voltage[index],
+            readings.string_amperage[index],
+            Status(readings.string_status[index]),
+        )
+        for mppt, index in worst_index.items()
+    }
+
+
+def _known_sum(values: Iterable[float | None]) -> float:
+    """Sum the values in a known unit."""
+    return math.fsum(value for value in values if value is not None)
+
+
+class PlantRollup:
+    """Contribution of a plant to the fleet rollups, computed in one pass."""
+
+    __slots__ = (
+        "_plant_id",
+        "_power_w",
+        "_today_energy_wh",
+        "_total_energy_wh",
+        "_status_counts",
+        "_worst_strings",
+    )
+
+    def __init__(self, plant: Plant) -> None:
+        """
+        Initialize PlantRollup.
+
+        :param plant: plant, with its inverters
+        :type plant: Plant
+        """
+        self._plant_id = plant.id
+        self._power_w = plant.total_power_w
+        self._today_energy_wh = plant.today_energy_wh
+        self._total_energy_wh = plant.total_energy_wh
+        self._status_counts: Counter[Status] = Counter()
+        self._worst_strings: dict[StringKey, String] = {}
+        for inverter in plant.inverters:
+            self._status_counts[inverter.status] += 1
+            for mppt_name, string in _worst_strings(inverter).items():
+                self._worst_strings[(plant.id, inverter.id, mppt_name)] = string
+
+    @property
+    def plant_id(self) -> int:
+        """
+        Get plant id.
+
+        :return: plant id
+        :rtype: int
+        """
+        return self._plant_id
+
+    @property
+    def power_w(self) -> float | None:
+        """
+        Get plant power in W.
+
+        :return: plant power in W, None when its unit is unknown
+        :rtype: float | None
+        """
+        return self._power_w
+
+    @property
+    def today_energy_wh(self) -> float | None:
+        """
+        Get plant today generated energy in Wh.
+
+        :return: plant today generated energy in Wh, None when its unit is unknown
+        :rtype: float | None
+        """
+        return self._today_energy_wh
+
+    @property
+    def total_energy_wh(self) -> float:
+        """
+        Get plant total generated energy in Wh.
+
+        :return: plant total generated energy in Wh
+        :rtype: float
+        """
+        return self._total_energy_wh
+
+    @property
+    def status_counts(self) -> Counter[Status]:
+        """
+        Get the number of inverters by status.
+
+        :return: number of inverters by status
+        :rtype: Counter[Status]
+        """
+        return self._status_counts
+
+    @property
+    def worst_strings(self) -> dict[StringKey, String]:
+        """
+        Get the worst string of each MPPT.
+
+        The worst string has the most severe status, then the lowest power. Only
+        inverters with readings or MPPTs, like completed ones, have strings.
+
+        :return: worst string by plant id, inverter id and MPPT name
+        :rtype: dict[StringKey, String]
+        """
+        return self._worst_strings
+
+    def __str__(self) -> str:
+        """Cast PlantRollup to str."""
+        return str(self.__class__) + ": " + str(slots_dict(self))
+
+
+class FleetAggregator:
+    """
+    Fleet rollups kept up to date plant by plant.
+
+    Updating a plant only scans that plant's inverters and strings: its previous
+    contribution is replaced in the status counts and worst strings, and the
+    totals are summed again over the per plant rollups. Plant values in an
+    unknown unit are left out of the totals.
+    """
+
+    def __init__(self, plants: Iterable[Plant] = ()) -> None:
+        """
+        Initialize FleetAggregator.
+
+        :param plants: initial plants
+        :type plants: Iterable[Plant]
+        """
+        self._rollups: dict[int, PlantRollup] = {}
+        self._status_counts: Counter[Status] = Counter()
+        self._worst_strings: dict[StringKey, String] = {}
+        self._totals: tuple[float, float, float] | None = None
+        for plant in plants:
+            self.update(plant)
+
+    def update(self, plant: Plant) -> PlantRollup:
+        """
+        Add a plant, or replace its previous contribution after a refresh.
+
+        :param plant: plant, with its inverters
+        :type plant: Plant
+        :return: plant rollup
+        :rtype: PlantRollup
+        """
+        rollup = PlantRollup(plant)
+        self._discard(plant.id)
+        self._rollups[plant.id] = rollup
+        self._status_counts.update(rollup.status_counts)
+        self._worst_strings.update(rollup.worst_strings)
+        return rollup
+
+    def remove(self, plant_id: int) -> None:
+        """
+        Remove a plant.
+
+        :param plant_id: plant id
+        :type plant_id: int
+        :raises KeyError: when the plant was not added
+        """
+        if plant_id not in self._rollups:
+            raise KeyError(plant_id)
+        self._discard(plant_id)
+
+    def _discard(self, plant_id: int) -> None:
+        """Remove the contribution of a plant, if any."""
+        rollup = self._rollups.pop(plant_id, None)
+        self._totals = None
+        if rollup is None:
+            return
+        self._status_counts.subtract(rollup.status_counts)
+        self._status_counts = +self._status_counts
+        for key in rollup.worst_strings:
+            del self._worst_strings[key]
+
+    def rollup(self, plant_id: int) -> PlantRollup | None:
+        """
+        Get the rollup of a plant.
+
+        :param plant_id: plant id
+        :type plant_id: int
+        :return: plant rollup, None when the plant was not added
+        :rtype: PlantRollup | None
+        """
+        return self._rollups.get(plant_id)
+
+    def __len__(self) -> int:
+        """Get the number of plants."""
+        return len(self._rollups)
+
+    def _sums(self) -> tuple[float, float, float]:
+        """Sum the plant totals, once per change."""
+        if self._totals is None:
+            rollups = self._rollups.values()
+            self._totals = (
+                _known_sum(rollup.power_w for rollup in rollups),
+                _known_sum(rollup.today_energy_wh for rollup in rollups),
+                _known_sum(rollup.total_energy_wh for rollup in rollups),
+            )
+        return self._totals
+
+    @property
+    def power_w(self) -> float:
+        """
+        Get fleet power in W.
+
+        :return: fleet power in W
+        :rtype: float
+        """
+        return self._sums()[0]
+
+    @property
+    def today_energy_wh(self) -> float:
+        """
+        Get fleet today generated energy in Wh.
+
+        :return: fleet today generated energy in Wh
+        :rtype: float
+        """
+        return self._sums()[1]
+
+    @property
+    def total_energy_wh(self) -> float:
+        """
+        Get fleet total generated energy in Wh.
+
+        :return: fleet total generated energy in Wh
+        :rtype: float
+        """
+        return self._sums()[2]
+
+    @property
+    def status_counts(self) -> dict[Status, int]:
+        """
+        Get the number of inverters by status.
+
+        :return: number of inverters by status, for every status
+        :rtype: dict[Status, int]
+        """
+        return {status: self._status_counts[status] for status in Status}
+
+    @property
+    def worst_strings(self) -> dict[StringKey, String]:
+        """
+        Get the worst string of each MPPT of the fleet.
+
+        :return: worst string by plant id, inverter id and MPPT name
+        :rtype: dict[StringKey, String]
+        """
+        return dict(self._worst_strings)
@@ -1,22 +1,61 @@
 """API Helper."""
 
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
+import hashlib
 import json
-from dateutil import parser
+import logging
+import time
+from datetime import date
 from typing import Any
 
-from requests import Response, session
+from requests import ConnectionError, RequestException, Response, Session, Timeout
 
+from .auth import TokenManager, TokenStore, load_token, save_token
+from .cache import ResponseCache
+from .circuit import CircuitBreaker, is_failure_status
+from .decoder import JsonDecoder, default_decoder
 from .const import (
     SUNWEG_INVERTER_DETAIL_PATH,
     SUNWEG_LOGIN_PATH,
     SUNWEG_MONTH_STATS_PATH,
     SUNWEG_PLANT_DETAIL_PATH,
-    SUNWEG_PLANT_LIST_PATH,
+    SUNWEG_PLANT_LIST_PAGE_PATH,
+    SUNWEG_PLANT_LIST_PAGE_SIZE,
     SUNWEG_URL,
 )
-from .device import MPPT, Inverter, Phase, String
-from .plant import Plant
-from .util import ProductionStats, Status
+from .device import Inverter
+from .lazy import LazyInverter, LazyPlant, readings_from_response
+from .plant import Plant, PlantSummary
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, default_retry_policy
+from .store import ProductionStatsStore
+from .transport import TransportConfig
+from .util import (  # noqa: F401 (convert_situation_status is re-exported)
+    PlantStatus,
+    ProductionStats,
+    Status,
+    convert_situation_status,
+    months_between,
+    parse_date,
+    parse_datetime,
+    separate_value_metric,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ResponseValidator = tuple[str | None, str | None, str]
+"""ETag, Last-Modified and body digest of a response"""
+
+PAYLOAD_ERRORS = (KeyError, TypeError, ValueError)
+"""Errors raised while parsing a malformed response payload"""
 
 
 class SunWegApiError(RuntimeError):
@@ -31,53 +70,236 @@ class LoginError(SunWegApiError):
     pass
 
 
-def convert_situation_status(situation: int) -> Status:
+class CircuitOpenError(SunWegApiError):
+    """Request refused because the circuit breaker is open."""
+
+    pass
+
+
+def plant_summaries_from_response(result: dict) -> list[PlantSummary]:
+    """
+    Extract the plant summaries from a plant list response.
+
+    :param result: decoded plant list response
+    :type result: dict
+    :return: list of plant summaries
+    :rtype: list[PlantSummary]
+    """
+    return [
+        PlantSummary(plant["id"], status)
+        for status in PlantStatus
+        for plant in result[status.value]
+    ]
+
+
+def plant_ids_from_response(result: dict) -> list[int]:
+    """
+    Extract the plant ids from a plant list response.
+
+    :param result: decoded plant list response
+    :type result: dict
+    :return: list of plant ids
+    :rtype: list[int]
+    """
+    return [summary.id for summary in plant_summaries_from_response(result)]
+
+
+def plant_from_response(id: int, result: dict, lazy: bool = False) -> Plant:
+    """
+    Build a Plant from a plant detail response.
+
+    :param id: plant id
+    :type id: int
+    :param result: decoded plant detail response
+    :type result: dict
+    :param lazy: convert each field on first access instead of now
+    :type lazy: bool
+    :return: Plant with incomplete inverter information
+    :rtype: Plant
+    """
+    if lazy:
+        return LazyPlant(id, result)
+    (today_energy, today_energy_metric) = separate_value_metric(
+        result["energiadia"], "kWh"
+    )
+    (total_power, total_power_metric) = separate_value_metric(
+        result["AcumuladoPotencia"], "kW"
+    )
+    saving = separate_value_metric(result["economia"], metric_before=True)[0]
+    plant = Plant(
+        id=id,
+        name=result["usinas"]["nome"],
+        total_power=total_power,
+        kwh_per_kwp=float(0),
+        performance_rate=float(0),
+        saving=saving,
+        today_energy=today_energy,
+        today_energy_metric=today_energy_metric,
+        total_energy=float(result["energiaacumuladanumber"]),
+        total_carbon_saving=result["reduz_carbono_total_number"],
+        last_update=parse_datetime(result["ultimaAtualizacao"])
+        if result["ultimaAtualizacao"] is not None
+        else None,
+        total_power_metric=total_power_metric,
+    )
+
+    plant.inverters.extend(
+        [
+            Inverter(
+                id=inv["id"],
+                name=inv["nome"],
+                sn=inv["esn"],
+                status=Status(int(inv["situacao"])),
+                temperature=inv["temperatura"],
+            )
+            for inv in result["usinas"]["inversores"]
+        ]
+    )
+    return plant
+
+
+def inverter_from_response(id: int, result: dict, lazy: bool = False) -> Inverter:
+    """
+    Build an Inverter from an inverter detail response.
+
+    :param id: inverter id
+    :type id: int
+    :param result: decoded inverter detail response
+    :type result: dict
+    :param lazy: convert each field on first access instead of now
+    :type lazy: bool
+    :return: complete Inverter
+    :rtype: Inverter
+    """
+    if lazy:
+        return LazyInverter(id, result)
+    inverter = Inverter(
+        id=id,
+        name=result["inversor"]["nome"],
+        sn=result["inversor"]["esn"],
+        status=Status(int(result["statusInversor"])),
+        temperature=result["temperatura"],
+    )
+    complete_inverter_from_response(inverter, result)
+    return inverter
+
+
+def complete_inverter_from_response(inverter: Inverter, result: dict) -> None:
+    """
+    Complete inverter data from an inverter detail response.
+
+    :param inverter: inverter object to be completed with information
+    :type inverter: Inverter
+    :param result: decoded inverter detail response
+    :type result: dict
+    """
+    (
+        inverter.total_energy,
+        inverter.total_energy_metric,
+    ) = separate_value_metric(result["energiaacumulada"], "kWh")
+    (
+        inverter.today_energy,
+        inverter.today_energy_metric,
+    ) = separate_value_metric(result["energiadodia"], "kWh")
+    (inverter.power, inverter.power_metric) = separate_value_metric(
+        result["potenciaativa"], "kW"
+    )
+    inverter.power_factor = float(result["fatorpotencia"].replace(",", "."))
+    inverter.frequency = float(result["frequencia"].replace(",", "."))
+
+    populate_mppt(result=result, inverter=inverter)
+
+
+def populate_mppt(result: dict, inverter: Inverter) -> None:
     """
-    Convert situation to status.
+    Populate MPPT and phase information inside an inverter.
 
-    :param situation: situation
-    :type situation: int
-    :return: equivalent status
-    :rtype: Status
+    The readings are stored in the arrays of `Inverter.readings`, and the MPPT,
+    string and phase objects are only built when they are first accessed.
+
+    :param result: decoded inverter detail response
+    :type result: dict
+    :param inverter: inverter to be populated
+    :type inverter: Inverter
     """
-    if situation == 0:
-        return Status.ERROR
-    if situation == 1:
-        return Status.OK
-    return Status.WARN
+    inverter.readings = readings_from_response(result)
 
 
-def separate_value_metric(
-    value_with_metric: str | None, default_metric: str = "", metric_before: bool = False
-) -> tuple[float, str]:
+def production_stats_from_response(result: dict) -> list[ProductionStats]:
     """
-    Separate the value from the metric.
-
-    :param value_with_metric: value with metric separated by space
-    :type value_with_metric: str | None
-    :param default_metric: metric that should be returned if `value_with_metric` is None
-    :type default_metric: str
-    :param metric_before: true when metric appears before the value
-    :type metric_before: bool
-    :return: tuple with value and metric
-    :rtype: tuple[float, str]
+    Build the daily production statistics from a month stats response.
+
+    :param result: decoded month stats response
+    :type result: dict
+    :return: list of daily energy production statistics
+    :rtype: list[ProductionStats]
     """
-    if value_with_metric is None or len(value_with_metric) == 0:
-        return (0.0, default_metric)
-    split = value_with_metric.split(" ")
-    if metric_before:
-        return (
-            float(split[0].replace(",", "."))
-            if len(split) < 2
-            else float(split[1].replace(",", ".")),
-            default_metric if len(split) < 2 else split[0],
+    return [
+        ProductionStats(
+            parse_date(item["tempoatual"]),
+            float(item["energiapordia"]),
+            float(item["prognostico"]),
         )
+        for item in result["graficomes"]
+    ]
+
+
+def month_stats_path(
+    year: int, month: int, plant_id: int, inverter_id: int | None = None
+) -> str:
+    """
+    Build the month stats request path.
+
+    :param year: statistics year
+    :type year: int
+    :param month: statistics month
+    :type month: int
+    :param plant_id: id of statistics plant
+    :type plant_id: int
+    :param inverter_id: id of statistics inverter, None for every inverter
+    :type inverter_id: int | None
+    :return: request path
+    :rtype: str
+    """
+    inverter_str: str = str(inverter_id) if inverter_id is not None else ""
     return (
-        float(split[0].replace(",", ".")),
-        default_metric if len(split) < 2 else split[1],
+        SUNWEG_MONTH_STATS_PATH
+        + f"idusina={plant_id}&idinversor={inverter_str}&date={format(month,'02')}/{year}"
     )
 
 
+def response_digest(content: bytes) -> str:
+    """
+    Digest a response body to detect changes without decoding it.
+
+    :param content: raw response body
+    :type content: bytes
+    :return: hex digest of the body
+    :rtype: str
+    """
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def conditional_headers(validator: ResponseValidator | None) -> dict[str, str]:
+    """
+    Build the conditional request headers of a previous response.
+
+    :param validator: ETag, Last-Modified and digest of the previous response
+    :type validator: ResponseValidator | None
+    :return: If-None-Match and If-Modified-Since headers sent by the server
+    :rtype: dict[str, str]
+    """
+    headers: dict[str, str] = {}
+    if validator is None:
+        return headers
+    (etag, last_modified, _) = validator
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    if last_modified is not None:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
 class APIHelper:
     """Class to call sunweg.net api."""
 
@@ -88,6 +310,17 @@ class APIHelper:
         username: str | None = None,
         password: str | None = None,
         token: str | None = None,
+        cache: ResponseCache | None = None,
+        stats_store: ProductionStatsStore | None = None,
+        token_manager: TokenManager | None = None,
+        token_store: TokenStore | None = None,
+        session: Session | None = None,
+        transport: TransportConfig | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        json_decoder: JsonDecoder | None = None,
+        lazy_models: bool = False,
     ) -> None:
         """
         Initialize APIHelper for SunWEG platform.
@@ -95,14 +328,60 @@ class APIHelper:
         :param username: username for authentication
         :param password: password for authentication
         :param token: token for authentication
+        :param cache: cache of GET responses, None to disable caching
+        :param stats_store: persistent store of month statistics
+        :param token_manager: token holder, can be shared by helpers of one account
+        :param token_store: storage of the token shared between runs
+        :param session: shared requests session, used as is instead of building one
+        :param transport: connection pool, keep-alive and timeout settings
+        :param retry_policy: retry of transient failures, budgeted by default, shareable
+        :param rate_limiter: request rate limit, can be shared by helpers and threads
+        :param circuit_breaker: breaker failing fast while the server is down
+        :param json_decoder: decoder of raw response bodies, orjson when installed
+        :param lazy_models: build plants and inverters converting fields on demand
         :type username: str
         :type password: str
         :type token: str
+        :type cache: ResponseCache | None
+        :type stats_store: ProductionStatsStore | None
+        :type token_manager: TokenManager | None
+        :type token_store: TokenStore | None
+        :type session: Session | None
+        :type transport: TransportConfig | None
+        :type retry_policy: RetryPolicy | None
+        :type rate_limiter: RateLimiter | None
+        :type circuit_breaker: CircuitBreaker | None
+        :type json_decoder: JsonDecoder | None
+        :type lazy_models: bool
         """
-        self._token = token
+        self.token_manager = token_manager or TokenManager()
+        self.token_store = token_store
+        if token is None and token_store is not None and username is not None:
+            token = load_token(token_store, username)
+        if token is not None:
+            self._token = token
         self._username = username
         self._password = password
-        self.session = session()
+        self.cache = cache
+        self.stats_store = stats_store
+        self.transport = transport or TransportConfig()
+        self.session = session or self.transport.build_session()
+        self.retry_policy = retry_policy or default_retry_policy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.json_decoder = json_decoder or default_decoder()
+        self.lazy_models = lazy_models
+        self._plant_validators: dict[int, ResponseValidator] = {}
+
+    @property
+    def _token(self) -> str | None:
+        """Get authentication token."""
+        return self.token_manager.token
+
+    @_token.setter
+    def _token(self, token: str | None) -> None:
+        """Set authentication token."""
+        self.token_manager.token = token
 
     def set_token(self, token: str) -> None:
         """
@@ -150,10 +429,12 @@ class APIHelper:
             default=lambda o: o.__dict__,
         )
 
-        result = self._post(SUNWEG_LOGIN_PATH, user_data, False)
+        result = self._post(SUNWEG_LOGIN_PATH, user_data, False, retry=False)
         if not result["success"]:
             return False
         self._token = result["token"]
+        if self.token_store is not None:
+            save_token(self.token_store, self._username, result["token"])
         return result["success"]
 
     def _headers(self):
@@ -162,38 +443,244 @@ class APIHelper:
             return {"Content-Type": "application/json"}
         return {"Content-Type": "application/json", "X-Auth-Token-Update": self._token}
 
-    def listPlants(self, retry=True) -> list[Plant]:
+    def listPlants(
+        self,
+        retry=True,
+        max_workers: int = 1,
+        failures: dict[int, Exception] | None = None,
+    ) -> list[Plant]:
         """
         Retrieve the list of plants with incomplete inverter information.
 
         You may want to call `complete_inverter()` to complete the Inverter information.
 
+        Plant details are fetched by up to `max_workers` threads sharing this helper's
+        session. A plant whose request fails is left out of the list and its error is
+        stored in `failures`, keyed by plant id.
+
         :param retry: reauthenticate if token expired and retry
         :type retry: bool
-        :return: list of Plant
+        :param max_workers: maximum number of plant details fetched at the same time
+        :type max_workers: int
+        :param failures: dict that receives the error of each plant that failed
+        :type failures: dict[int, Exception] | None
+        :return: list of Plant in the same order as returned by the server
         :rtype: list[Plant]
         """
+        ids = list(self.iter_plant_ids(prefetch=0, retry=retry))
+        return self._plants(ids, max_workers, failures)
+
+    def list_plant_summaries(
+        self, page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE, retry: bool = True
+    ) -> list[PlantSummary]:
+        """
+        Retrieve the id and status bucket of every plant.
+
+        Only the plant list is requested, no plant details.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: list of plant summaries
+        :rtype: list[PlantSummary]
+        """
+        return list(self.iter_plant_summaries(page_size, prefetch=0, retry=retry))
+
+    def iter_plant_summaries(
+        self,
+        page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE,
+        prefetch: int = 1,
+        retry: bool = True,
+    ) -> Iterator[PlantSummary]:
+        """
+        Iterate over the summary of every plant, walking all the plant list pages.
+
+        While the summaries of a page are being consumed, up to `prefetch` following
+        pages are requested in background threads.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param prefetch: number of pages requested ahead of the current one
+        :type prefetch: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: iterator of plant summaries
+        :rtype: Iterator[PlantSummary]
+        :raises LoginError: when authentication fails after the first page
+        """
+        seen: set[int] = set()
+        next_page = 1
+        pending: deque[Future[list[PlantSummary]]] = deque()
+        pool = ThreadPoolExecutor(max_workers=max(prefetch, 1))
         try:
-            result = self._get(SUNWEG_PLANT_LIST_PATH)
-            ret_list = []
-            plantlist = (
-                result["nao_comissionadas"]
-                + result["conectadas"]
-                + result["falhas"]
-                + result["alertas"]
-                + result["atendimento"]
-            )
+            while True:
+                while len(pending) <= prefetch:
+                    pending.append(
+                        pool.submit(self._plant_list_page, next_page, page_size, retry)
+                    )
+                    next_page += 1
+                summaries = pending.popleft().result()
+                new_summaries = [s for s in summaries if s.id not in seen]
+                seen.update(summary.id for summary in new_summaries)
+                yield from new_summaries
+                if len(summaries) < page_size or len(new_summaries) == 0:
+                    return
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_plant_ids(
+        self,
+        page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE,
+        prefetch: int = 1,
+        retry: bool = True,
+    ) -> Iterator[int]:
+        """
+        Iterate over the ids of every plant, walking all the plant list pages.
+
+        While the ids of a page are being consumed, up to `prefetch` following pages
+        are requested in background threads.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param prefetch: number of pages requested ahead of the current one
+        :type prefetch: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: iterator of plant ids
+        :rtype: Iterator[int]
+        """
+        for summary in self.iter_plant_summaries(page_size, prefetch, retry):
+            yield summary.id
+
+    def iter_plants(
+        self,
+        page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE,
+        prefetch: int = 1,
+        failures: dict[int, Exception] | None = None,
+        complete_inverters: bool = False,
+        max_workers: int = 1,
+    ) -> Iterator[Plant]:
+        """
+        Iterate over every plant.
+
+        Plant ids are read page by page and each plant is yielded as soon as it is
+        ready, in completion order when `max_workers` is greater than 1. At most
+        twice `max_workers` plants are requested ahead, so memory does not grow
+        with the fleet. A plant whose request fails is skipped and its error is
+        stored in `failures`, keyed by plant id. Inverters that cannot be completed
+        are logged and left incomplete.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param prefetch: number of pages requested ahead of the current one
+        :type prefetch: int
+        :param failures: dict that receives the error of each plant that failed
+        :type failures: dict[int, Exception] | None
+        :param complete_inverters: complete inverter, MPPT, string and phase data
+        :type complete_inverters: bool
+        :param max_workers: maximum number of plants requested at the same time
+        :type max_workers: int
+        :return: iterator of Plant
+        :rtype: Iterator[Plant]
+        """
+        ids = self.iter_plant_ids(page_size, prefetch)
+        if max_workers <= 1:
+            for id in ids:
+                result = self._fetch_plant(id, complete_inverters)
+                if (plant := self._plant_result(id, result, failures)) is not None:
+                    yield plant
+            return
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        pending: dict[Future, int] = {}
+        try:
+            for id in ids:
+                pending[pool.submit(self._fetch_plant, id, complete_inverters)] = id
+                if len(pending) >= max_workers * 2:
+                    yield from self._finished_plants(pending, failures)
+            while pending:
+                yield from self._finished_plants(pending, failures)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _finished_plants(
+        self,
+        pending: dict[Future, int],
+        failures: dict[int, Exception] | None,
+    ) -> Iterator[Plant]:
+        """Wait for pending fetches to finish, yielding their plants."""
+        (done, _) = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            plant = self._plant_result(pending.pop(future), future.result(), failures)
+            if plant is not None:
+                yield plant
+
+    def _plant_list_page(
+        self, page: int, page_size: int, retry: bool = True
+    ) -> list[PlantSummary]:
+        """
+        Retrieve the plant summaries of a plant list page.
 
-            for plant in plantlist:
-                if (plant := self.plant(plant["id"])) is not None:
-                    ret_list.append(plant)
-            return ret_list
+        An authentication failure reads as an empty list on the first page only, so
+        it cannot end the walk of the later pages as if they were the last one.
+        """
+        try:
+            result = self._get(
+                SUNWEG_PLANT_LIST_PAGE_PATH.format(limit=page_size, page=page),
+                retry=retry,
+            )
+            return plant_summaries_from_response(result)
         except LoginError:
-            if retry:
-                self.authenticate()
-                return self.listPlants(False)
+            if page > 1:
+                raise
             return []
 
+    def _plants(
+        self,
+        ids: list[int],
+        max_workers: int = 1,
+        failures: dict[int, Exception] | None = None,
+    ) -> list[Plant]:
+        """Retrieve plant details keeping the order of `ids`."""
+        if max_workers > 1 and len(ids) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as pool:
+                results = list(pool.map(self._fetch_plant, ids))
+        else:
+            results = [self._fetch_plant(id) for id in ids]
+
+        ret_list = []
+        for id, result in zip(ids, results):
+            if (plant := self._plant_result(id, result, failures)) is not None:
+                ret_list.append(plant)
+        return ret_list
+
+    def _fetch_plant(
+        self, id: int, complete_inverters: bool = False
+    ) -> Plant | Exception | None:
+        """Retrieve a plant, returning its error instead of raising it."""
+        try:
+            plant = self.plant(id)
+        except (SunWegApiError, RequestException, *PAYLOAD_ERRORS) as err:
+            return err
+        if plant is not None and complete_inverters:
+            self.complete_plant(plant, max_workers=1)
+        return plant
+
+    def _plant_result(
+        self,
+        id: int,
+        result: Plant | Exception | None,
+        failures: dict[int, Exception] | None,
+    ) -> Plant | None:
+        """Get the plant of a fetch result, storing and logging its error."""
+        if isinstance(result, Exception):
+            _LOGGER.warning("Failed to retrieve plant %s: %s", id, result)
+            if failures is not None:
+                failures[id] = result
+            return None
+        return result
+
     def plant(self, id: int, retry=True) -> Plant | None:
         """
         Retrieve plant detail by plant id.
@@ -206,48 +693,53 @@ class APIHelper:
         :rtype: Plant | None
         """
         try:
-            result = self._get(SUNWEG_PLANT_DETAIL_PATH + str(id))
-
-            (today_energy, today_energy_metric) = separate_value_metric(
-                result["energiadia"], "kWh"
-            )
-            total_power = separate_value_metric(result["AcumuladoPotencia"])[0]
-            saving = separate_value_metric(result["economia"], metric_before=True)[0]
-            plant = Plant(
-                id=id,
-                name=result["usinas"]["nome"],
-                total_power=total_power,
-                kwh_per_kwp=float(0),
-                performance_rate=float(0),
-                saving=saving,
-                today_energy=today_energy,
-                today_energy_metric=today_energy_metric,
-                total_energy=float(result["energiaacumuladanumber"]),
-                total_carbon_saving=result["reduz_carbono_total_number"],
-                last_update=parser.parse(result["ultimaAtualizacao"])
-                if result["ultimaAtualizacao"] is not None
-                else None,
-            )
-
-            plant.inverters.extend(
-                [
-                    Inverter(
-                        id=inv["id"],
-                        name=inv["nome"],
-                        sn=inv["esn"],
-                        status=Status(int(inv["situacao"])),
-                        temperature=inv["temperatura"],
-                    )
-                    for inv in result["usinas"]["inversores"]
-                ]
-            )
-            return plant
+            result = self._get(SUNWEG_PLANT_DETAIL_PATH + str(id), retry=retry)
+            return plant_from_response(id, result, self.lazy_models)
         except LoginError:
-            if retry:
-                self.authenticate()
-                return self.plant(id, False)
             return None
 
+    def refresh_plant(self, plant: Plant, retry=True) -> tuple[Plant, bool]:
+        """
+        Retrieve plant detail only if it changed since the last refresh.
+
+        The request carries the ETag and Last-Modified of the previous refresh of
+        the plant when the server sent them, and a 304 response means nothing
+        changed. Otherwise the body is compared with the digest of the previous
+        one, so an unchanged plant is neither decoded nor parsed. The first refresh
+        of a plant always reports a change.
+
+        :param plant: plant to refresh
+        :type plant: Plant
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: new Plant and True, or `plant` and False if nothing changed
+        :rtype: tuple[Plant, bool]
+        :raises LoginError: when authentication fails, which is not a change
+        """
+        path = SUNWEG_PLANT_DETAIL_PATH + str(plant.id)
+        validator = self._plant_validators.get(plant.id)
+        response = self._request_response(
+            "get", path, None, retry, conditional_headers(validator)
+        )
+        if response.status_code == 304:
+            return (plant, False)
+        digest = response_digest(response.content)
+        if (
+            response.status_code == 200
+            and validator is not None
+            and validator[2] == digest
+        ):
+            return (plant, False)
+        result = self._treat_response(response)
+        self._plant_validators[plant.id] = (
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            digest,
+        )
+        if self.cache is not None:
+            self.cache.set(path, result)
+        return (plant_from_response(plant.id, result, self.lazy_models), True)
+
     def inverter(self, id: int, retry=True) -> Inverter | None:
         """
         Retrieve inverter detail by inverter id.
@@ -260,37 +752,9 @@ class APIHelper:
         :rtype: Inverter | None
         """
         try:
-            result = self._get(SUNWEG_INVERTER_DETAIL_PATH + str(id))
-            (total_energy, total_energy_metric) = separate_value_metric(
-                result["energiaacumulada"], "kWh"
-            )
-            (today_energy, today_energy_metric) = separate_value_metric(
-                result["energiadodia"], "kWh"
-            )
-            (power, power_metric) = separate_value_metric(result["potenciaativa"], "kW")
-            inverter = Inverter(
-                id=id,
-                name=result["inversor"]["nome"],
-                sn=result["inversor"]["esn"],
-                total_energy=total_energy,
-                total_energy_metric=total_energy_metric,
-                today_energy=today_energy,
-                today_energy_metric=today_energy_metric,
-                power_factor=float(result["fatorpotencia"].replace(",", ".")),
-                frequency=float(result["frequencia"].replace(",", ".")),
-                power=power,
-                power_metric=power_metric,
-                status=Status(int(result["statusInversor"])),
-                temperature=result["temperatura"],
-            )
-
-            self._populate_MPPT(result=result, inverter=inverter)
-
-            return inverter
+            result = self._get(SUNWEG_INVERTER_DETAIL_PATH + str(id), retry=retry)
+            return inverter_from_response(id, result, self.lazy_models)
         except LoginError:
-            if retry:
-                self.authenticate()
-                return self.inverter(id, False)
             return None
 
     def complete_inverter(self, inverter: Inverter, retry=True) -> None:
@@ -303,26 +767,71 @@ class APIHelper:
         :type retry: bool
         """
         try:
-            result = self._get(SUNWEG_INVERTER_DETAIL_PATH + str(inverter.id))
-            (
-                inverter.total_energy,
-                inverter.total_energy_metric,
-            ) = separate_value_metric(result["energiaacumulada"], "kWh")
-            (
-                inverter.today_energy,
-                inverter.today_energy_metric,
-            ) = separate_value_metric(result["energiadodia"], "kWh")
-            (inverter.power, inverter.power_metric) = separate_value_metric(
-                result["potenciaativa"], "kW"
+            result = self._get(
+                SUNWEG_INVERTER_DETAIL_PATH + str(inverter.id), retry=retry
             )
-            inverter.power_factor = float(result["fatorpotencia"].replace(",", "."))
-            inverter.frequency = float(result["frequencia"].replace(",", "."))
-
-            self._populate_MPPT(result=result, inverter=inverter)
         except LoginError:
-            if retry:
-                self.authenticate()
-                self.complete_inverter(inverter, False)
+            return
+        complete_inverter_from_response(inverter, result)
+
+    def complete_plant(
+        self, plant: Plant, max_workers: int = 8
+    ) -> dict[int, Exception]:
+        """
+        Complete the data of every inverter of a plant.
+
+        :param plant: plant whose inverters should be completed
+        :type plant: Plant
+        :param max_workers: maximum number of inverters requested at the same time
+        :type max_workers: int
+        :return: error of each inverter that could not be completed, keyed by id
+        :rtype: dict[int, Exception]
+        """
+        return self.complete_plants([plant], max_workers)
+
+    def complete_plants(
+        self, plants: list[Plant], max_workers: int = 8
+    ) -> dict[int, Exception]:
+        """
+        Complete the data of every inverter of a list of plants.
+
+        Each inverter id is requested once, even if it appears more than once, and
+        up to `max_workers` inverters are requested at the same time.
+
+        :param plants: plants whose inverters should be completed
+        :type plants: list[Plant]
+        :param max_workers: maximum number of inverters requested at the same time
+        :type max_workers: int
+        :return: error of each inverter that could not be completed, keyed by id
+        :rtype: dict[int, Exception]
+        """
+        inverters: dict[int, list[Inverter]] = {}
+        for plant in plants:
+            for inverter in plant.inverters:
+                inverters.setdefault(inverter.id, []).append(inverter)
+
+        def fetch(id: int) -> Exception | None:
+            try:
+                result = self._get(SUNWEG_INVERTER_DETAIL_PATH + str(id))
+                for inverter in inverters[id]:
+                    complete_inverter_from_response(inverter, result)
+            except (SunWegApiError, RequestException, *PAYLOAD_ERRORS) as err:
+                return err
+            return None
+
+        ids = list(inverters.keys())
+        if max_workers > 1 and len(ids) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as pool:
+                results = list(pool.map(fetch, ids))
+        else:
+            results = [fetch(id) for id in ids]
+
+        failures: dict[int, Exception] = {}
+        for id, error in zip(ids, results):
+            if error is not None:
+                _LOGGER.warning("Failed to complete inverter %s: %s", id, error)
+                failures[id] = error
+        return failures
 
     def month_stats_production(
         self,
@@ -376,74 +885,224 @@ class APIHelper:
         :return: list of daily energy production statistics
         :rtype: list[ProductionStats]
         """
-        inverter_str: str = str(inverter_id) if inverter_id is not None else ""
+        if self.stats_store is not None and (
+            stats := self.stats_store.get(
+                plant_id, inverter_id, year, month, closed_only=True
+            )
+        ) is not None:
+            return stats
         try:
             result = self._get(
-                SUNWEG_MONTH_STATS_PATH
-                + f"idusina={plant_id}&idinversor={inverter_str}&date={format(month,'02')}/{year}"
+                month_stats_path(year, month, plant_id, inverter_id), retry=retry
             )
-            return [
-                ProductionStats(
-                    parser.parse(item["tempoatual"]).date(),
-                    float(item["energiapordia"]),
-                    float(item["prognostico"]),
-                )
-                for item in result["graficomes"]
-            ]
         except LoginError:
-            if retry:
-                self.authenticate()
-                return self.month_stats_production_by_id(
-                    year, month, plant_id, inverter_id, False
-                )
             return []
+        stats = production_stats_from_response(result)
+        if self.stats_store is not None:
+            self.stats_store.save(plant_id, inverter_id, year, month, stats)
+        return stats
+
+    def production_stats_range(
+        self,
+        plant_id: int,
+        start: date,
+        end: date,
+        inverter_id: int | None = None,
+        max_workers: int = 4,
+    ) -> list[ProductionStats]:
+        """
+        Retrieve daily energy production statistics of a date range.
+
+        The range is split by month and up to `max_workers` months are requested at
+        the same time.
+
+        :param plant_id: id of statistics plant
+        :type plant_id: int
+        :param start: first day of the range
+        :type start: date
+        :param end: last day of the range
+        :type end: date
+        :param inverter_id: id of statistics inverter, None for every inverter
+        :type inverter_id: int | None
+        :param max_workers: maximum number of months requested at the same time
+        :type max_workers: int
+        :return: list of daily energy production statistics ordered by date
+        :rtype: list[ProductionStats]
+        """
+        months = months_between(start, end)
+
+        def fetch(month: tuple[int, int]) -> list[ProductionStats]:
+            return self.month_stats_production_by_id(
+                month[0], month[1], plant_id, inverter_id
+            )
+
+        if max_workers > 1 and len(months) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(months))) as pool:
+                results = list(pool.map(fetch, months))
+        else:
+            results = [fetch(month) for month in months]
+
+        return sorted(
+            (stat for stats in results for stat in stats if start <= stat.date <= end),
+            key=lambda stat: stat.date,
+        )
 
     def _populate_MPPT(self, result: dict, inverter: Inverter) -> None:
         """Populate MPPT information inside a inverter."""
-        for str_mppt in result["stringmppt"]:
-            mppt = MPPT(str_mppt["nomemppt"])
-
-            for str_string in str_mppt["strings"]:
-                string = String(
-                    str_string["nome"],
-                    float(result["inversor"]["leitura"][str_string["variaveltensao"]]),
-                    float(
-                        result["inversor"]["leitura"][str_string["variavelcorrente"]]
-                    ),
-                    convert_situation_status(int(str_string["situacao"])),
-                )
-                mppt.strings.append(string)
-
-            inverter.mppts.append(mppt)
-
-        for phase_name in result["correnteCA"].keys():
-            if str(phase_name).endswith("status"):
-                continue
-            inverter.phases.append(
-                Phase(
-                    phase_name,
-                    float(result["tensaoca"][phase_name].replace(",", ".")),
-                    float(result["correnteCA"][phase_name].replace(",", ".")),
-                    Status(result["tensaoca"][phase_name + "status"]),
-                    Status(result["correnteCA"][phase_name + "status"]),
-                )
-            )
+        populate_mppt(result=result, inverter=inverter)
 
-    def _get(self, path: str, launch_exception_on_error: bool = True) -> dict:
+    def _get(
+        self, path: str, launch_exception_on_error: bool = True, retry: bool = True
+    ) -> dict:
         """Do a get request returning a treated response."""
-        res = self.session.get(self.SERVER_URI + path, headers=self._headers())
-        result = self._treat_response(res, launch_exception_on_error)
+        if self.cache is not None and (result := self.cache.get(path)) is not None:
+            return result
+        result = self._request("get", path, None, launch_exception_on_error, retry)
+        if self.cache is not None and result.get("success"):
+            self.cache.set(path, result)
         return result
 
     def _post(
-        self, path: str, data: Any | None, launch_exception_on_error: bool = True
+        self,
+        path: str,
+        data: Any | None,
+        launch_exception_on_error: bool = True,
+        retry: bool = True,
     ) -> dict:
         """Do a post request returning a treated response."""
-        res = self.session.post(
-            self.SERVER_URI + path, data=data, headers=self._headers()
+        return self._request("post", path, data, launch_exception_on_error, retry)
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        launch_exception_on_error: bool = True,
+        retry: bool = True,
+    ) -> dict:
+        """Do a request returning a treated response."""
+        return self._treat_response(
+            self._request_response(method, path, data, retry),
+            launch_exception_on_error,
         )
-        result = self._treat_response(res, launch_exception_on_error)
-        return result
+
+    def _request_response(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        retry: bool = True,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """
+        Do a request returning the raw response.
+
+        With `retry`, an expiring token is refreshed before the request and an
+        expired one is refreshed once, retrying the request.
+        """
+        if retry and self.token_manager.is_expiring():
+            try:
+                self.token_manager.refresh_if_expiring(self.authenticate)
+            except SunWegApiError as err:
+                _LOGGER.warning("Failed to refresh expiring token: %s", err)
+        token = self._token
+        response = self._send(method, path, data, headers)
+        if (
+            response.status_code != 401
+            or not retry
+            or not self.token_manager.refresh(token, self.authenticate)
+        ):
+            return response
+        return self._send(method, path, data, headers)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """
+        Send a request through the circuit breaker.
+
+        Any error is recorded as a failure, and an interrupted request gives back
+        its half open probe slot without an outcome.
+        """
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._send_retrying(method, path, data, headers)
+        if not breaker.allow_request():
+            raise CircuitOpenError("Circuit open, retry in %.1fs" % breaker.retry_after)
+        try:
+            response = self._send_retrying(method, path, data, headers)
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if is_failure_status(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _send_retrying(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Send a request with the current token, retrying transient failures."""
+        policy = self.retry_policy.for_path(path)
+        budget = policy.budget or self.retry_policy.budget
+        if budget is not None:
+            budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                response = self._send_once(method, path, data, headers)
+            except (ConnectionError, Timeout) as err:
+                delay = policy.delay(attempt)
+                if delay is None or (budget is not None and not budget.withdraw()):
+                    raise
+                _LOGGER.debug("Retrying %s in %.2fs: %s", path, delay, err)
+            else:
+                if not policy.is_retryable(response.status_code):
+                    return response
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                if delay is None or (budget is not None and not budget.withdraw()):
+                    return response
+                _LOGGER.debug(
+                    "Retrying %s in %.2fs: %s", path, delay, response.status_code
+                )
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_once(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Send a single request with the current token and extra headers."""
+        headers = self._headers() | (headers or {})
+        limit = self.rate_limiter.acquire() if self.rate_limiter else nullcontext()
+        with limit:
+            if method == "post":
+                return self.session.post(
+                    self.SERVER_URI + path,
+                    data=data,
+                    headers=headers,
+                    timeout=self.transport.timeout,
+                )
+            return self.session.get(
+                self.SERVER_URI + path,
+                headers=headers,
+                timeout=self.transport.timeout,
+            )
 
     def _treat_response(
         self, response: Response, launch_exception_on_error: bool = True
@@ -453,7 +1112,10 @@ class APIHelper:
             raise LoginError("Request failed: %s" % response)
         if response.status_code != 200:
             raise SunWegApiError("Request failed: %s" % response)
-        result = response.json()
+        try:
+            result = self.json_decoder(response.content)
+        except ValueError as err:
+            raise SunWegApiError("Invalid response: %s" % err) from err
         if launch_exception_on_error and not result["success"]:
             raise SunWegApiError(result["message"])
         return result
@@ -0,0 +1,982 @@
+"""Asyncio API Helper."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import nullcontext
+from datetime import date
+import json
+import logging
+from typing import Any
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
+
+from .api import (
+    PAYLOAD_ERRORS,
+    CircuitOpenError,
+    LoginError,
+    ResponseValidator,
+    SunWegApiError,
+    complete_inverter_from_response,
+    conditional_headers,
+    inverter_from_response,
+    month_stats_path,
+    plant_from_response,
+    plant_summaries_from_response,
+    production_stats_from_response,
+    response_digest,
+)
+from .auth import TokenManager, TokenStore, load_token, save_token
+from .cache import ResponseCache
+from .circuit import CircuitBreaker, is_failure_status
+from .decoder import JsonDecoder, default_decoder
+from .const import (
+    SUNWEG_INVERTER_DETAIL_PATH,
+    SUNWEG_LOGIN_PATH,
+    SUNWEG_PLANT_DETAIL_PATH,
+    SUNWEG_PLANT_LIST_PAGE_PATH,
+    SUNWEG_PLANT_LIST_PAGE_SIZE,
+    SUNWEG_URL,
+)
+from .device import Inverter
+from .plant import Plant, PlantSummary
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, default_retry_policy
+from .store import ProductionStatsStore
+from .transport import TransportConfig
+from .util import ProductionStats, months_between
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AsyncAPIHelper:
+    """Class to call sunweg.net api from an asyncio event loop."""
+
+    SERVER_URI = SUNWEG_URL
+
+    def __init__(
+        self,
+        username: str | None = None,
+        password: str | None = None,
+        token: str | None = None,
+        session: ClientSession | None = None,
+        limit: int = 100,
+        cache: ResponseCache | None = None,
+        stats_store: ProductionStatsStore | None = None,
+        token_manager: TokenManager | None = None,
+        token_store: TokenStore | None = None,
+        transport: TransportConfig | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        json_decoder: JsonDecoder | None = None,
+        lazy_models: bool = False,
+    ) -> None:
+        """
+        Initialize AsyncAPIHelper for SunWEG platform.
+
+        When `session` is not provided, a session with its own connection pool is
+        created on first use and closed by `close()`. The token of `token_store` is
+        loaded on the first request, off the event loop.
+
+        :param username: username for authentication
+        :param password: password for authentication
+        :param token: token for authentication
+        :param session: shared aiohttp session
+        :param limit: maximum simultaneous connections of the owned session
+        :param cache: cache of GET responses, None to disable caching
+        :param stats_store: persistent store of month statistics
+        :param token_manager: token holder, can be shared by helpers of one account
+        :param token_store: storage of the token shared between runs
+        :param transport: per host pool size, keep-alive and timeout settings
+        :param retry_policy: retry of transient failures, budgeted by default, shareable
+        :param rate_limiter: request rate limit, can be shared by helpers and tasks
+        :param circuit_breaker: breaker failing fast while the server is down
+        :param json_decoder: decoder of raw response bodies, orjson when installed
+        :param lazy_models: build plants and inverters converting fields on demand
+        :type username: str
+        :type password: str
+        :type token: str
+        :type session: ClientSession | None
+        :type limit: int
+        :type cache: ResponseCache | None
+        :type stats_store: ProductionStatsStore | None
+        :type token_manager: TokenManager | None
+        :type token_store: TokenStore | None
+        :type transport: TransportConfig | None
+        :type retry_policy: RetryPolicy | None
+        :type rate_limiter: RateLimiter | None
+        :type circuit_breaker: CircuitBreaker | None
+        :type json_decoder: JsonDecoder | None
+        :type lazy_models: bool
+        """
+        self.token_manager = token_manager or TokenManager()
+        self.token_store = token_store
+        self._token_pending = (
+            token is None and token_store is not None and username is not None
+        )
+        self._token_lock: asyncio.Lock | None = None
+        if token is not None:
+            self._token = token
+        self._username = username
+        self._password = password
+        self._session = session
+        self._owns_session = session is None
+        self._limit = limit
+        self.transport = transport or TransportConfig()
+        self.retry_policy = retry_policy or default_retry_policy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.json_decoder = json_decoder or default_decoder()
+        self.lazy_models = lazy_models
+        self._plant_validators: dict[int, ResponseValidator] = {}
+        self.cache = cache
+        self.stats_store = stats_store
+
+    async def __aenter__(self) -> "AsyncAPIHelper":
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Exit the async context closing the owned session."""
+        await self.close()
+
+    @property
+    def session(self) -> ClientSession:
+        """
+        Get the aiohttp session, creating it if needed.
+
+        :return: aiohttp session
+        :rtype: ClientSession
+        """
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=self._limit,
+                    limit_per_host=self.transport.pool_maxsize,
+                    force_close=not self.transport.keep_alive,
+                )
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session if it was created by this helper."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def _token(self) -> str | None:
+        """Get authentication token."""
+        return self.token_manager.token
+
+    @_token.setter
+    def _token(self, token: str | None) -> None:
+        """Set authentication token."""
+        self.token_manager.token = token
+
+    def set_token(self, token: str) -> None:
+        """
+        Set token.
+
+        :param token: token for authentication
+        :type token: str
+        """
+        self._token = token
+
+    def _set_username(self, username: str) -> None:
+        """
+        Set username.
+
+        :param username: username for authentication
+        :type username: str
+        """
+        self._username = username
+
+    username = property(None, _set_username)
+
+    def _set_password(self, password: str) -> None:
+        """
+        Set password.
+
+        :param password: password for authentication
+        :type password: str
+        """
+        self._password = password
+
+    password = property(None, _set_password)
+
+    async def authenticate(self) -> bool:
+        """
+        Authenticate with provided username and password.
+
+        :return: True on authentication success
+        :rtype: bool
+        """
+        if self._username is None or self._password is None:
+            return False
+
+        user_data = json.dumps(
+            {"usuario": self._username, "senha": self._password, "rememberMe": True}
+        )
+
+        result = await self._post(SUNWEG_LOGIN_PATH, user_data, False, retry=False)
+        if not result["success"]:
+            return False
+        self._token = result["token"]
+        if self.token_store is not None:
+            await asyncio.to_thread(
+                save_token, self.token_store, self._username, result["token"]
+            )
+        return result["success"]
+
+    def _headers(self):
+        """Retrieve headers with authentication token."""
+        if self._token is None:
+            return {"Content-Type": "application/json"}
+        return {"Content-Type": "application/json", "X-Auth-Token-Update": self._token}
+
+    async def listPlants(
+        self,
+        retry=True,
+        max_workers: int = 1,
+        failures: dict[int, Exception] | None = None,
+    ) -> list[Plant]:
+        """
+        Retrieve the list of plants with incomplete inverter information.
+
+        You may want to call `complete_inverter()` to complete the Inverter information.
+
+        Up to `max_workers` plant details are requested at the same time. A plant whose
+        request fails is left out of the list and its error is stored in `failures`,
+        keyed by plant id.
+
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :param max_workers: maximum number of plant details requested at the same time
+        :type max_workers: int
+        :param failures: dict that receives the error of each plant that failed
+        :type failures: dict[int, Exception] | None
+        :return: list of Plant in the same order as returned by the server
+        :rtype: list[Plant]
+        """
+        ids = [id async for id in self.iter_plant_ids(prefetch=0, retry=retry)]
+        return await self._plants(ids, max_workers, failures)
+
+    async def list_plant_summaries(
+        self, page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE, retry: bool = True
+    ) -> list[PlantSummary]:
+        """
+        Retrieve the id and status bucket of every plant.
+
+        Only the plant list is requested, no plant details.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: list of plant summaries
+        :rtype: list[PlantSummary]
+        """
+        return [
+            summary
+            async for summary in self.iter_plant_summaries(
+                page_size, prefetch=0, retry=retry
+            )
+        ]
+
+    async def iter_plant_summaries(
+        self,
+        page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE,
+        prefetch: int = 1,
+        retry: bool = True,
+    ) -> AsyncIterator[PlantSummary]:
+        """
+        Iterate over the summary of every plant, walking all the plant list pages.
+
+        While the summaries of a page are being consumed, up to `prefetch` following
+        pages are requested in background tasks.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param prefetch: number of pages requested ahead of the current one
+        :type prefetch: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: async iterator of plant summaries
+        :rtype: AsyncIterator[PlantSummary]
+        :raises LoginError: when authentication fails after the first page
+        """
+        seen: set[int] = set()
+        next_page = 1
+        pending: deque[asyncio.Task[list[PlantSummary]]] = deque()
+        try:
+            while True:
+                while len(pending) <= prefetch:
+                    pending.append(
+                        asyncio.ensure_future(
+                            self._plant_list_page(next_page, page_size, retry)
+                        )
+                    )
+                    next_page += 1
+                summaries = await pending.popleft()
+                new_summaries = [s for s in summaries if s.id not in seen]
+                seen.update(summary.id for summary in new_summaries)
+                for summary in new_summaries:
+                    yield summary
+                if len(summaries) < page_size or len(new_summaries) == 0:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_plant_ids(
+        self,
+        page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE,
+        prefetch: int = 1,
+        retry: bool = True,
+    ) -> AsyncIterator[int]:
+        """
+        Iterate over the ids of every plant, walking all the plant list pages.
+
+        While the ids of a page are being consumed, up to `prefetch` following pages
+        are requested in background tasks.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param prefetch: number of pages requested ahead of the current one
+        :type prefetch: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: async iterator of plant ids
+        :rtype: AsyncIterator[int]
+        """
+        async for summary in self.iter_plant_summaries(page_size, prefetch, retry):
+            yield summary.id
+
+    async def iter_plants(
+        self,
+        page_size: int = SUNWEG_PLANT_LIST_PAGE_SIZE,
+        prefetch: int = 1,
+        failures: dict[int, Exception] | None = None,
+        complete_inverters: bool = False,
+        max_workers: int = 1,
+    ) -> AsyncIterator[Plant]:
+        """
+        Iterate over every plant.
+
+        Plant ids are read page by page and each plant is yielded as soon as it is
+        ready, in completion order when `max_workers` is greater than 1. At most
+        twice `max_workers` plants are requested ahead, so memory does not grow
+        with the fleet. A plant whose request fails is skipped and its error is
+        stored in `failures`, keyed by plant id. Inverters that cannot be completed
+        are logged and left incomplete.
+
+        :param page_size: number of plants requested per page
+        :type page_size: int
+        :param prefetch: number of pages requested ahead of the current one
+        :type prefetch: int
+        :param failures: dict that receives the error of each plant that failed
+        :type failures: dict[int, Exception] | None
+        :param complete_inverters: complete inverter, MPPT, string and phase data
+        :type complete_inverters: bool
+        :param max_workers: maximum number of plants requested at the same time
+        :type max_workers: int
+        :return: async iterator of Plant
+        :rtype: AsyncIterator[Plant]
+        """
+        ahead = max_workers * 2 if max_workers > 1 else 1
+        pending: dict[asyncio.Future, int] = {}
+        try:
+            async for id in self.iter_plant_ids(page_size, prefetch):
+                fetch = self._fetch_plant(id, complete_inverters)
+                pending[asyncio.ensure_future(fetch)] = id
+                if len(pending) >= ahead:
+                    async for plant in self._finished_plants(pending, failures):
+                        yield plant
+            while pending:
+                async for plant in self._finished_plants(pending, failures):
+                    yield plant
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _finished_plants(
+        self,
+        pending: dict[asyncio.Future, int],
+        failures: dict[int, Exception] | None,
+    ) -> AsyncIterator[Plant]:
+        """Wait for pending fetches to finish, yielding their plants."""
+        (done, _) = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            plant = self._plant_result(pending.pop(task), task.result(), failures)
+            if plant is not None:
+                yield plant
+
+    async def _plant_list_page(
+        self, page: int, page_size: int, retry: bool = True
+    ) -> list[PlantSummary]:
+        """
+        Retrieve the plant summaries of a plant list page.
+
+        An authentication failure reads as an empty list on the first page only, so
+        it cannot end the walk of the later pages as if they were the last one.
+        """
+        try:
+            result = await self._get(
+                SUNWEG_PLANT_LIST_PAGE_PATH.format(limit=page_size, page=page),
+                retry=retry,
+            )
+            return plant_summaries_from_response(result)
+        except LoginError:
+            if page > 1:
+                raise
+            return []
+
+    async def _plants(
+        self,
+        ids: list[int],
+        max_workers: int = 1,
+        failures: dict[int, Exception] | None = None,
+    ) -> list[Plant]:
+        """Retrieve plant details keeping the order of `ids`."""
+        semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+        async def fetch(id: int) -> Plant | Exception | None:
+            async with semaphore:
+                return await self._fetch_plant(id)
+
+        results = await asyncio.gather(*[fetch(id) for id in ids])
+
+        ret_list = []
+        for id, result in zip(ids, results):
+            if (plant := self._plant_result(id, result, failures)) is not None:
+                ret_list.append(plant)
+        return ret_list
+
+    async def _fetch_plant(
+        self, id: int, complete_inverters: bool = False
+    ) -> Plant | Exception | None:
+        """Retrieve a plant, returning its error instead of raising it."""
+        try:
+            plant = await self.plant(id)
+        except (
+            SunWegApiError,
+            ClientError,
+            asyncio.TimeoutError,
+            *PAYLOAD_ERRORS,
+        ) as err:
+            return err
+        if plant is not None and complete_inverters:
+            await self.complete_plant(plant, max_workers=1)
+        return plant
+
+    def _plant_result(
+        self,
+        id: int,
+        result: Plant | Exception | None,
+        failures: dict[int, Exception] | None,
+    ) -> Plant | None:
+        """Get the plant of a fetch result, storing and logging its error."""
+        if isinstance(result, Exception):
+            _LOGGER.warning("Failed to retrieve plant %s: %s", id, result)
+            if failures is not None:
+                failures[id] = result
+            return None
+        return result
+
+    async def plant(self, id: int, retry=True) -> Plant | None:
+        """
+        Retrieve plant detail by plant id.
+
+        :param id: plant id
+        :type id: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: Plant or None if `id` not found.
+        :rtype: Plant | None
+        """
+        try:
+            result = await self._get(SUNWEG_PLANT_DETAIL_PATH + str(id), retry=retry)
+            return plant_from_response(id, result, self.lazy_models)
+        except LoginError:
+            return None
+
+    async def refresh_plant(self, plant: Plant, retry=True) -> tuple[Plant, bool]:
+        """
+        Retrieve plant detail only if it changed since the last refresh.
+
+        The request carries the ETag and Last-Modified of the previous refresh of
+        the plant when the server sent them, and a 304 response means nothing
+        changed. Otherwise the body is compared with the digest of the previous
+        one, so an unchanged plant is neither decoded nor parsed. The first refresh
+        of a plant always reports a change.
+
+        :param plant: plant to refresh
+        :type plant: Plant
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: new Plant and True, or `plant` and False if nothing changed
+        :rtype: tuple[Plant, bool]
+        :raises LoginError: when authentication fails, which is not a change
+        """
+        path = SUNWEG_PLANT_DETAIL_PATH + str(plant.id)
+        validator = self._plant_validators.get(plant.id)
+
+        async def read(response: ClientResponse) -> tuple[Plant, bool]:
+            if response.status == 304:
+                return (plant, False)
+            digest = response_digest(await response.read())
+            if (
+                response.status == 200
+                and validator is not None
+                and validator[2] == digest
+            ):
+                return (plant, False)
+            result = await self._treat_response(response)
+            self._plant_validators[plant.id] = (
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                digest,
+            )
+            if self.cache is not None:
+                self.cache.set(path, result)
+            return (plant_from_response(plant.id, result, self.lazy_models), True)
+
+        return await self._request(
+            "get",
+            path,
+            None,
+            retry=retry,
+            headers=conditional_headers(validator),
+            handler=read,
+        )
+
+    async def inverter(self, id: int, retry=True) -> Inverter | None:
+        """
+        Retrieve inverter detail by inverter id.
+
+        :param id: inverter id
+        :type id: int
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: Inverter or None if `id` not found.
+        :rtype: Inverter | None
+        """
+        try:
+            result = await self._get(SUNWEG_INVERTER_DETAIL_PATH + str(id), retry=retry)
+            return inverter_from_response(id, result, self.lazy_models)
+        except LoginError:
+            return None
+
+    async def complete_inverter(self, inverter: Inverter, retry=True) -> None:
+        """
+        Complete inverter data.
+
+        :param inverter: inverter object to be completed with information
+        :type inverter: Inverter
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        """
+        try:
+            result = await self._get(
+                SUNWEG_INVERTER_DETAIL_PATH + str(inverter.id), retry=retry
+            )
+        except LoginError:
+            return
+        complete_inverter_from_response(inverter, result)
+
+    async def complete_plant(
+        self, plant: Plant, max_workers: int = 8
+    ) -> dict[int, Exception]:
+        """
+        Complete the data of every inverter of a plant.
+
+        :param plant: plant whose inverters should be completed
+        :type plant: Plant
+        :param max_workers: maximum number of inverters requested at the same time
+        :type max_workers: int
+        :return: error of each inverter that could not be completed, keyed by id
+        :rtype: dict[int, Exception]
+        """
+        return await self.complete_plants([plant], max_workers)
+
+    async def complete_plants(
+        self, plants: list[Plant], max_workers: int = 8
+    ) -> dict[int, Exception]:
+        """
+        Complete the data of every inverter of a list of plants.
+
+        Each inverter id is requested once, even if it appears more than once, and
+        up to `max_workers` inverters are requested at the same time.
+
+        :param plants: plants whose inverters should be completed
+        :type plants: list[Plant]
+        :param max_workers: maximum number of inverters requested at the same time
+        :type max_workers: int
+        :return: error of each inverter that could not be completed, keyed by id
+        :rtype: dict[int, Exception]
+        """
+        inverters: dict[int, list[Inverter]] = {}
+        for plant in plants:
+            for inverter in plant.inverters:
+                inverters.setdefault(inverter.id, []).append(inverter)
+        semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+        async def fetch(id: int) -> Exception | None:
+            path = SUNWEG_INVERTER_DETAIL_PATH + str(id)
+            async with semaphore:
+                try:
+                    result = await self._get(path)
+                    for inverter in inverters[id]:
+                        complete_inverter_from_response(inverter, result)
+                except (
+                    SunWegApiError,
+                    ClientError,
+                    asyncio.TimeoutError,
+                    *PAYLOAD_ERRORS,
+                ) as err:
+                    return err
+            return None
+
+        ids = list(inverters.keys())
+        results = await asyncio.gather(*[fetch(id) for id in ids])
+
+        failures: dict[int, Exception] = {}
+        for id, error in zip(ids, results):
+            if error is not None:
+                _LOGGER.warning("Failed to complete inverter %s: %s", id, error)
+                failures[id] = error
+        return failures
+
+    async def month_stats_production(
+        self,
+        year: int,
+        month: int,
+        plant: Plant,
+        inverter: Inverter | None = None,
+        retry: bool = True,
+    ) -> list[ProductionStats]:
+        """
+        Retrieve month energy production statistics.
+
+        :param year: statistics year
+        :type year: int
+        :param month: statistics month
+        :type month: int
+        :param plant: statistics plant
+        :type plant: Plant
+        :param inverter: statistics inverter, None for every inverter
+        :type inverter: Inverter | None
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: list of daily energy production statistics
+        :rtype: list[ProductionStats]
+        """
+        return await self.month_stats_production_by_id(
+            year, month, plant.id, inverter.id if inverter is not None else None, retry
+        )
+
+    async def month_stats_production_by_id(
+        self,
+        year: int,
+        month: int,
+        plant_id: int,
+        inverter_id: int | None = None,
+        retry: bool = True,
+    ) -> list[ProductionStats]:
+        """
+        Retrieve month energy production statistics.
+
+        :param year: statistics year
+        :type year: int
+        :param month: statistics month
+        :type month: int
+        :param plant_id: id of statistics plant
+        :type plant_id: int
+        :param inverter_id: id of statistics inverter, None for every inverter
+        :type inverter_id: int | None
+        :param retry: reauthenticate if token expired and retry
+        :type retry: bool
+        :return: list of daily energy production statistics
+        :rtype: list[ProductionStats]
+        """
+        if (
+            self.stats_store is not None
+            and (
+                stats := await asyncio.to_thread(
+                    self.stats_store.get,
+                    plant_id,
+                    inverter_id,
+                    year,
+                    month,
+                    closed_only=True,
+                )
+            )
+            is not None
+        ):
+            return stats
+        try:
+            result = await self._get(
+                month_stats_path(year, month, plant_id, inverter_id), retry=retry
+            )
+        except LoginError:
+            return []
+        stats = production_stats_from_response(result)
+        if self.stats_store is not None:
+            await asyncio.to_thread(
+                self.stats_store.save, plant_id, inverter_id, year, month, stats
+            )
+        return stats
+
+    async def production_stats_range(
+        self,
+        plant_id: int,
+        start: date,
+        end: date,
+        inverter_id: int | None = None,
+        max_workers: int = 4,
+    ) -> list[ProductionStats]:
+        """
+        Retrieve daily energy production statistics of a date range.
+
+        The range is split by month and up to `max_workers` months are requested at
+        the same time.
+
+        :param plant_id: id of statistics plant
+        :type plant_id: int
+        :param start: first day of the range
+        :type start: date
+        :param end: last day of the range
+        :type end: date
+        :param inverter_id: id of statistics inverter, None for every inverter
+        :type inverter_id: int | None
+        :param max_workers: maximum number of months requested at the same time
+        :type max_workers: int
+        :return: list of daily energy production statistics ordered by date
+        :rtype: list[ProductionStats]
+        """
+        semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+        async def fetch(year: int, month: int) -> list[ProductionStats]:
+            async with semaphore:
+                return await self.month_stats_production_by_id(
+                    year, month, plant_id, inverter_id
+                )
+
+        results = await asyncio.gather(
+            *[fetch(year, month) for (year, month) in months_between(start, end)]
+        )
+        return sorted(
+            (stat for stats in results for stat in stats if start <= stat.date <= end),
+            key=lambda stat: stat.date,
+        )
+
+    async def _get(
+        self, path: str, launch_exception_on_error: bool = True, retry: bool = True
+    ) -> dict:
+        """Do a get request returning a treated response."""
+        if self.cache is not None and (result := self.cache.get(path)) is not None:
+            return result
+        result = await self._request(
+            "get", path, None, launch_exception_on_error, retry
+        )
+        if self.cache is not None and result.get("success"):
+            self.cache.set(path, result)
+        return result
+
+    async def _post(
+        self,
+        path: str,
+        data: Any | None,
+        launch_exception_on_error: bool = True,
+        retry: bool = True,
+    ) -> dict:
+        """Do a post request returning a treated response."""
+        return await self._request("post", path, data, launch_exception_on_error, retry)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        launch_exception_on_error: bool = True,
+        retry: bool = True,
+        headers: dict[str, str] | None = None,
+        handler: Callable[[ClientResponse], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """
+        Do a request returning a treated response, or the result of `handler`.
+
+        With `retry`, an expiring token is refreshed before the request and an
+        expired one is refreshed once, retrying the request.
+        """
+        if self._token_pending:
+            await self._load_stored_token()
+        if retry and self.token_manager.is_expiring():
+            try:
+                await self.token_manager.async_refresh_if_expiring(self.authenticate)
+            except SunWegApiError as err:
+                _LOGGER.warning("Failed to refresh expiring token: %s", err)
+        token = self._token
+        try:
+            return await self._send(
+                method, path, data, launch_exception_on_error, headers, handler
+            )
+        except LoginError:
+            if not retry or not await self.token_manager.async_refresh(
+                token, self.authenticate
+            ):
+                raise
+        return await self._send(
+            method, path, data, launch_exception_on_error, headers, handler
+        )
+
+    async def _load_stored_token(self) -> None:
+        """Load the token of the token store once, off the event loop."""
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if not self._token_pending or self.token_store is None:
+                return
+            token = await asyncio.to_thread(
+                load_token, self.token_store, self._username
+            )
+            self._token_pending = False
+            if token is not None and self._token is None:
+                self._token = token
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        launch_exception_on_error: bool = True,
+        headers: dict[str, str] | None = None,
+        handler: Callable[[ClientResponse], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """
+        Send a request through the circuit breaker returning a treated response.
+
+        The response is passed to `handler` instead of being treated when given.
+
+        An exception raised before the outcome is recorded is a failure, and a
+        cancelled request gives back its half open probe slot without an outcome.
+        """
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError("Circuit open, retry in %.1fs" % breaker.retry_after)
+        recorded = False
+
+        async def treat(response: ClientResponse) -> Any:
+            nonlocal recorded
+            recorded = True
+            self._record_outcome(response.status)
+            if handler is not None:
+                return await handler(response)
+            return await self._treat_response(response, launch_exception_on_error)
+
+        try:
+            return await self._send_retrying(method, path, data, headers, treat)
+        except Exception:
+            if breaker is not None and not recorded:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            if breaker is not None and not recorded:
+                breaker.release()
+            raise
+
+    async def _send_retrying(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        headers: dict[str, str] | None,
+        treat: Callable[[ClientResponse], Awaitable[Any]],
+    ) -> Any:
+        """Send a request with the current token, retrying transient failures."""
+        policy = self.retry_policy.for_path(path)
+        budget = policy.budget or self.retry_policy.budget
+        if budget is not None:
+            budget.deposit()
+        attempt = 1
+        while True:
+            limit = (
+                self.rate_limiter.async_acquire()
+                if self.rate_limiter
+                else nullcontext()
+            )
+            try:
+                async with limit, self._send_once(method, path, data, headers) as res:
+                    delay = None
+                    if policy.is_retryable(res.status):
+                        delay = policy.delay(attempt, res.headers.get("Retry-After"))
+                        if budget is not None and delay is not None:
+                            delay = delay if budget.withdraw() else None
+                    if delay is None:
+                        return await treat(res)
+                    _LOGGER.debug("Retrying %s in %.2fs: %s", path, delay, res.status)
+            except (ClientConnectionError, asyncio.TimeoutError) as err:
+                delay = policy.delay(attempt)
+                if delay is None or (budget is not None and not budget.withdraw()):
+                    raise
+                _LOGGER.debug("Retrying %s in %.2fs: %s", path, delay, err)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _record_outcome(self, status: int | None) -> None:
+        """Record the outcome of a request in the circuit breaker."""
+        if self.circuit_breaker is None:
+            return
+        if is_failure_status(status):
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _send_once(
+        self,
+        method: str,
+        path: str,
+        data: Any | None,
+        headers: dict[str, str] | None = None,
+    ) -> Any:
+        """Send a single request with the current token and extra headers."""
+        headers = self._headers() | (headers or {})
+        timeout = ClientTimeout(
+            sock_connect=self.transport.connect_timeout,
+            sock_read=self.transport.read_timeout,
+        )
+        if method == "post":
+            return self.session.post(
+                self.SERVER_URI + path,
+                data=data,
+                headers=headers,
+                timeout=timeout,
+            )
+        return self.session.get(
+            self.SERVER_URI + path, headers=headers, timeout=timeout
+        )
+
+    async def _treat_response(
+        self, response: ClientResponse, launch_exception_on_error: bool = True
+    ) -> dict:
+        """Treat the response from aiohttp."""
+        if response.status == 401:
+            raise LoginError("Request failed: %s" % response)
+        if response.status != 200:
+            raise SunWegApiError("Request failed: %s" % response)
+        try:
+            result = self.json_decoder(await response.read())
+        except ValueError as err:
+            raise SunWegApiError("Invalid response: %s" % err) from err
+        if launch_exception_on_error and not result["success"]:
+            raise SunWegApiError(result["message"])
+        return result
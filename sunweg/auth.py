@@ -0,0 +1,349 @@
+"""Sunweg API authentication token lifecycle."""
+
+from abc import ABC, abstractmethod
+import asyncio
+import base64
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+import json
+import logging
+import os
+import tempfile
+from threading import Lock
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def token_expiration(token: str | None) -> float | None:
+    """
+    Read the expiration of a JWT token.
+
+    :param token: authentication token
+    :type token: str | None
+    :return: expiration as a POSIX timestamp, None if unknown
+    :rtype: float | None
+    """
+    if token is None:
+        return None
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """
+    Authentication token holder.
+
+    Tracks when the token expires and makes sure only one reauthentication runs at
+    a time: callers that hit an expired token wait for the running reauthentication
+    and reuse its token instead of logging in again.
+    """
+
+    def __init__(self, token: str | None = None, refresh_margin: float = 300) -> None:
+        """
+        Initialize TokenManager.
+
+        :param token: authentication token
+        :type token: str | None
+        :param refresh_margin: seconds before expiration when the token is refreshed
+        :type refresh_margin: float
+        """
+        self._lock = Lock()
+        self._async_lock: asyncio.Lock | None = None
+        self._refresh_margin = refresh_margin
+        self.token = token
+
+    @property
+    def token(self) -> str | None:
+        """
+        Get authentication token.
+
+        :return: authentication token
+        :rtype: str | None
+        """
+        return self._token
+
+    @token.setter
+    def token(self, value: str | None) -> None:
+        """
+        Set authentication token.
+
+        :param value: authentication token
+        :type value: str | None
+        """
+        self._token = value
+        self._expires_at = token_expiration(value)
+
+    @property
+    def expires_at(self) -> float | None:
+        """
+        Get token expiration.
+
+        :return: expiration as a POSIX timestamp, None if unknown
+        :rtype: float | None
+        """
+        return self._expires_at
+
+    def is_expiring(self) -> bool:
+        """
+        Check if the token should be refreshed before being used.
+
+        :return: True when the token expires within the refresh margin
+        :rtype: bool
+        """
+        return (
+            self._expires_at is not None
+            and time.time() >= self._expires_at - self._refresh_margin
+        )
+
+    def refresh(
+        self, stale_token: str | None, authenticate: Callable[[], bool]
+    ) -> bool:
+        """
+        Reauthenticate unless another caller already replaced `stale_token`.
+
+        :param stale_token: token used by the caller when it found out it expired
+        :type stale_token: str | None
+        :param authenticate: function that logs in and sets the new token
+        :type authenticate: Callable[[], bool]
+        :return: True when a new token is available
+        :rtype: bool
+        """
+        with self._lock:
+            if self._token is not None and self._token != stale_token:
+                return True
+            return self._refreshed(authenticate())
+
+    async def async_refresh(
+        self, stale_token: str | None, authenticate: Callable[[], Awaitable[bool]]
+    ) -> bool:
+        """
+        Reauthenticate unless another task already replaced `stale_token`.
+
+        :param stale_token: token used by the caller when it found out it expired
+        :type stale_token: str | None
+        :param authenticate: coroutine function that logs in and sets the new token
+        :type authenticate: Callable[[], Awaitable[bool]]
+        :return: True when a new token is available
+        :rtype: bool
+        """
+        async with self._get_async_lock():
+            if self._token is not None and self._token != stale_token:
+                return True
+            return self._refreshed(await authenticate())
+
+    def refresh_if_expiring(self, authenticate: Callable[[], bool]) -> bool:
+        """
+        Reauthenticate if the token is still expiring once the lock is held.
+
+        Callers that saw an expiring token wait for the running reauthentication
+        and reuse its token instead of logging in again.
+
+        :param authenticate: function that logs in and sets the new token
+        :type authenticate: Callable[[], bool]
+        :return: True when the token is no longer expiring
+        :rtype: bool
+        """
+        with self._lock:
+            if not self.is_expiring():
+                return True
+            return self._refreshed(authenticate())
+
+    async def async_refresh_if_expiring(
+        self, authenticate: Callable[[], Awaitable[bool]]
+    ) -> bool:
+        """
+        Reauthenticate if the token is still expiring once the lock is held.
+
+        :param authenticate: coroutine function that logs in and sets the new token
+        :type authenticate: Callable[[], Awaitable[bool]]
+        :return: True when the token is no longer expiring
+        :rtype: bool
+        """
+        async with self._get_async_lock():
+            if not self.is_expiring():
+                return True
+            return self._refreshed(await authenticate())
+
+    def _get_async_lock(self) -> asyncio.Lock:
+        """Get the lock of async refreshes, created in the running loop."""
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        return self._async_lock
+
+    def _refreshed(self, success: bool) -> bool:
+        """Stop proactive refreshes after a failed reauthentication."""
+        if not success:
+            self._expires_at = None
+        return success
+
+
+class TokenStore(ABC):
+    """Storage of authentication tokens keyed by username."""
+
+    @abstractmethod
+    def load(self, username: str) -> str | None:
+        """
+        Load the token of a user.
+
+        :param username: username of the token
+        :type username: str
+        :return: stored token, None if missing
+        :rtype: str | None
+        """
+
+    @abstractmethod
+    def save(self, username: str, token: str) -> None:
+        """
+        Save the token of a user.
+
+        :param username: username of the token
+        :type username: str
+        :param token: authentication token
+        :type token: str
+        """
+
+
+class FileTokenStore(TokenStore):
+    """
+    Token store backed by a JSON file shared by processes of the same host.
+
+    Reads and writes hold an exclusive lock on a sibling ".lock" file, and the
+    tokens file is replaced atomically, so concurrent processes never see a
+    partially written file. Expired tokens are not loaded.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        """
+        Initialize FileTokenStore.
+
+        :param path: tokens file, defaults to ~/.cache/sunweg/tokens.json
+        :type path: str | None
+        """
+        self._path = os.path.abspath(
+            path
+            or os.path.join(os.path.expanduser("~"), ".cache", "sunweg", "tokens.json")
+        )
+        self._lock = Lock()
+
+    @property
+    def path(self) -> str:
+        """
+        Get tokens file path.
+
+        :return: tokens file path
+        :rtype: str
+        """
+        return self._path
+
+    def load(self, username: str) -> str | None:
+        """
+        Load the token of a user.
+
+        :param username: username of the token
+        :type username: str
+        :return: stored token, None if missing or expired
+        :rtype: str | None
+        """
+        with self._locked():
+            token = self._read().get(username)
+        expires_at = token_expiration(token)
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return token
+
+    def save(self, username: str, token: str) -> None:
+        """
+        Save the token of a user.
+
+        :param username: username of the token
+        :type username: str
+        :param token: authentication token
+        :type token: str
+        """
+        with self._locked():
+            tokens = self._read()
+            tokens[username] = token
+            directory = os.path.dirname(self._path)
+            (fd, tmp_path) = tempfile.mkstemp(dir=directory, prefix=".tokens")
+            try:
+                with os.fdopen(fd, "w") as file:
+                    json.dump(tokens, file)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def _read(self) -> dict[str, str]:
+        """Read every stored token."""
+        try:
+            with open(self._path) as file:
+                tokens = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return tokens if isinstance(tokens, dict) else {}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and the file lock."""
+        with self._lock:
+            os.makedirs(os.path.dirname(self._path), mode=0o700, exist_ok=True)
+            fd = os.open(self._path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+
+def load_token(store: TokenStore, username: str) -> str | None:
+    """
+    Load the token of a user, treating the store as best effort.
+
+    A store that cannot be read, like one in a read-only directory, is logged and
+    read as missing, so the helper logs in instead.
+
+    :param store: token store
+    :type store: TokenStore
+    :param username: username of the token
+    :type username: str
+    :return: stored token, None if missing or unreadable
+    :rtype: str | None
+    """
+    try:
+        return store.load(username)
+    except OSError as err:
+        _LOGGER.warning("Failed to load stored token: %s", err)
+        return None
+
+
+def save_token(store: TokenStore, username: str, token: str) -> None:
+    """
+    Save the token of a user, treating the store as best effort.
+
+    A store that cannot be written is logged and skipped, so a successful login
+    never fails because of it.
+
+    :param store: token store
+    :type store: TokenStore
+    :param username: username of the token
+    :type username: str
+    :param token: authentication token
+    :type token: str
+    """
+    try:
+        store.save(username, token)
+    except OSError as err:
+        _LOGGER.warning("Failed to save token: %s", err)
@@ -0,0 +1,169 @@
+"""Sunweg API response cache."""
+
+from collections import OrderedDict
+import re
+from threading import Lock
+import time
+
+from .const import (
+    SUNWEG_INVERTER_DETAIL_PATH,
+    SUNWEG_MONTH_STATS_PATH,
+    SUNWEG_PLANT_DETAIL_PATH,
+)
+from .store import is_month_closed
+
+_MONTH_STATS_DATE = re.compile(r"date=(\d{2})/(\d{4})")
+
+
+class ResponseCache:
+    """
+    In memory cache of decoded GET responses keyed by request path.
+
+    Entries expire after the TTL of their endpoint and the least recently used
+    entry is evicted when the cache is full. A TTL of 0 disables caching for the
+    endpoint and a TTL of None keeps the entry until it is evicted. Month stats of
+    closed months, as defined by `is_month_closed`, never change, so they are kept
+    until evicted.
+
+    The token is not part of the key, so a cache must not be shared between
+    accounts.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        plant_ttl: float | None = 60,
+        inverter_ttl: float | None = 60,
+        month_stats_ttl: float | None = 300,
+        default_ttl: float | None = 0,
+    ) -> None:
+        """
+        Initialize ResponseCache.
+
+        :param max_size: maximum number of cached responses
+        :type max_size: int
+        :param plant_ttl: seconds a plant detail response is kept
+        :type plant_ttl: float | None
+        :param inverter_ttl: seconds an inverter detail response is kept
+        :type inverter_ttl: float | None
+        :param month_stats_ttl: seconds a current month stats response is kept
+        :type month_stats_ttl: float | None
+        :param default_ttl: seconds any other response is kept
+        :type default_ttl: float | None
+        """
+        self._max_size = max_size
+        self._ttls: dict[str, float | None] = {
+            SUNWEG_PLANT_DETAIL_PATH: plant_ttl,
+            SUNWEG_INVERTER_DETAIL_PATH: inverter_ttl,
+            SUNWEG_MONTH_STATS_PATH: month_stats_ttl,
+        }
+        self._default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float | None, dict]] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        Get number of lookups answered from the cache.
+
+        :return: number of cache hits
+        :rtype: int
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Get number of lookups not answered from the cache.
+
+        :return: number of cache misses
+        :rtype: int
+        """
+        return self._misses
+
+    def __len__(self) -> int:
+        """Get number of cached responses."""
+        return len(self._entries)
+
+    def ttl(self, path: str) -> float | None:
+        """
+        Get the TTL of a request path.
+
+        :param path: request path
+        :type path: str
+        :return: seconds the response is kept, None to keep it until evicted
+        :rtype: float | None
+        """
+        for prefix, ttl in self._ttls.items():
+            if path.startswith(prefix):
+                if prefix == SUNWEG_MONTH_STATS_PATH and _is_closed_month(path):
+                    return None
+                return ttl
+        return self._default_ttl
+
+    def get(self, path: str) -> dict | None:
+        """
+        Get a cached response.
+
+        :param path: request path
+        :type path: str
+        :return: cached response or None if missing or expired
+        :rtype: dict | None
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                (expires, result) = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(path)
+                    self._hits += 1
+                    return result
+                del self._entries[path]
+            self._misses += 1
+            return None
+
+    def set(self, path: str, result: dict) -> None:
+        """
+        Cache a response.
+
+        :param path: request path
+        :type path: str
+        :param result: decoded response
+        :type result: dict
+        """
+        ttl = self.ttl(path)
+        if ttl is not None and ttl <= 0:
+            return
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[path] = (expires, result)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        """
+        Remove a cached response.
+
+        :param path: request path
+        :type path: str
+        """
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self) -> None:
+        """Remove every cached response and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+def _is_closed_month(path: str) -> bool:
+    """Check if a month stats path requests a closed month."""
+    match = _MONTH_STATS_DATE.search(path)
+    if match is None:
+        return False
+    return is_month_closed(int(match.group(2)), int(match.group(1)))
@@ -0,0 +1,201 @@
+"""Sunweg API circuit breaker."""
+
+from collections import deque
+from enum import Enum
+from threading import Lock
+import time
+
+
+class CircuitState(Enum):
+    """Enumeration of circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_failure_status(status: int | None) -> bool:
+    """
+    Check if a response status means the server is failing.
+
+    :param status: HTTP status, None for a connection error
+    :type status: int | None
+    :return: True for connection errors, 429 and 5xx statuses
+    :rtype: bool
+    """
+    return status is None or status == 429 or status >= 500
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker failing fast while the server is down.
+
+    The circuit opens after `failure_threshold` consecutive failures, or when at
+    least `min_calls` of the last `window` calls were recorded and more than
+    `error_rate_threshold` of them failed. While open, requests are refused until
+    `reset_timeout` seconds have passed, then up to `half_open_calls` probe requests
+    are let through: the circuit closes when all of them succeed and opens again on
+    the first failure. A breaker can be shared by helpers hitting the same server.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30,
+        half_open_calls: int = 1,
+    ) -> None:
+        """
+        Initialize CircuitBreaker.
+
+        :param failure_threshold: consecutive failures opening the circuit
+        :type failure_threshold: int
+        :param error_rate_threshold: failure rate of the window opening the circuit
+        :type error_rate_threshold: float
+        :param window: number of last calls used for the failure rate
+        :type window: int
+        :param min_calls: calls needed in the window before the rate is checked
+        :type min_calls: int
+        :param reset_timeout: seconds the circuit stays open before probing
+        :type reset_timeout: float
+        :param half_open_calls: probe requests let through while half open
+        :type half_open_calls: int
+        """
+        self._failure_threshold = failure_threshold
+        self._error_rate_threshold = error_rate_threshold
+        self._min_calls = min_calls
+        self._reset_timeout = reset_timeout
+        self._half_open_calls = half_open_calls
+        self._lock = Lock()
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Get circuit state.
+
+        :return: circuit state
+        :rtype: CircuitState
+        """
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def retry_after(self) -> float:
+        """
+        Get seconds until the open circuit lets probe requests through.
+
+        :return: seconds to wait, 0 when requests are allowed
+        :rtype: float
+        """
+        with self._lock:
+            if self._current_state() != CircuitState.OPEN:
+                return 0.0
+            return max(self._opened_at + self._reset_timeout - time.monotonic(), 0.0)
+
+    @property
+    def error_rate(self) -> float:
+        """
+        Get failure rate of the last calls.
+
+        :return: failure rate, 0 before any call
+        :rtype: float
+        """
+        with self._lock:
+            if len(self._outcomes) == 0:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def allow_request(self) -> bool:
+        """
+        Check if a request can be sent, taking a probe slot when half open.
+
+        :return: True when the request can be sent
+        :rtype: bool
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and self._probes < self._half_open_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._current_state() == CircuitState.HALF_OPEN:
+                self._probe_successes += 1
+                if self._probe_successes >= self._half_open_calls:
+                    self._state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                return
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.HALF_OPEN:
+                self._open()
+                return
+            self._consecutive_failures += 1
+            self._outcomes.append(False)
+            if state == CircuitState.CLOSED and (
+                self._consecutive_failures >= self._failure_threshold
+                or (
+                    len(self._outcomes) >= self._min_calls
+                    and self._outcomes.count(False) / len(self._outcomes)
+                    > self._error_rate_threshold
+                )
+            ):
+                self._open()
+
+    def release(self) -> None:
+        """
+        Give back the probe slot of a request that ended without an outcome.
+
+        A cancelled or interrupted request says nothing about the server, so it is
+        neither a success nor a failure, but a half open probe must not keep its
+        slot.
+        """
+        with self._lock:
+            if self._current_state() == CircuitState.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def reset(self) -> None:
+        """Close the circuit and forget recorded calls."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._outcomes.clear()
+            self._consecutive_failures = 0
+
+    def _open(self) -> None:
+        """Open the circuit."""
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._consecutive_failures = 0
+
+    def _current_state(self) -> CircuitState:
+        """Get the state, moving an expired open circuit to half open."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() >= self._opened_at + self._reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+        return self._state
+
+    def __str__(self) -> str:
+        """Cast CircuitBreaker to str."""
+        return str(self.__class__) + ": " + str(self.__dict__)
@@ -4,11 +4,17 @@ SUNWEG_URL = "https://api.sunweg.net/v2/"
 """SunWEG API URL"""
 SUNWEG_LOGIN_PATH = "login/autenticacao"
 """SunWEG API login path"""
-SUNWEG_PLANT_LIST_PATH = (
+SUNWEG_PLANT_LIST_PAGE_PATH = (
     "getpaineloperacao?procurar=&integrador="
     + "&franqueado=&manutencao=&portal=&alarme=&"
     + "planos=%5B0,1,2,3,4%5D&status=%5B1,2,3,4,5%5D&"
-    + "limite=100&situacao=&paginaAtual=1"
+    + "limite={limit}&situacao=&paginaAtual={page}"
+)
+"""SunWEG API list plants path with `limit` and `page` placeholders"""
+SUNWEG_PLANT_LIST_PAGE_SIZE = 100
+"""SunWEG API default list plants page size"""
+SUNWEG_PLANT_LIST_PATH = SUNWEG_PLANT_LIST_PAGE_PATH.format(
+    limit=SUNWEG_PLANT_LIST_PAGE_SIZE, page=1
 )
 """SunWEG API list plants path"""
 SUNWEG_PLANT_DETAIL_PATH = "viewresumov2?agrupado=false&id="
@@ -0,0 +1,50 @@
+"""Sunweg API JSON decoding."""
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+JsonDecoder = Callable[[bytes], Any]
+"""Function decoding a raw response body"""
+
+
+def decode_json_stdlib(content: bytes) -> Any:
+    """
+    Decode a raw response body with the standard library.
+
+    The encoding is detected from the bytes, so `Response.text` and its charset
+    guessing are skipped, but `json.loads` still decodes the body to text.
+
+    :param content: raw response body
+    :type content: bytes
+    :return: decoded JSON
+    :rtype: Any
+    """
+    return json.loads(content)
+
+
+def decode_json_orjson(content: bytes) -> Any:
+    """
+    Decode a raw response body with orjson, without copying it to text.
+
+    :param content: raw response body
+    :type content: bytes
+    :return: decoded JSON
+    :rtype: Any
+    """
+    return orjson.loads(content)
+
+
+def default_decoder() -> JsonDecoder:
+    """
+    Get the fastest available decoder.
+
+    :return: orjson decoder if orjson is installed, else the standard one
+    :rtype: JsonDecoder
+    """
+    return decode_json_orjson if orjson is not None else decode_json_stdlib
@@ -1,10 +1,21 @@
 """Sunweg API devices."""
-from .util import Status
+from array import array
+
+from .units import EnergyUnit, PowerUnit, energy_unit, power_unit
+from .util import Status, slots_dict
 
 
 class Phase:
     """Phase details."""
 
+    __slots__ = (
+        "_name",
+        "_voltage",
+        "_amperage",
+        "_status_voltage",
+        "_status_amperage",
+    )
+
     def __init__(
         self,
         name: str,
@@ -85,12 +96,14 @@ class Phase:
 
     def __str__(self) -> str:
         """Cast Phase to str."""
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return str(self.__class__) + ": " + str(slots_dict(self))
 
 
 class String:
     """String details."""
 
+    __slots__ = ("_name", "_voltage", "_amperage", "_status")
+
     def __init__(
         self, name: str, voltage: float, amperage: float, status: Status
     ) -> None:
@@ -153,12 +166,14 @@ class String:
 
     def __str__(self) -> str:
         """Cast String to str."""
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return str(self.__class__) + ": " + str(slots_dict(self))
 
 
 class MPPT:
     """MPPT details."""
 
+    __slots__ = ("_name", "_strings")
+
     def __init__(self, name: str) -> None:
         """
         Initialize MPPT.
@@ -191,12 +206,285 @@ class MPPT:
 
     def __str__(self) -> str:
         """Cast MPPT to str."""
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return str(self.__class__) + ": " + str(slots_dict(self))
+
+
+class InverterReadings:
+    """
+    String and phase readings of an inverter stored in contiguous arrays.
+
+    Strings are stored in MPPT order, with the index of their MPPT in
+    `string_mppt`. Statuses are stored as `Status` values.
+    """
+
+    __slots__ = (
+        "_mppt_names",
+        "_string_names",
+        "_string_mppt",
+        "_string_voltage",
+        "_string_amperage",
+        "_string_status",
+        "_phase_names",
+        "_phase_voltage",
+        "_phase_amperage",
+        "_phase_status_voltage",
+        "_phase_status_amperage",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty InverterReadings."""
+        self._mppt_names: list[str] = []
+        self._string_names: list[str] = []
+        self._string_mppt = array("i")
+        self._string_voltage = array("d")
+        self._string_amperage = array("d")
+        self._string_status = array("b")
+        self._phase_names: list[str] = []
+        self._phase_voltage = array("d")
+        self._phase_amperage = array("d")
+        self._phase_status_voltage = array("b")
+        self._phase_status_amperage = array("b")
+
+    def add_mppt(self, name: str) -> int:
+        """
+        Add a MPPT.
+
+        :param name: MPPT name
+        :type name: str
+        :return: MPPT index
+        :rtype: int
+        """
+        self._mppt_names.append(name)
+        return len(self._mppt_names) - 1
+
+    def add_string(
+        self, mppt: int, name: str, voltage: float, amperage: float, status: Status
+    ) -> None:
+        """
+        Add a string reading.
+
+        :param mppt: index of the string MPPT
+        :type mppt: int
+        :param name: string name
+        :type name: str
+        :param voltage: string voltage
+        :type voltage: float
+        :param amperage: string amperage
+        :type amperage: float
+        :param status: string status
+        :type status: Status
+        """
+        self._string_names.append(name)
+        self._string_mppt.append(mppt)
+        self._string_voltage.append(voltage)
+        self._string_amperage.append(amperage)
+        self._string_status.append(status.value)
+
+    def add_phase(
+        self,
+        name: str,
+        voltage: float,
+        amperage: float,
+        status_voltage: Status,
+        status_amperage: Status,
+    ) -> None:
+        """
+        Add a phase reading.
+
+        :param name: phase name
+        :type name: str
+        :param voltage: phase voltage
+        :type voltage: float
+        :param amperage: phase amperage
+        :type amperage: float
+        :param status_voltage: phase voltage status
+        :type status_voltage: Status
+        :param status_amperage: phase amperage status
+        :type status_amperage: Status
+        """
+        self._phase_names.append(name)
+        self._phase_voltage.append(voltage)
+        self._phase_amperage.append(amperage)
+        self._phase_status_voltage.append(status_voltage.value)
+        self._phase_status_amperage.append(status_amperage.value)
+
+    @property
+    def mppt_names(self) -> list[str]:
+        """
+        Get MPPT names.
+
+        :return: MPPT names
+        :rtype: list[str]
+        """
+        return self._mppt_names
+
+    @property
+    def string_names(self) -> list[str]:
+        """
+        Get string names.
+
+        :return: string names
+        :rtype: list[str]
+        """
+        return self._string_names
+
+    @property
+    def string_mppt(self) -> array:
+        """
+        Get MPPT index of each string.
+
+        :return: MPPT indexes
+        :rtype: array
+        """
+        return self._string_mppt
+
+    @property
+    def string_voltage(self) -> array:
+        """
+        Get string voltages.
+
+        :return: string voltages
+        :rtype: array
+        """
+        return self._string_voltage
+
+    @property
+    def string_amperage(self) -> array:
+        """
+        Get string amperages.
+
+        :return: string amperages
+        :rtype: array
+        """
+        return self._string_amperage
+
+    @property
+    def string_status(self) -> array:
+        """
+        Get string status values.
+
+        :return: string status values
+        :rtype: array
+        """
+        return self._string_status
+
+    @property
+    def phase_names(self) -> list[str]:
+        """
+        Get phase names.
+
+        :return: phase names
+        :rtype: list[str]
+        """
+        return self._phase_names
+
+    @property
+    def phase_voltage(self) -> array:
+        """
+        Get phase voltages.
+
+        :return: phase voltages
+        :rtype: array
+        """
+        return self._phase_voltage
+
+    @property
+    def phase_amperage(self) -> array:
+        """
+        Get phase amperages.
+
+        :return: phase amperages
+        :rtype: array
+        """
+        return self._phase_amperage
+
+    @property
+    def phase_status_voltage(self) -> array:
+        """
+        Get phase voltage status values.
+
+        :return: phase voltage status values
+        :rtype: array
+        """
+        return self._phase_status_voltage
+
+    @property
+    def phase_status_amperage(self) -> array:
+        """
+        Get phase amperage status values.
+
+        :return: phase amperage status values
+        :rtype: array
+        """
+        return self._phase_status_amperage
+
+    def mppts(self) -> list[MPPT]:
+        """
+        Build the MPPT objects of the readings.
+
+        :return: list of MPPTs with their strings
+        :rtype: list[MPPT]
+        """
+        mppts = [MPPT(name) for name in self._mppt_names]
+        for i, name in enumerate(self._string_names):
+            mppts[self._string_mppt[i]].strings.append(
+                String(
+                    name,
+                    self._string_voltage[i],
+                    self._string_amperage[i],
+                    Status(self._string_status[i]),
+                )
+            )
+        return mppts
+
+    def phases(self) -> list[Phase]:
+        """
+        Build the phase objects of the readings.
+
+        :return: list of phases
+        :rtype: list[Phase]
+        """
+        return [
+            Phase(
+                name,
+                self._phase_voltage[i],
+                self._phase_amperage[i],
+                Status(self._phase_status_voltage[i]),
+                Status(self._phase_status_amperage[i]),
+            )
+            for i, name in enumerate(self._phase_names)
+        ]
+
+    def __str__(self) -> str:
+        """Cast InverterReadings to str."""
+        return str(self.__class__) + ": " + str(slots_dict(self))
 
 
 class Inverter:
     """Inverter device."""
 
+    __slots__ = (
+        "_id",
+        "_name",
+        "_sn",
+        "_total_energy",
+        "_total_energy_metric",
+        "_total_energy_unit",
+        "_today_energy",
+        "_today_energy_metric",
+        "_today_energy_unit",
+        "_power_factor",
+        "_frequency",
+        "_power",
+        "_power_metric",
+        "_power_unit",
+        "_status",
+        "_temperature",
+        "_phases",
+        "_mppts",
+        "_readings",
+    )
+
     def __init__(
         self,
         id: int,
@@ -248,16 +536,20 @@ class Inverter:
         self._sn = sn
         self._total_energy = total_energy
         self._total_energy_metric = total_energy_metric
+        self._total_energy_unit = energy_unit(total_energy_metric)
         self._today_energy = today_energy
         self._today_energy_metric = today_energy_metric
+        self._today_energy_unit = energy_unit(today_energy_metric)
         self._power_factor = power_factor
         self._frequency = frequency
         self._power = power
         self._power_metric = power_metric
+        self._power_unit = power_unit(power_metric)
         self._status = status
         self._temperature = temperature
-        self._phases: list[Phase] = []
-        self._mppts: list[MPPT] = []
+        self._phases: list[Phase] | None = []
+        self._mppts: list[MPPT] | None = []
+        self._readings: InverterReadings | None = None
 
     @property
     def id(self) -> int:
@@ -348,6 +640,7 @@ class Inverter:
         :type value: str
         """
         self._today_energy_metric = value
+        self._today_energy_unit = energy_unit(value)
 
     @property
     def total_energy(self) -> float:
@@ -388,6 +681,7 @@ class Inverter:
         :type value: str
         """
         self._total_energy_metric = value
+        self._total_energy_unit = energy_unit(value)
 
     @property
     def power_factor(self) -> float:
@@ -468,6 +762,70 @@ class Inverter:
         :type value: float
         """
         self._power_metric = value
+        self._power_unit = power_unit(value)
+
+    @property
+    def today_energy_unit(self) -> EnergyUnit | None:
+        """
+        Get inverter today generated energy unit, parsed from its metric.
+
+        :return: inverter today generated energy unit, None when unknown
+        :rtype: EnergyUnit | None
+        """
+        return self._today_energy_unit
+
+    @property
+    def today_energy_wh(self) -> float | None:
+        """
+        Get inverter today generated energy in Wh.
+
+        :return: inverter today generated energy in Wh, None when its unit is unknown
+        :rtype: float | None
+        """
+        unit = self._today_energy_unit
+        return None if unit is None else self._today_energy * unit.factor
+
+    @property
+    def total_energy_unit(self) -> EnergyUnit | None:
+        """
+        Get inverter total generated energy unit, parsed from its metric.
+
+        :return: inverter total generated energy unit, None when unknown
+        :rtype: EnergyUnit | None
+        """
+        return self._total_energy_unit
+
+    @property
+    def total_energy_wh(self) -> float | None:
+        """
+        Get inverter total generated energy in Wh.
+
+        :return: inverter total generated energy in Wh, None when its unit is unknown
+        :rtype: float | None
+        """
+        unit = self._total_energy_unit
+        return None if unit is None else self._total_energy * unit.factor
+
+    @property
+    def power_unit(self) -> PowerUnit | None:
+        """
+        Get inverter output power unit, parsed from its metric.
+
+        :return: inverter output power unit, None when unknown
+        :rtype: PowerUnit | None
+        """
+        return self._power_unit
+
+    @property
+    def power_w(self) -> float | None:
+        """
+        Get inverter output power in W.
+
+        :return: inverter output power in W, None when its unit is unknown
+        :rtype: float | None
+        """
+        unit = self._power_unit
+        return None if unit is None else self._power * unit.factor
 
     @property
     def is_complete(self) -> bool:
@@ -488,23 +846,49 @@ class Inverter:
     @property
     def phases(self) -> list[Phase]:
         """
-        Get list of inverter's phases.
+        Get list of inverter's phases, built from the readings on first access.
 
         :return: list of phases
         :rtype: list[Phase]
         """
+        if self._phases is None:
+            self._phases = self._readings.phases() if self._readings else []
         return self._phases
 
     @property
     def mppts(self) -> list[MPPT]:
         """
-        Get list of inverter's MPPTs.
+        Get list of inverter's MPPTs, built from the readings on first access.
 
         :return: list of MPPTs
         :rtype: list[MPPT]
         """
+        if self._mppts is None:
+            self._mppts = self._readings.mppts() if self._readings else []
         return self._mppts
 
+    @property
+    def readings(self) -> InverterReadings | None:
+        """
+        Get string and phase readings.
+
+        :return: readings, None before the inverter is completed
+        :rtype: InverterReadings | None
+        """
+        return self._readings
+
+    @readings.setter
+    def readings(self, value: InverterReadings | None) -> None:
+        """
+        Set string and phase readings, replacing the MPPTs and phases.
+
+        :param value: readings
+        :type value: InverterReadings | None
+        """
+        self._readings = value
+        self._mppts = None
+        self._phases = None
+
     def __str__(self) -> str:
         """Cast Inverter to str."""
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return str(self.__class__) + ": " + str(slots_dict(self))
@@ -0,0 +1,247 @@
+"""Sunweg API models converted on demand from decoded responses."""
+
+from collections.abc import Callable
+from typing import Any
+
+from .device import Inverter, InverterReadings
+from .plant import Plant
+from .units import Unit, energy_unit, power_unit
+from .util import (
+    Status,
+    convert_situation_status,
+    parse_datetime,
+    separate_value_metric,
+    slots_dict,
+)
+
+
+def readings_from_response(result: dict) -> InverterReadings:
+    """
+    Build the string and phase readings from an inverter detail response.
+
+    :param result: decoded inverter detail response
+    :type result: dict
+    :return: inverter readings
+    :rtype: InverterReadings
+    """
+    readings = InverterReadings()
+    reading = result["inversor"]["leitura"]
+    for str_mppt in result["stringmppt"]:
+        mppt = readings.add_mppt(str_mppt["nomemppt"])
+        for str_string in str_mppt["strings"]:
+            readings.add_string(
+                mppt,
+                str_string["nome"],
+                float(reading[str_string["variaveltensao"]]),
+                float(reading[str_string["variavelcorrente"]]),
+                convert_situation_status(int(str_string["situacao"])),
+            )
+
+    for phase_name in result["correnteCA"].keys():
+        if str(phase_name).endswith("status"):
+            continue
+        readings.add_phase(
+            phase_name,
+            float(result["tensaoca"][phase_name].replace(",", ".")),
+            float(result["correnteCA"][phase_name].replace(",", ".")),
+            Status(result["tensaoca"][phase_name + "status"]),
+            Status(result["correnteCA"][phase_name + "status"]),
+        )
+    return readings
+
+
+def _plant_today_energy(result: dict) -> dict[str, Any]:
+    """Convert the today energy of a plant and its metric."""
+    (value, metric) = separate_value_metric(result["energiadia"], "kWh")
+    return {
+        "_today_energy": value,
+        "_today_energy_metric": metric,
+        "_today_energy_unit": energy_unit(metric),
+    }
+
+
+def _plant_total_power(result: dict) -> dict[str, Any]:
+    """Convert the total power of a plant, its metric and unit."""
+    (value, metric) = separate_value_metric(result["AcumuladoPotencia"], "kW")
+    return {
+        "_total_power": value,
+        "_total_power_metric": metric,
+        "_total_power_unit": power_unit(metric),
+    }
+
+
+def _plant_inverters(result: dict) -> dict[str, Any]:
+    """Build the inverters of a plant, without their readings."""
+    return {
+        "_inverters": [
+            Inverter(
+                id=inv["id"],
+                name=inv["nome"],
+                sn=inv["esn"],
+                status=Status(int(inv["situacao"])),
+                temperature=inv["temperatura"],
+            )
+            for inv in result["usinas"]["inversores"]
+        ]
+    }
+
+
+_PLANT_FIELDS: dict[str, Callable[[dict], dict[str, Any]]] = {
+    "_name": lambda result: {"_name": result["usinas"]["nome"]},
+    "_total_power": _plant_total_power,
+    "_total_power_metric": _plant_total_power,
+    "_total_power_unit": _plant_total_power,
+    "_kwh_per_kwp": lambda result: {"_kwh_per_kwp": float(0)},
+    "_performance_rate": lambda result: {"_performance_rate": float(0)},
+    "_saving": lambda result: {
+        "_saving": separate_value_metric(result["economia"], metric_before=True)[0]
+    },
+    "_today_energy": _plant_today_energy,
+    "_today_energy_metric": _plant_today_energy,
+    "_today_energy_unit": _plant_today_energy,
+    "_total_energy": lambda result: {
+        "_total_energy": float(result["energiaacumuladanumber"])
+    },
+    "_total_carbon_saving": lambda result: {
+        "_total_carbon_saving": result["reduz_carbono_total_number"]
+    },
+    "_last_update": lambda result: {
+        "_last_update": (
+            parse_datetime(result["ultimaAtualizacao"])
+            if result["ultimaAtualizacao"] is not None
+            else None
+        )
+    },
+    "_inverters": _plant_inverters,
+}
+
+
+def _inverter_value_metric(
+    key: str, field: str, default_metric: str, parse_unit: Callable[[str], Unit | None]
+) -> Callable:
+    """Build a loader converting an inverter value, its metric and unit."""
+
+    def load(result: dict) -> dict[str, Any]:
+        (value, metric) = separate_value_metric(result[key], default_metric)
+        return {
+            field: value,
+            field + "_metric": metric,
+            field + "_unit": parse_unit(metric),
+        }
+
+    return load
+
+
+_INVERTER_FIELDS: dict[str, Callable[[dict], dict[str, Any]]] = {
+    "_name": lambda result: {"_name": result["inversor"]["nome"]},
+    "_sn": lambda result: {"_sn": result["inversor"]["esn"]},
+    "_status": lambda result: {"_status": Status(int(result["statusInversor"]))},
+    "_temperature": lambda result: {"_temperature": result["temperatura"]},
+    "_total_energy": _inverter_value_metric(
+        "energiaacumulada", "_total_energy", "kWh", energy_unit
+    ),
+    "_today_energy": _inverter_value_metric(
+        "energiadodia", "_today_energy", "kWh", energy_unit
+    ),
+    "_power": _inverter_value_metric("potenciaativa", "_power", "kW", power_unit),
+    "_power_factor": lambda result: {
+        "_power_factor": float(result["fatorpotencia"].replace(",", "."))
+    },
+    "_frequency": lambda result: {
+        "_frequency": float(result["frequencia"].replace(",", "."))
+    },
+    "_readings": lambda result: {"_readings": readings_from_response(result)},
+    "_mppts": lambda result: {"_mppts": None},
+    "_phases": lambda result: {"_phases": None},
+}
+for _field in ("_total_energy", "_today_energy", "_power"):
+    _INVERTER_FIELDS[_field + "_metric"] = _INVERTER_FIELDS[_field]
+    _INVERTER_FIELDS[_field + "_unit"] = _INVERTER_FIELDS[_field]
+
+
+def _load(obj: Any, fields: dict, name: str) -> Any:
+    """Convert the field `name` of a lazy model and cache it in its slot."""
+    load = fields.get(name)
+    if load is None:
+        raise AttributeError(
+            "%r object has no attribute %r" % (type(obj).__name__, name)
+        )
+    for field, value in load(obj._result).items():
+        if not _is_set(obj, field):
+            setattr(obj, field, value)
+    return getattr(obj, name)
+
+
+def _is_set(obj: Any, name: str) -> bool:
+    """Check a slot holds a value, without converting it."""
+    try:
+        object.__getattribute__(obj, name)
+    except AttributeError:
+        return False
+    return True
+
+
+class LazyPlant(Plant):
+    """
+    Plant converting each field of a plant detail response on first access.
+
+    A field is converted the first time it is read and then cached, so reading a
+    few properties does not pay for parsing the whole response.
+    """
+
+    __slots__ = ("_result",)
+
+    def __init__(self, id: int, result: dict) -> None:
+        """
+        Initialize LazyPlant.
+
+        :param id: plant id
+        :type id: int
+        :param result: decoded plant detail response
+        :type result: dict
+        """
+        self._id = id
+        self._result = result
+
+    def __getattr__(self, name: str) -> Any:
+        """Convert a field that was not read yet."""
+        return _load(self, _PLANT_FIELDS, name)
+
+    def __str__(self) -> str:
+        """Cast LazyPlant to str."""
+        fields = slots_dict(self)
+        del fields["_result"]
+        return str(self.__class__) + ": " + str(fields)
+
+
+class LazyInverter(Inverter):
+    """
+    Inverter converting each field of an inverter detail response on first access.
+
+    A field is converted the first time it is read and then cached. The string and
+    phase readings are only parsed when the readings, MPPTs or phases are read.
+    """
+
+    __slots__ = ("_result",)
+
+    def __init__(self, id: int, result: dict) -> None:
+        """
+        Initialize LazyInverter.
+
+        :param id: inverter id
+        :type id: int
+        :param result: decoded inverter detail response
+        :type result: dict
+        """
+        self._id = id
+        self._result = result
+
+    def __getattr__(self, name: str) -> Any:
+        """Convert a field that was not read yet."""
+        return _load(self, _INVERTER_FIELDS, name)
+
+    def __str__(self) -> str:
+        """Cast LazyInverter to str."""
+        fields = slots_dict(self)
+        del fields["_result"]
+        return str(self.__class__) + ": " + str(fields)
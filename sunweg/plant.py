@@ -4,11 +4,31 @@ from datetime import datetime
 import warnings
 
 from .device import Inverter
+from .units import EnergyUnit, PowerUnit, energy_unit, power_unit
+from .util import PlantStatus, slots_dict
 
 
 class Plant:
     """Plant details."""
 
+    __slots__ = (
+        "_id",
+        "_name",
+        "_total_power",
+        "_total_power_metric",
+        "_total_power_unit",
+        "_kwh_per_kwp",
+        "_performance_rate",
+        "_saving",
+        "_today_energy",
+        "_today_energy_metric",
+        "_today_energy_unit",
+        "_total_energy",
+        "_total_carbon_saving",
+        "_last_update",
+        "_inverters",
+    )
+
     def __init__(
         self,
         id: int,
@@ -22,6 +42,7 @@ class Plant:
         total_energy: float,
         total_carbon_saving: float,
         last_update: datetime | None,
+        total_power_metric: str = "",
     ) -> None:
         """
         Initialize Plant.
@@ -48,15 +69,20 @@ class Plant:
         :type total_carbon_saving: float
         :param last_update: when the data was updated
         :type last_update: datetime | None
+        :param total_power_metric: plant total power metric
+        :type total_power_metric: str
         """
         self._id = id
         self._name = name
         self._total_power = total_power
+        self._total_power_metric = total_power_metric
+        self._total_power_unit = power_unit(total_power_metric)
         self._kwh_per_kwp = kwh_per_kwp
         self._performance_rate = performance_rate
         self._saving = saving
         self._today_energy = today_energy
         self._today_energy_metric = today_energy_metric
+        self._today_energy_unit = energy_unit(today_energy_metric)
         self._total_energy = total_energy
         self._total_carbon_saving = total_carbon_saving
         self._last_update = last_update
@@ -92,6 +118,37 @@ class Plant:
         """
         return self._total_power
 
+    @property
+    def total_power_metric(self) -> str:
+        """
+        Get plant total power metric.
+
+        :return: plant total power metric
+        :rtype: str
+        """
+        return self._total_power_metric
+
+    @property
+    def total_power_unit(self) -> PowerUnit | None:
+        """
+        Get plant total power unit, parsed from its metric.
+
+        :return: plant total power unit, None when unknown
+        :rtype: PowerUnit | None
+        """
+        return self._total_power_unit
+
+    @property
+    def total_power_w(self) -> float | None:
+        """
+        Get plant total power in W.
+
+        :return: plant total power in W, None when its unit is unknown
+        :rtype: float | None
+        """
+        unit = self._total_power_unit
+        return None if unit is None else self._total_power * unit.factor
+
     @property
     def kwh_per_kwp(self) -> float:
         """
@@ -164,6 +221,37 @@ class Plant:
         """
         return self._total_energy
 
+    @property
+    def today_energy_unit(self) -> EnergyUnit | None:
+        """
+        Get plant today generated energy unit, parsed from its metric.
+
+        :return: plant today generated energy unit, None when unknown
+        :rtype: EnergyUnit | None
+        """
+        return self._today_energy_unit
+
+    @property
+    def today_energy_wh(self) -> float | None:
+        """
+        Get plant today generated energy in Wh.
+
+        :return: plant today generated energy in Wh, None when its unit is unknown
+        :rtype: float | None
+        """
+        unit = self._today_energy_unit
+        return None if unit is None else self._today_energy * unit.factor
+
+    @property
+    def total_energy_wh(self) -> float:
+        """
+        Get plant total generated energy in Wh.
+
+        :return: plant total generated energy in Wh
+        :rtype: float
+        """
+        return self._total_energy * EnergyUnit.KWH.factor
+
     @property
     def total_carbon_saving(self) -> float:
         """
@@ -196,4 +284,46 @@ class Plant:
 
     def __str__(self) -> str:
         """Cast Plant to str."""
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return str(self.__class__) + ": " + str(slots_dict(self))
+
+
+class PlantSummary:
+    """Plant entry of the plant list."""
+
+    __slots__ = ("_id", "_status")
+
+    def __init__(self, id: int, status: PlantStatus) -> None:
+        """
+        Initialize PlantSummary.
+
+        :param id: plant id
+        :type id: int
+        :param status: plant status bucket
+        :type status: PlantStatus
+        """
+        self._id = id
+        self._status = status
+
+    @property
+    def id(self) -> int:
+        """
+        Get plant id.
+
+        :return: plant id
+        :rtype: int
+        """
+        return self._id
+
+    @property
+    def status(self) -> PlantStatus:
+        """
+        Get plant status bucket.
+
+        :return: plant status bucket
+        :rtype: PlantStatus
+        """
+        return self._status
+
+    def __str__(self) -> str:
+        """Cast PlantSummary to str."""
+        return str(self.__class__) + ": " + str(slots_dict(self))
@@ -0,0 +1,160 @@
+"""Sunweg API client side rate limiting."""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from threading import BoundedSemaphore, Lock
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the request rate plus a limit of requests in flight.
+
+    Up to `burst` requests are sent at once, then they are spaced to average
+    `rate` requests per second. A limiter can be shared by threads and by several
+    helpers, so that every request to the server goes through the same bucket. The
+    time each request waited is recorded to tune the rate.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        max_in_flight: int | None = None,
+    ) -> None:
+        """
+        Initialize RateLimiter.
+
+        :param rate: requests per second, None for no rate limit
+        :type rate: float | None
+        :param burst: requests sent at once before the rate applies
+        :type burst: int
+        :param max_in_flight: maximum simultaneous requests, None for no limit
+        :type max_in_flight: int | None
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be positive")
+        self._interval = 1 / rate if rate is not None else 0.0
+        self._tolerance = (burst - 1) * self._interval
+        self._max_in_flight = max_in_flight
+        self._semaphore = (
+            BoundedSemaphore(max_in_flight) if max_in_flight is not None else None
+        )
+        self._async_semaphore: asyncio.Semaphore | None = None
+        self._lock = Lock()
+        self._theoretical_arrival = 0.0
+        self._requests = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def requests(self) -> int:
+        """
+        Get number of requests let through.
+
+        :return: number of requests
+        :rtype: int
+        """
+        return self._requests
+
+    @property
+    def total_wait(self) -> float:
+        """
+        Get seconds waited by every request.
+
+        :return: total wait in seconds
+        :rtype: float
+        """
+        return self._total_wait
+
+    @property
+    def max_wait(self) -> float:
+        """
+        Get longest wait of a request.
+
+        :return: longest wait in seconds
+        :rtype: float
+        """
+        return self._max_wait
+
+    @property
+    def mean_wait(self) -> float:
+        """
+        Get average wait of a request.
+
+        :return: average wait in seconds, 0 before any request
+        :rtype: float
+        """
+        return self._total_wait / self._requests if self._requests else 0.0
+
+    def reset_stats(self) -> None:
+        """Reset wait statistics."""
+        with self._lock:
+            self._requests = 0
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+
+    def reserve(self) -> float:
+        """
+        Reserve a slot in the bucket.
+
+        :return: seconds to wait before sending the request
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            arrival = max(self._theoretical_arrival, now)
+            delay = max(arrival - self._tolerance - now, 0.0)
+            self._theoretical_arrival = arrival + self._interval
+            return delay
+
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        """Wait for a slot and hold it while the request is in flight."""
+        start = time.monotonic()
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            delay = self.reserve()
+            if delay > 0:
+                time.sleep(delay)
+            self._record(time.monotonic() - start)
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    @asynccontextmanager
+    async def async_acquire(self) -> AsyncIterator[None]:
+        """Wait for a slot without blocking the event loop."""
+        start = time.monotonic()
+        if self._max_in_flight is None:
+            semaphore = None
+        else:
+            if self._async_semaphore is None:
+                self._async_semaphore = asyncio.Semaphore(self._max_in_flight)
+            semaphore = self._async_semaphore
+            await semaphore.acquire()
+        try:
+            delay = self.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._record(time.monotonic() - start)
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def _record(self, wait: float) -> None:
+        """Record the wait of a request."""
+        with self._lock:
+            self._requests += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def __str__(self) -> str:
+        """Cast RateLimiter to str."""
+        return str(self.__class__) + ": " + str(self.__dict__)
@@ -0,0 +1,222 @@
+"""Sunweg API retry policy for transient failures."""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+from threading import Lock
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+"""HTTP statuses retried by default"""
+
+
+def parse_retry_after(value: str | None, now: datetime | None = None) -> float | None:
+    """
+    Parse a Retry-After header.
+
+    :param value: header value, either seconds or an HTTP date
+    :type value: str | None
+    :param now: reference time of an HTTP date, defaults to the current time
+    :type now: datetime | None
+    :return: seconds to wait, None if missing or invalid
+    :rtype: float | None
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+class RetryBudget:
+    """
+    Limit of retries relative to the number of requests.
+
+    Every request deposits `ratio` of a retry and every retry withdraws a whole
+    one, so during an outage at most `ratio` extra requests are sent per request on
+    top of `min_retries`, instead of multiplying the load by the number of attempts.
+    A budget can be shared by helpers hitting the same server.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: float = 10) -> None:
+        """
+        Initialize RetryBudget.
+
+        :param ratio: retries earned by each request
+        :type ratio: float
+        :param min_retries: retries available before any request is sent
+        :type min_retries: float
+        """
+        self._ratio = ratio
+        self._min_retries = min_retries
+        self._balance = float(min_retries)
+        self._lock = Lock()
+
+    @property
+    def balance(self) -> float:
+        """
+        Get retries currently available.
+
+        :return: retries available
+        :rtype: float
+        """
+        return self._balance
+
+    def deposit(self) -> None:
+        """Record a request."""
+        with self._lock:
+            self._balance = min(
+                self._balance + self._ratio, max(self._min_retries, 1.0)
+            )
+
+    def withdraw(self) -> bool:
+        """
+        Take a retry from the budget.
+
+        :return: True when the retry is allowed
+        :rtype: bool
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Retry of transient failures with capped exponential backoff and full jitter.
+
+    Responses with a status in `statuses` and connection errors are retried up to
+    `max_attempts` attempts in total. The delay before attempt n + 1 is drawn
+    uniformly from [0, min(max_backoff, backoff * 2 ** (n - 1))], unless the
+    server sent a Retry-After header, which is honoured up to `max_retry_after`.
+    Retries sleep in the calling thread or task, so a long Retry-After fails the
+    request instead of blocking the caller.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        statuses: frozenset[int] = RETRY_STATUSES,
+        max_retry_after: float = 10,
+        budget: RetryBudget | None = None,
+        endpoints: dict[str, "RetryPolicy"] | None = None,
+    ) -> None:
+        """
+        Initialize RetryPolicy.
+
+        :param max_attempts: maximum attempts of a request, 1 disables retries
+        :type max_attempts: int
+        :param backoff: base delay in seconds
+        :type backoff: float
+        :param max_backoff: maximum delay in seconds
+        :type max_backoff: float
+        :param statuses: HTTP statuses retried
+        :type statuses: frozenset[int]
+        :param max_retry_after: longest Retry-After honoured in seconds, longer fail
+        :type max_retry_after: float
+        :param budget: retry budget, None for unlimited retries
+        :type budget: RetryBudget | None
+        :param endpoints: policies used instead of this one, keyed by path prefix
+        :type endpoints: dict[str, RetryPolicy] | None
+        """
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._statuses = statuses
+        self._max_retry_after = max_retry_after
+        self._budget = budget
+        self._endpoints = endpoints or {}
+
+    @property
+    def max_attempts(self) -> int:
+        """
+        Get maximum attempts of a request.
+
+        :return: maximum attempts
+        :rtype: int
+        """
+        return self._max_attempts
+
+    @property
+    def budget(self) -> RetryBudget | None:
+        """
+        Get retry budget.
+
+        :return: retry budget, None for unlimited retries
+        :rtype: RetryBudget | None
+        """
+        return self._budget
+
+    def for_path(self, path: str) -> "RetryPolicy":
+        """
+        Get the policy of a request path.
+
+        :param path: request path
+        :type path: str
+        :return: endpoint policy, this policy if there is no override
+        :rtype: RetryPolicy
+        """
+        for prefix, policy in self._endpoints.items():
+            if path.startswith(prefix):
+                return policy
+        return self
+
+    def is_retryable(self, status: int | None) -> bool:
+        """
+        Check if a response status is transient.
+
+        :param status: HTTP status, None for a connection error
+        :type status: int | None
+        :return: True when the request may succeed if retried
+        :rtype: bool
+        """
+        return status is None or status in self._statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float | None:
+        """
+        Get the delay before the next attempt.
+
+        :param attempt: number of attempts already made
+        :type attempt: int
+        :param retry_after: Retry-After header of the failed response
+        :type retry_after: str | None
+        :return: seconds to wait, None when the request must not be retried
+        :rtype: float | None
+        """
+        if attempt >= self._max_attempts:
+            return None
+        wait = parse_retry_after(retry_after)
+        if wait is not None:
+            return wait if wait <= self._max_retry_after else None
+        return random.uniform(
+            0, min(self._max_backoff, self._backoff * 2 ** (attempt - 1))
+        )
+
+    def __str__(self) -> str:
+        """Cast RetryPolicy to str."""
+        return str(self.__class__) + ": " + str(self.__dict__)
+
+
+def default_retry_policy() -> RetryPolicy:
+    """
+    Get the policy used by helpers without an explicit one.
+
+    Retries are limited by a new `RetryBudget`, so an outage adds at most about
+    20% more requests once the initial retries are spent.
+
+    :return: retry policy with its own budget
+    :rtype: RetryPolicy
+    """
+    return RetryPolicy(budget=RetryBudget())
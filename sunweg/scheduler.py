@@ -0,0 +1,276 @@
+"""Sunweg API plant polling scheduler."""
+
+from datetime import datetime, time, timedelta
+import heapq
+import itertools
+import logging
+import random
+
+from .api import APIHelper, CircuitOpenError
+from .plant import Plant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PlantSchedule:
+    """Polling state of a plant."""
+
+    def __init__(self, plant: Plant) -> None:
+        """Initialize _PlantSchedule."""
+        self.plant = plant
+        self.cadence: timedelta | None = None
+        self.offset: timedelta | None = None
+        self.misses = 0
+        self.due = datetime.min
+
+
+class PollingScheduler:
+    """
+    Poll each plant right after its data is expected to change.
+
+    The cadence of every plant is learned from the intervals between distinct
+    `Plant.last_update` values, and the plant is polled `delay` after its next
+    predicted update. `last_update` is in the clock of the API, so the offset to
+    the local clock is estimated as the smallest difference between a poll time
+    and the `last_update` it returned. When an update is late, polls back off
+    exponentially from `min_interval` up to the cadence. At night, plants whose
+    `today_energy` did not move since the previous poll are not polled until
+    `night_end`. Every poll time gets a random jitter so that plants do not all
+    fire at once, and nothing is polled while the circuit breaker of the helper is
+    open. A poll failing with any error is logged and backed off, so no plant
+    drops out of the schedule.
+    """
+
+    def __init__(
+        self,
+        api: APIHelper,
+        default_interval: timedelta = timedelta(minutes=5),
+        min_interval: timedelta = timedelta(minutes=1),
+        max_interval: timedelta = timedelta(hours=1),
+        delay: timedelta = timedelta(seconds=30),
+        jitter: timedelta = timedelta(seconds=30),
+        night_start: time = time(19),
+        night_end: time = time(6),
+    ) -> None:
+        """
+        Initialize PollingScheduler.
+
+        :param api: helper used to refresh the plants
+        :type api: APIHelper
+        :param default_interval: interval used until the cadence of a plant is known
+        :type default_interval: timedelta
+        :param min_interval: minimum interval between polls of a plant
+        :type min_interval: timedelta
+        :param max_interval: maximum interval between daytime polls of a plant
+        :type max_interval: timedelta
+        :param delay: time waited after the predicted update before polling
+        :type delay: timedelta
+        :param jitter: maximum random time added to every poll
+        :type jitter: timedelta
+        :param night_start: local time when the night starts
+        :type night_start: time
+        :param night_end: local time when the night ends
+        :type night_end: time
+        """
+        self._api = api
+        self._default_interval = default_interval
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._delay = delay
+        self._jitter = jitter
+        self._night_start = night_start
+        self._night_end = night_end
+        self._schedules: dict[int, _PlantSchedule] = {}
+        self._queue: list[tuple[datetime, int, int]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        """Get number of scheduled plants."""
+        return len(self._schedules)
+
+    def add(self, plant: Plant, now: datetime | None = None) -> None:
+        """
+        Schedule a plant, polling it within the jitter.
+
+        :param plant: plant to poll
+        :type plant: Plant
+        :param now: current local time, defaults to now
+        :type now: datetime | None
+        """
+        now = now or datetime.now()
+        schedule = _PlantSchedule(plant)
+        self._schedules[plant.id] = schedule
+        self._push(schedule, now + self._random_jitter())
+
+    def remove(self, plant_id: int) -> None:
+        """
+        Stop polling a plant.
+
+        :param plant_id: id of the plant
+        :type plant_id: int
+        """
+        self._schedules.pop(plant_id, None)
+
+    def plant(self, plant_id: int) -> Plant | None:
+        """
+        Get the last polled data of a plant.
+
+        :param plant_id: id of the plant
+        :type plant_id: int
+        :return: last polled plant, None if not scheduled
+        :rtype: Plant | None
+        """
+        schedule = self._schedules.get(plant_id)
+        return schedule.plant if schedule is not None else None
+
+    def cadence(self, plant_id: int) -> timedelta | None:
+        """
+        Get the learned update cadence of a plant.
+
+        :param plant_id: id of the plant
+        :type plant_id: int
+        :return: interval between updates, None while unknown
+        :rtype: timedelta | None
+        """
+        schedule = self._schedules.get(plant_id)
+        return schedule.cadence if schedule is not None else None
+
+    def next_due(self) -> datetime | None:
+        """
+        Get when the next plant is due.
+
+        :return: next poll time, None when no plant is scheduled
+        :rtype: datetime | None
+        """
+        while self._queue:
+            (due, _, plant_id) = self._queue[0]
+            schedule = self._schedules.get(plant_id)
+            if schedule is not None and schedule.due == due:
+                return due
+            heapq.heappop(self._queue)
+        return None
+
+    def poll_due(self, now: datetime | None = None) -> list[Plant]:
+        """
+        Refresh every plant that is due and reschedule it.
+
+        :param now: current local time, defaults to now
+        :type now: datetime | None
+        :return: refreshed plants that changed
+        :rtype: list[Plant]
+        """
+        now = now or datetime.now()
+        changed_plants: list[Plant] = []
+        while (due := self.next_due()) is not None and due <= now:
+            (_, _, plant_id) = heapq.heappop(self._queue)
+            schedule = self._schedules[plant_id]
+            try:
+                (plant, changed) = self._api.refresh_plant(schedule.plant)
+            except CircuitOpenError:
+                breaker = self._api.circuit_breaker
+                retry_after = breaker.retry_after if breaker is not None else 0
+                self._push(schedule, now + timedelta(seconds=retry_after))
+                break
+            except Exception as err:
+                _LOGGER.warning("Failed to poll plant %s: %s", plant_id, err)
+                schedule.misses += 1
+                self._push(
+                    schedule, now + self._backoff(schedule) + self._random_jitter()
+                )
+                continue
+            self.record(plant, changed, now)
+            if changed:
+                changed_plants.append(plant)
+        return changed_plants
+
+    def record(self, plant: Plant, changed: bool, now: datetime | None = None) -> None:
+        """
+        Learn from a polled plant and schedule its next poll.
+
+        :param plant: polled plant
+        :type plant: Plant
+        :param changed: whether the plant changed since the previous poll
+        :type changed: bool
+        :param now: current local time, defaults to now
+        :type now: datetime | None
+        """
+        now = now or datetime.now()
+        schedule = self._schedules.get(plant.id)
+        if schedule is None:
+            schedule = self._schedules[plant.id] = _PlantSchedule(plant)
+        previous = schedule.plant
+        if (
+            plant.last_update is not None
+            and previous.last_update is not None
+            and plant.last_update > previous.last_update
+        ):
+            interval = plant.last_update - previous.last_update
+            schedule.cadence = self._clamp(
+                interval
+                if schedule.cadence is None
+                else schedule.cadence * 0.7 + interval * 0.3
+            )
+            schedule.misses = 0
+        elif not changed or plant.last_update == previous.last_update:
+            schedule.misses += 1
+        if plant.last_update is not None:
+            offset = now - plant.last_update
+            if schedule.offset is None or offset < schedule.offset:
+                schedule.offset = offset
+        flat = changed is False or plant.today_energy == previous.today_energy
+        schedule.plant = plant
+        self._push(schedule, self._next_poll(schedule, flat, now))
+
+    def _next_poll(
+        self, schedule: _PlantSchedule, flat: bool, now: datetime
+    ) -> datetime:
+        """Predict when the plant data changes next."""
+        if flat and self._is_night(now):
+            return self._night_end_after(now) + self._random_jitter()
+        last_update = schedule.plant.last_update
+        if (
+            schedule.cadence is not None
+            and schedule.offset is not None
+            and last_update is not None
+        ):
+            predicted = last_update + schedule.offset + schedule.cadence + self._delay
+            if predicted > now and schedule.misses == 0:
+                return max(predicted, now + self._min_interval) + self._random_jitter()
+            return now + self._backoff(schedule) + self._random_jitter()
+        return now + self._default_interval + self._random_jitter()
+
+    def _backoff(self, schedule: _PlantSchedule) -> timedelta:
+        """Get the interval after a poll that found no new data."""
+        limit = schedule.cadence or self._default_interval
+        return self._clamp(
+            min(self._min_interval * 2 ** min(schedule.misses, 16), limit)
+        )
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        """Clamp an interval between the minimum and maximum intervals."""
+        return min(max(interval, self._min_interval), self._max_interval)
+
+    def _is_night(self, now: datetime) -> bool:
+        """Check if a local time is at night."""
+        current = now.time()
+        if self._night_start <= self._night_end:
+            return self._night_start <= current < self._night_end
+        return current >= self._night_start or current < self._night_end
+
+    def _night_end_after(self, now: datetime) -> datetime:
+        """Get the end of the night following a local time."""
+        end = datetime.combine(now.date(), self._night_end)
+        return end if end > now else end + timedelta(days=1)
+
+    def _random_jitter(self) -> timedelta:
+        """Get a random jitter."""
+        return self._jitter * random.random()
+
+    def _push(self, schedule: _PlantSchedule, due: datetime) -> None:
+        """Queue the next poll of a plant."""
+        schedule.due = due
+        heapq.heappush(self._queue, (due, next(self._counter), schedule.plant.id))
+
+    def __str__(self) -> str:
+        """Cast PollingScheduler to str."""
+        return str(self.__class__) + ": " + str(self.__dict__)
@@ -0,0 +1,177 @@
+"""Sunweg API columnar production statistics."""
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from .util import ProductionStats
+
+
+class ProductionSeries:
+    """Daily energy production statistics stored in contiguous arrays."""
+
+    def __init__(
+        self, dates: np.ndarray, production: np.ndarray, prognostic: np.ndarray
+    ) -> None:
+        """
+        Initialize ProductionSeries.
+
+        :param dates: statistics dates
+        :type dates: np.ndarray
+        :param production: statistics production in kWh
+        :type production: np.ndarray
+        :param prognostic: statistics expected production in kWh
+        :type prognostic: np.ndarray
+        """
+        self._dates = np.asarray(dates, dtype="datetime64[D]")
+        self._production = np.asarray(production, dtype=np.float64)
+        self._prognostic = np.asarray(prognostic, dtype=np.float64)
+        if not (len(self._dates) == len(self._production) == len(self._prognostic)):
+            raise ValueError("dates, production and prognostic lengths differ")
+
+    @classmethod
+    def from_stats(cls, stats: Iterable[ProductionStats]) -> "ProductionSeries":
+        """
+        Build a series from production statistics.
+
+        :param stats: daily energy production statistics
+        :type stats: Iterable[ProductionStats]
+        :return: production series
+        :rtype: ProductionSeries
+        """
+        stats = list(stats)
+        return cls(
+            np.fromiter((stat.date for stat in stats), "datetime64[D]", len(stats)),
+            np.fromiter((stat.production for stat in stats), np.float64, len(stats)),
+            np.fromiter((stat.prognostic for stat in stats), np.float64, len(stats)),
+        )
+
+    @classmethod
+    def concatenate(cls, series: Iterable["ProductionSeries"]) -> "ProductionSeries":
+        """
+        Concatenate series, usually one per month.
+
+        :param series: series to concatenate
+        :type series: Iterable[ProductionSeries]
+        :return: concatenated series
+        :rtype: ProductionSeries
+        """
+        series = list(series)
+        if len(series) == 0:
+            return cls(np.array([]), np.array([]), np.array([]))
+        return cls(
+            np.concatenate([item.dates for item in series]),
+            np.concatenate([item.production for item in series]),
+            np.concatenate([item.prognostic for item in series]),
+        )
+
+    @property
+    def dates(self) -> np.ndarray:
+        """
+        Get statistics dates.
+
+        :return: statistics dates
+        :rtype: np.ndarray
+        """
+        return self._dates
+
+    @property
+    def production(self) -> np.ndarray:
+        """
+        Get energy production in kWh.
+
+        :return: energy production in kWh
+        :rtype: np.ndarray
+        """
+        return self._production
+
+    @property
+    def prognostic(self) -> np.ndarray:
+        """
+        Get expected energy production in kWh.
+
+        :return: expected energy production in kWh
+        :rtype: np.ndarray
+        """
+        return self._prognostic
+
+    def __len__(self) -> int:
+        """Get number of days."""
+        return len(self._dates)
+
+    def total_production(self) -> float:
+        """
+        Get total energy production in kWh.
+
+        :return: total energy production in kWh
+        :rtype: float
+        """
+        return float(self._production.sum())
+
+    def total_prognostic(self) -> float:
+        """
+        Get total expected energy production in kWh.
+
+        :return: total expected energy production in kWh
+        :rtype: float
+        """
+        return float(self._prognostic.sum())
+
+    def ratio(self) -> np.ndarray:
+        """
+        Get daily production over expected production.
+
+        :return: daily ratio, NaN on days without expected production
+        :rtype: np.ndarray
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                self._prognostic != 0, self._production / self._prognostic, np.nan
+            )
+
+    def rolling_mean(self, window: int) -> np.ndarray:
+        """
+        Get the moving average of the production.
+
+        :param window: number of days averaged
+        :type window: int
+        :return: moving average, NaN until `window` days are available
+        :rtype: np.ndarray
+        """
+        if window < 1:
+            raise ValueError("window must be positive")
+        result = np.full(len(self._production), np.nan)
+        if len(self._production) >= window:
+            cumsum = np.cumsum(np.insert(self._production, 0, 0.0))
+            first = window - 1
+            result[first:] = (cumsum[window:] - cumsum[:-window]) / window
+        return result
+
+    def shortfall(self) -> np.ndarray:
+        """
+        Get the daily production missing to reach the expected production in kWh.
+
+        :return: daily shortfall in kWh, 0 when expected production was reached
+        :rtype: np.ndarray
+        """
+        return np.maximum(self._prognostic - self._production, 0.0)
+
+    def to_stats(self) -> list[ProductionStats]:
+        """
+        Convert the series to production statistics.
+
+        :return: list of daily energy production statistics
+        :rtype: list[ProductionStats]
+        """
+        return [
+            ProductionStats(day, production, prognostic)
+            for (day, production, prognostic) in zip(
+                self._dates.astype(object),
+                self._production.tolist(),
+                self._prognostic.tolist(),
+            )
+        ]
+
+    def __str__(self) -> str:
+        """Cast ProductionSeries to str."""
+        return str(self.__class__) + ": " + str(self.__dict__)
@@ -0,0 +1,166 @@
+"""Sunweg API persistent production statistics store."""
+
+from datetime import date, timedelta
+import sqlite3
+from threading import Lock
+import time
+
+from .util import ProductionStats
+
+_ALL_INVERTERS = -1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS month_stats (
+    plant_id INTEGER NOT NULL,
+    inverter_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    closed INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (plant_id, inverter_id, year, month)
+);
+CREATE TABLE IF NOT EXISTS day_stats (
+    plant_id INTEGER NOT NULL,
+    inverter_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    production REAL NOT NULL,
+    prognostic REAL NOT NULL,
+    PRIMARY KEY (plant_id, inverter_id, year, month, day)
+);
+"""
+
+
+def is_month_closed(year: int, month: int, today: date | None = None) -> bool:
+    """
+    Check if the statistics of a month can no longer change.
+
+    A month is closed from the third day of the next month, leaving a full day after
+    its end for the last readings of the month to arrive.
+
+    :param year: statistics year
+    :type year: int
+    :param month: statistics month
+    :type month: int
+    :param today: reference date, defaults to the current date
+    :type today: date | None
+    :return: True when the month is closed
+    :rtype: bool
+    """
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return (today or date.today()) > next_month + timedelta(days=1)
+
+
+class ProductionStatsStore:
+    """
+    SQLite store of daily production statistics.
+
+    Statistics are keyed by plant id, inverter id, year and month. Closed months are
+    served from the store without a request, while the current month is merged day
+    by day every time it is retrieved.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """
+        Initialize ProductionStatsStore.
+
+        :param path: SQLite database file, ":memory:" for a temporary store
+        :type path: str
+        """
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def get(
+        self,
+        plant_id: int,
+        inverter_id: int | None,
+        year: int,
+        month: int,
+        closed_only: bool = False,
+    ) -> list[ProductionStats] | None:
+        """
+        Get the stored statistics of a month.
+
+        :param plant_id: id of statistics plant
+        :type plant_id: int
+        :param inverter_id: id of statistics inverter, None for every inverter
+        :type inverter_id: int | None
+        :param year: statistics year
+        :type year: int
+        :param month: statistics month
+        :type month: int
+        :param closed_only: only return the statistics of a closed month
+        :type closed_only: bool
+        :return: list of daily energy production statistics, None if not stored
+        :rtype: list[ProductionStats] | None
+        """
+        key = (plant_id, _inverter_key(inverter_id), year, month)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT closed FROM month_stats WHERE plant_id = ? AND "
+                + "inverter_id = ? AND year = ? AND month = ?",
+                key,
+            ).fetchone()
+            if row is None or (closed_only and not row[0]):
+                return None
+            rows = self._connection.execute(
+                "SELECT day, production, prognostic FROM day_stats WHERE "
+                + "plant_id = ? AND inverter_id = ? AND year = ? AND month = ? "
+                + "ORDER BY day",
+                key,
+            ).fetchall()
+        return [
+            ProductionStats(date.fromisoformat(day), production, prognostic)
+            for (day, production, prognostic) in rows
+        ]
+
+    def save(
+        self,
+        plant_id: int,
+        inverter_id: int | None,
+        year: int,
+        month: int,
+        stats: list[ProductionStats],
+    ) -> None:
+        """
+        Merge the statistics of a month into the store.
+
+        Days already stored are replaced and missing days are added.
+
+        :param plant_id: id of statistics plant
+        :type plant_id: int
+        :param inverter_id: id of statistics inverter, None for every inverter
+        :type inverter_id: int | None
+        :param year: statistics year
+        :type year: int
+        :param month: statistics month
+        :type month: int
+        :param stats: list of daily energy production statistics
+        :type stats: list[ProductionStats]
+        """
+        key = (plant_id, _inverter_key(inverter_id), year, month)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO day_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    key + (stat.date.isoformat(), stat.production, stat.prognostic)
+                    for stat in stats
+                ],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO month_stats VALUES (?, ?, ?, ?, ?, ?)",
+                key + (int(is_month_closed(year, month)), time.time()),
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+
+def _inverter_key(inverter_id: int | None) -> int:
+    """Get the stored inverter id."""
+    return _ALL_INVERTERS if inverter_id is None else inverter_id
@@ -0,0 +1,77 @@
+"""Sunweg API HTTP transport configuration."""
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+
+class TransportConfig:
+    """Connection pool, keep-alive and timeout settings of the HTTP transport."""
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        connect_timeout: float | None = 10,
+        read_timeout: float | None = 30,
+        keep_alive: bool = True,
+        adapter: HTTPAdapter | None = None,
+    ) -> None:
+        """
+        Initialize TransportConfig.
+
+        :param pool_connections: number of hosts with a connection pool
+        :type pool_connections: int
+        :param pool_maxsize: maximum connections kept open per host
+        :type pool_maxsize: int
+        :param pool_block: wait for a free connection instead of opening a new one
+        :type pool_block: bool
+        :param connect_timeout: seconds to wait for the connection, None to wait forever
+        :type connect_timeout: float | None
+        :param read_timeout: seconds to wait for the response, None to wait forever
+        :type read_timeout: float | None
+        :param keep_alive: reuse connections between requests
+        :type keep_alive: bool
+        :param adapter: adapter mounted instead of one built from the pool settings
+        :type adapter: HTTPAdapter | None
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.adapter = adapter
+
+    @property
+    def timeout(self) -> tuple[float | None, float | None]:
+        """
+        Get requests timeout.
+
+        :return: connect and read timeouts
+        :rtype: tuple[float | None, float | None]
+        """
+        return (self.connect_timeout, self.read_timeout)
+
+    def build_session(self) -> Session:
+        """
+        Build a requests session with this configuration.
+
+        :return: requests session
+        :rtype: Session
+        """
+        session = Session()
+        adapter = self.adapter or HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def __str__(self) -> str:
+        """Cast TransportConfig to str."""
+        return str(self.__class__) + ": " + str(self.__dict__)
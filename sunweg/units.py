@@ -0,0 +1,144 @@
+"""Sunweg API energy and power units."""
+
+from array import array
+from collections.abc import Iterable
+from enum import Enum
+import logging
+import math
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EnergyUnit(Enum):
+    """Energy unit of a metric returned by the API."""
+
+    WH = "Wh"
+    KWH = "kWh"
+    MWH = "MWh"
+    GWH = "GWh"
+
+    @property
+    def factor(self) -> float:
+        """
+        Get how many Wh one of this unit is.
+
+        :return: Wh per unit
+        :rtype: float
+        """
+        return _FACTORS[self]
+
+
+class PowerUnit(Enum):
+    """Power unit of a metric returned by the API."""
+
+    W = "W"
+    KW = "kW"
+    MW = "MW"
+    GW = "GW"
+
+    @property
+    def factor(self) -> float:
+        """
+        Get how many W one of this unit is.
+
+        :return: W per unit
+        :rtype: float
+        """
+        return _FACTORS[self]
+
+
+Unit = EnergyUnit | PowerUnit
+"""Energy or power unit"""
+
+_FACTORS: dict[Unit, float] = {
+    EnergyUnit.WH: 1.0,
+    EnergyUnit.KWH: 1e3,
+    EnergyUnit.MWH: 1e6,
+    EnergyUnit.GWH: 1e9,
+    PowerUnit.W: 1.0,
+    PowerUnit.KW: 1e3,
+    PowerUnit.MW: 1e6,
+    PowerUnit.GW: 1e9,
+}
+
+_ENERGY_UNITS = {unit.value.casefold(): unit for unit in EnergyUnit}
+_POWER_UNITS = {unit.value.casefold(): unit for unit in PowerUnit}
+
+
+def energy_unit(metric: str, default: EnergyUnit = EnergyUnit.KWH) -> EnergyUnit | None:
+    """
+    Parse an energy metric.
+
+    An unknown metric is logged and parsed as None, so one odd reading does not
+    break the models or fleet totals built from it.
+
+    :param metric: energy metric, like ``kWh``, in any case
+    :type metric: str
+    :param default: unit of an empty metric, kWh like the API default
+    :type default: EnergyUnit
+    :return: energy unit, None when the metric is not an energy unit
+    :rtype: EnergyUnit | None
+    """
+    if not metric:
+        return default
+    unit = _ENERGY_UNITS.get(metric.strip().casefold())
+    if unit is None:
+        _LOGGER.warning("Unknown energy metric: %r", metric)
+    return unit
+
+
+def power_unit(metric: str, default: PowerUnit = PowerUnit.KW) -> PowerUnit | None:
+    """
+    Parse a power metric.
+
+    An unknown metric is logged and parsed as None, like in `energy_unit`.
+
+    :param metric: power metric, like ``kW``, in any case
+    :type metric: str
+    :param default: unit of an empty metric, kW like the API default
+    :type default: PowerUnit
+    :return: power unit, None when the metric is not a power unit
+    :rtype: PowerUnit | None
+    """
+    if not metric:
+        return default
+    unit = _POWER_UNITS.get(metric.strip().casefold())
+    if unit is None:
+        _LOGGER.warning("Unknown power metric: %r", metric)
+    return unit
+
+
+def canonical_values(values: Iterable[float], units: Iterable[Unit]) -> array:
+    """
+    Convert values to Wh or W.
+
+    :param values: values
+    :type values: Iterable[float]
+    :param units: unit of each value
+    :type units: Iterable[Unit]
+    :return: values in Wh or W
+    :rtype: array
+    """
+    return array("d", map(_canonical, values, units))
+
+
+def canonical_sum(values: Iterable[float], units: Iterable[Unit]) -> float:
+    """
+    Sum values of mixed units in Wh or W.
+
+    The sum is exact up to the final rounding, so totals do not depend on the order
+    of the values.
+
+    :param values: values
+    :type values: Iterable[float]
+    :param units: unit of each value
+    :type units: Iterable[Unit]
+    :return: sum in Wh or W
+    :rtype: float
+    """
+    return math.fsum(map(_canonical, values, units))
+
+
+def _canonical(value: float, unit: Unit) -> float:
+    """Convert a value to Wh or W."""
+    return value * _FACTORS[unit]
@@ -1,7 +1,27 @@
 """Sunweg API util."""
 
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
+from typing import Any
+
+from dateutil import parser
+
+
+def slots_dict(obj: object) -> dict[str, Any]:
+    """
+    Get the attributes of an object with `__slots__`, like its `__dict__` would.
+
+    :param obj: object with `__slots__`
+    :type obj: object
+    :return: attribute values by name
+    :rtype: dict[str, Any]
+    """
+    return {
+        name: getattr(obj, name)
+        for cls in reversed(type(obj).__mro__)
+        for name in cls.__dict__.get("__slots__", ())
+        if hasattr(obj, name)
+    }
 
 
 class Status(Enum):
@@ -12,9 +32,21 @@ class Status(Enum):
     ERROR = 1
 
 
+class PlantStatus(Enum):
+    """Plant status bucket of the plant list."""
+
+    NOT_COMMISSIONED = "nao_comissionadas"
+    CONNECTED = "conectadas"
+    FAILURE = "falhas"
+    ALERT = "alertas"
+    SERVICE = "atendimento"
+
+
 class ProductionStats:
     """Energy production statistics"""
 
+    __slots__ = ("_date", "_production", "_prognostic")
+
     def __init__(self, date: date, production: float, prognostic: float) -> None:
         """
         Initialize energy production statistics.
@@ -46,4 +78,147 @@ class ProductionStats:
 
     def __str__(self) -> str:
         """Cast Phase to str."""
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return str(self.__class__) + ": " + str(slots_dict(self))
+
+
+def months_between(start: date, end: date) -> list[tuple[int, int]]:
+    """
+    List the months that overlap a date range.
+
+    :param start: first date of the range
+    :type start: date
+    :param end: last date of the range
+    :type end: date
+    :return: list of (year, month) from `start` to `end`
+    :rtype: list[tuple[int, int]]
+    """
+    months: list[tuple[int, int]] = []
+    (year, month) = (start.year, start.month)
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        (year, month) = (year + month // 12, month % 12 + 1)
+    return months
+
+
+def convert_situation_status(situation: int) -> Status:
+    """
+    Convert situation to status.
+
+    :param situation: situation
+    :type situation: int
+    :return: equivalent status
+    :rtype: Status
+    """
+    if situation == 0:
+        return Status.ERROR
+    if situation == 1:
+        return Status.OK
+    return Status.WARN
+
+
+def separate_value_metric(
+    value_with_metric: str | None, default_metric: str = "", metric_before: bool = False
+) -> tuple[float, str]:
+    """
+    Separate the value from the metric.
+
+    :param value_with_metric: value with metric separated by space
+    :type value_with_metric: str | None
+    :param default_metric: metric that should be returned if `value_with_metric` is None
+    :type default_metric: str
+    :param metric_before: true when metric appears before the value
+    :type metric_before: bool
+    :return: tuple with value and metric
+    :rtype: tuple[float, str]
+    """
+    if not value_with_metric:
+        return (0.0, default_metric)
+    split = value_with_metric.split(" ")
+    if len(split) == 2:
+        (first, second) = split
+        if metric_before:
+            return (float(second.replace(",", ".")), first)
+        return (float(first.replace(",", ".")), second)
+    return _separate_value_metric_split(split, default_metric, metric_before)
+
+
+def _separate_value_metric_split(
+    split: list[str], default_metric: str, metric_before: bool
+) -> tuple[float, str]:
+    """Separate the value from the metric of an unusual number of parts."""
+    if metric_before:
+        return (
+            float(split[0].replace(",", "."))
+            if len(split) < 2
+            else float(split[1].replace(",", ".")),
+            default_metric if len(split) < 2 else split[0],
+        )
+    return (
+        float(split[0].replace(",", ".")),
+        default_metric if len(split) < 2 else split[1],
+    )
+
+
+_MONTHS = {
+    name: number
+    for (number, name) in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), start=1
+    )
+}
+
+
+def parse_date(value: str) -> date:
+    """
+    Parse the date of a timestamp returned by the API.
+
+    ISO dates (``2024-05-29``) and RFC 1123 timestamps
+    (``Fri, 03 May 2024 00:00:00 GMT``) are parsed directly, anything else is
+    left to dateutil.
+
+    :param value: date or timestamp
+    :type value: str
+    :return: parsed date
+    :rtype: date
+    """
+    if value.isascii():
+        if len(value) == 10 and value[4] == "-" and value[7] == "-":
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                pass
+        elif len(value) == 29 and value[3:5] == ", " and value.endswith(" GMT"):
+            (day, month, year) = (value[5:7], _MONTHS.get(value[8:11]), value[12:16])
+            if month is not None and day.isdigit() and year.isdigit():
+                try:
+                    return date(int(year), month, int(day))
+                except ValueError:
+                    pass
+    return parser.parse(value).date()
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    Parse a date and time returned by the API.
+
+    The ``2023-02-25 08:04:22`` format is parsed directly, anything else is left
+    to dateutil.
+
+    :param value: date and time
+    :type value: str
+    :return: parsed date and time
+    :rtype: datetime
+    """
+    if (
+        len(value) == 19
+        and value.isascii()
+        and value[4] == "-"
+        and value[7] == "-"
+        and value[10] == " "
+        and value[13] == ":"
+        and value[16] == ":"
+    ):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return parser.parse(value)
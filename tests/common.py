@@ -1,9 +1,25 @@
 """Test sunweg common."""
 from datetime import datetime
+import json
+from os import path
 from sunweg.device import Inverter, MPPT, Phase, String
 from sunweg.plant import Plant
 from sunweg.util import Status
 
+RESPONSES = path.join(path.dirname(__file__), "responses")
+"""Directory of the recorded API responses"""
+
+
+def read_response(file: str) -> bytes:
+    """Read the raw body of a recorded response."""
+    with open(path.join(RESPONSES, file), "rb") as f:
+        return f.read()
+
+
+def load_response(file: str) -> dict:
+    """Load a recorded JSON response."""
+    return json.loads(read_response(file))
+
 
 PLANT_MOCK = Plant(
     id=1,
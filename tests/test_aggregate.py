@@ -0,0 +1,148 @@
+"""Test sunweg.aggregate."""
+
+from unittest import TestCase
+
+import pytest
+
+from sunweg.aggregate import FleetAggregator, PlantRollup
+from sunweg.api import inverter_from_response, plant_from_response
+from sunweg.device import MPPT, Inverter, String
+from sunweg.plant import Plant
+from sunweg.util import Status
+
+from .common import load_response as load
+
+
+def completed_plant(id: int, today_energy: float = 1.0) -> Plant:
+    """Build a plant with a completed inverter."""
+    plant = plant_from_response(id, load("plant_success_response.json"))
+    plant._today_energy = today_energy
+    plant.inverters[:] = [
+        inverter_from_response(21255, load("inverter_success_response.json"))
+    ]
+    return plant
+
+
+class Aggregate_Test(TestCase):
+    """Aggregate test case."""
+
+    def test_plant_rollup(self) -> None:
+        """Test the rollup of a plant with a completed inverter."""
+        rollup = PlantRollup(completed_plant(16925, 1.5))
+        assert rollup.plant_id == 16925
+        assert rollup.power_w == pytest.approx(25230.0)
+        assert rollup.today_energy_wh == 1500.0
+        assert rollup.total_energy_wh == pytest.approx(23200.0)
+        assert rollup.status_counts == {Status.OK: 1}
+        assert sorted(rollup.worst_strings) == [
+            (16925, 21255, "MPPT 01"),
+            (16925, 21255, "MPPT 02"),
+        ]
+        assert rollup.worst_strings[(16925, 21255, "MPPT 01")].name == "ST 02"
+        assert str(rollup).startswith("<class 'sunweg.aggregate.PlantRollup'>")
+
+    def test_worst_string(self) -> None:
+        """Test the worst string has the most severe status, then lowest power."""
+        inverter = Inverter(1, "Inverter", "SN", Status.WARN, 40.0)
+        mppt = MPPT("MPPT1")
+        mppt.strings.extend(
+            [
+                String("STR1", 400.0, 2.0, Status.OK),
+                String("STR2", 400.0, 5.0, Status.WARN),
+                String("STR3", 400.0, 3.0, Status.WARN),
+            ]
+        )
+        inverter.mppts.append(mppt)
+        plant = plant_from_response(1, load("plant_success_response.json"))
+        plant.inverters[:] = [inverter]
+        worst = PlantRollup(plant).worst_strings[(1, 1, "MPPT1")]
+        assert worst.name == "STR3"
+        assert worst.status == Status.WARN
+
+        readings = inverter_from_response(
+            2, load("inverter_success_response.json")
+        ).readings
+        readings.add_string(1, "ST 05", 418.0, 6.0, Status.ERROR)
+        inverter = Inverter(2, "Inverter", "SN", Status.ERROR, 40.0)
+        inverter.readings = readings
+        plant.inverters[:] = [inverter]
+        worst = PlantRollup(plant).worst_strings[(1, 2, "MPPT 02")]
+        assert worst.name == "ST 05"
+        assert worst.status == Status.ERROR
+
+    def test_fleet(self) -> None:
+        """Test fleet totals and counts over several plants."""
+        plants = [
+            plant_from_response(16925, load("plant_success_response.json")),
+            plant_from_response(16926, load("plant_success_alt_response.json")),
+            completed_plant(16927, 2.0),
+        ]
+        fleet = FleetAggregator(plants)
+        assert len(fleet) == 3
+        assert fleet.power_w == pytest.approx(
+            sum(plant.total_power * 1000 for plant in plants)
+        )
+        assert fleet.today_energy_wh == pytest.approx(
+            sum(plant.today_energy_wh for plant in plants)
+        )
+        assert fleet.total_energy_wh == pytest.approx(
+            sum(plant.total_energy_wh for plant in plants)
+        )
+        statuses = [inverter.status for plant in plants for inverter in plant.inverters]
+        assert fleet.status_counts == {
+            status: statuses.count(status) for status in Status
+        }
+        assert len(fleet.worst_strings) == 2
+        assert fleet.rollup(16927) is not None
+        assert fleet.rollup(1) is None
+
+    def test_fleet_update(self) -> None:
+        """Test refreshing and removing a plant replaces its contribution."""
+        fleet = FleetAggregator([completed_plant(1, 1.0), completed_plant(2, 2.0)])
+        assert fleet.today_energy_wh == 3000.0
+        assert fleet.status_counts[Status.OK] == 2
+
+        refreshed = completed_plant(2, 5.0)
+        inverter = Inverter(21255, "Inverter", "SN", Status.ERROR, 40.0)
+        inverter.readings = refreshed.inverters[0].readings
+        refreshed.inverters[:] = [inverter]
+        fleet.update(refreshed)
+        assert len(fleet) == 2
+        assert fleet.today_energy_wh == 6000.0
+        assert fleet.status_counts == {Status.OK: 1, Status.WARN: 0, Status.ERROR: 1}
+        assert len(fleet.worst_strings) == 4
+
+        fleet.remove(1)
+        assert len(fleet) == 1
+        assert fleet.today_energy_wh == 5000.0
+        assert fleet.status_counts == {Status.OK: 0, Status.WARN: 0, Status.ERROR: 1}
+        assert sorted(fleet.worst_strings) == [
+            (2, 21255, "MPPT 01"),
+            (2, 21255, "MPPT 02"),
+        ]
+        with pytest.raises(KeyError):
+            fleet.remove(1)
+
+        fleet.remove(2)
+        assert fleet.power_w == 0.0
+        assert fleet.worst_strings == {}
+
+    def test_fleet_power_units(self) -> None:
+        """Test plant power is converted from the unit the API reported."""
+        result = load("plant_success_response.json")
+        plants = [
+            plant_from_response(id, dict(result, AcumuladoPotencia=power), lazy=lazy)
+            for (id, power, lazy) in [
+                (1, "800 W", False),
+                (2, "1,5 MW", True),
+                (3, "25,23 kW", False),
+            ]
+        ]
+        fleet = FleetAggregator(plants)
+        assert fleet.power_w == pytest.approx(800.0 + 1.5e6 + 25230.0)
+
+        with self.assertLogs("sunweg.units", "WARNING"):
+            unknown = plant_from_response(4, dict(result, AcumuladoPotencia="3 hp"))
+        assert fleet.update(unknown).power_w is None
+        assert fleet.power_w == pytest.approx(800.0 + 1.5e6 + 25230.0)
+        assert len(fleet) == 4
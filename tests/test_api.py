@@ -1,22 +1,34 @@
 """Test sunweg.api."""
 
 from datetime import date, datetime
+import json
 from os import path
 import os
+import time
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 import pytest
 
-from requests import Response
+from requests import ConnectionError, Response, Session
 
 from sunweg.api import (
     APIHelper,
+    CircuitOpenError,
+    LoginError,
     convert_situation_status,
     SunWegApiError,
     separate_value_metric,
 )
+from sunweg.auth import TokenManager
+from sunweg.cache import ResponseCache
+from sunweg.circuit import CircuitBreaker, CircuitState
 from sunweg.device import Inverter, String
-from sunweg.util import Status
+from sunweg.lazy import LazyPlant
+from sunweg.ratelimit import RateLimiter
+from sunweg.retry import RetryBudget, RetryPolicy
+from sunweg.store import ProductionStatsStore
+from sunweg.transport import TransportConfig
+from sunweg.util import PlantStatus, Status
 
 from .common import INVERTER_MOCK, PLANT_MOCK
 
@@ -117,6 +129,68 @@ class Api_Test(TestCase):
             api = APIHelper("user@acme.com", "password")
             assert api.authenticate()
 
+    def test_expiring_token_refreshed(self) -> None:
+        """Test an expiring token is refreshed before the request."""
+        with patch(
+            "requests.Session.post",
+            return_value=self.responses["auth_success_response.json"],
+        ) as post, patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ):
+            expired = self.responses["auth_success_response.json"].json()["token"]
+            api = APIHelper("user@acme.com", "password", token=expired)
+            assert api.token_manager.is_expiring()
+            assert api.plant(16925) is not None
+            assert post.call_count == 1
+
+    def test_shared_token_manager(self) -> None:
+        """Test helpers sharing a token manager share the refreshed token."""
+        with patch(
+            "requests.Session.post",
+            return_value=self.responses["auth_success_response.json"],
+        ) as post, patch(
+            "requests.Session.get",
+            return_value=self.responses["error_401_response.txt"],
+        ):
+            manager = TokenManager("old")
+            api = APIHelper("user@acme.com", "password", token_manager=manager)
+            other = APIHelper("user@acme.com", "password", token_manager=manager)
+            assert api.plant(16925) is None
+            assert post.call_count == 1
+            assert other._token == api._token != "old"
+
+    def test_token_store(self) -> None:
+        """Test the token is loaded from and saved to the token store."""
+        store = MagicMock()
+        store.load.return_value = "stored"
+        api = APIHelper("user@acme.com", "password", token_store=store)
+        assert api._token == "stored"
+        store.load.assert_called_once_with("user@acme.com")
+        with patch(
+            "requests.Session.post",
+            return_value=self.responses["auth_success_response.json"],
+        ):
+            assert api.authenticate()
+        store.save.assert_called_once_with("user@acme.com", api._token)
+        api = APIHelper("user@acme.com", "password", "token", token_store=store)
+        assert api._token == "token"
+
+    def test_token_store_errors(self) -> None:
+        """Test a token store that cannot be read or written is skipped."""
+        store = MagicMock()
+        store.load.side_effect = PermissionError("read-only")
+        store.save.side_effect = PermissionError("read-only")
+        with self.assertLogs("sunweg.auth", "WARNING"):
+            api = APIHelper("user@acme.com", "password", token_store=store)
+        assert api._token is None
+        with patch(
+            "requests.Session.post",
+            return_value=self.responses["auth_success_response.json"],
+        ), self.assertLogs("sunweg.auth", "WARNING"):
+            assert api.authenticate()
+        assert api._token is not None
+
     def test_authenticate_fail_empty_credentials(self) -> None:
         """Test authentication failed."""
         api = APIHelper(None, None)
@@ -158,6 +232,177 @@ class Api_Test(TestCase):
             api = APIHelper("user@acme.com", "password")
             assert len(api.listPlants()) == 2
 
+    def test_list_plants_concurrent_order(self) -> None:
+        """Test list plants fetched concurrently keeps the server order."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["list_plant_success_2_response.json"],
+        ), patch(
+            "sunweg.api.APIHelper.plant", side_effect=lambda id: MagicMock(id=id)
+        ):
+            api = APIHelper("user@acme.com", "password")
+            plants = api.listPlants(max_workers=4)
+            assert [plant.id for plant in plants] == [16925, 16926]
+
+    def test_list_plants_failures(self) -> None:
+        """Test list plants collecting the plants that failed."""
+
+        def plant(id: int) -> MagicMock:
+            if id == 16925:
+                raise SunWegApiError("Request failed: <Response [500]>")
+            return MagicMock(id=id)
+
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["list_plant_success_2_response.json"],
+        ), patch("sunweg.api.APIHelper.plant", side_effect=plant):
+            api = APIHelper("user@acme.com", "password")
+            failures: dict[int, Exception] = {}
+            plants = api.listPlants(max_workers=2, failures=failures)
+            assert [plant.id for plant in plants] == [16926]
+            assert list(failures.keys()) == [16925]
+            assert isinstance(failures[16925], SunWegApiError)
+
+    def _list_page_response(self, url: str, pages: list[list[int]], **kwargs):
+        """Build a plant list response for the page requested in `url`."""
+        page = int(url.split("paginaAtual=")[1])
+        ids = pages[page - 1] if page <= len(pages) else []
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            {
+                "success": True,
+                "conectadas": [{"id": id} for id in ids],
+                "nao_comissionadas": [],
+                "falhas": [],
+                "alertas": [],
+                "atendimento": [],
+            }
+        ).encode()
+        return response
+
+    def test_iter_plant_ids_pages(self) -> None:
+        """Test iterating plant ids over every page."""
+        pages = [[1, 2], [3, 4], [5]]
+        with patch(
+            "requests.Session.get",
+            side_effect=lambda url, **kwargs: self._list_page_response(url, pages),
+        ) as get:
+            api = APIHelper("user@acme.com", "password")
+            assert list(api.iter_plant_ids(page_size=2, prefetch=0)) == [1, 2, 3, 4, 5]
+            assert get.call_count == 3
+            assert "limite=2&" in get.call_args_list[0].args[0]
+            assert list(api.iter_plant_ids(page_size=2, prefetch=2)) == [1, 2, 3, 4, 5]
+
+    def test_iter_plant_ids_login_error(self) -> None:
+        """Test an authentication failure after the first page is raised."""
+        pages = [[1, 2], [3, 4]]
+        unauthorized = Response()
+        unauthorized.status_code = 401
+        unauthorized._content = b""
+
+        def get(url: str, **kwargs) -> Response:
+            if "paginaAtual=1" in url:
+                return self._list_page_response(url, pages)
+            return unauthorized
+
+        with patch(
+            "requests.Session.post",
+            return_value=self.responses["auth_fail_response.json"],
+        ), patch("requests.Session.get", side_effect=get):
+            api = APIHelper("user@acme.com", "password")
+            with pytest.raises(LoginError):
+                list(api.iter_plant_ids(page_size=2, prefetch=0))
+        with patch(
+            "requests.Session.post",
+            return_value=self.responses["auth_fail_response.json"],
+        ), patch("requests.Session.get", return_value=unauthorized):
+            assert api.listPlants() == []
+
+    def test_iter_plant_ids_repeated_page(self) -> None:
+        """Test iterating plant ids stops when the server ignores the page."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["list_plant_success_2_response.json"],
+        ) as get:
+            api = APIHelper("user@acme.com", "password")
+            assert list(api.iter_plant_ids(page_size=2, prefetch=0)) == [16925, 16926]
+            assert get.call_count == 2
+
+    def test_list_plant_summaries(self) -> None:
+        """Test listing plant summaries with their status bucket."""
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            {
+                "success": True,
+                "conectadas": [{"id": 1}],
+                "nao_comissionadas": [{"id": 2}],
+                "falhas": [{"id": 3}],
+                "alertas": [{"id": 4}],
+                "atendimento": [{"id": 5}],
+            }
+        ).encode()
+        with patch("requests.Session.get", return_value=response) as get:
+            api = APIHelper("user@acme.com", "password")
+            summaries = api.list_plant_summaries()
+            assert get.call_count == 1
+            assert {summary.id: summary.status for summary in summaries} == {
+                1: PlantStatus.CONNECTED,
+                2: PlantStatus.NOT_COMMISSIONED,
+                3: PlantStatus.FAILURE,
+                4: PlantStatus.ALERT,
+                5: PlantStatus.SERVICE,
+            }
+            assert summaries[0].__str__().startswith(
+                "<class 'sunweg.plant.PlantSummary'>"
+            )
+
+    def test_iter_plants(self) -> None:
+        """Test iterating plants over every page."""
+        pages = [[1, 2], [3]]
+        with patch(
+            "requests.Session.get",
+            side_effect=lambda url, **kwargs: self._list_page_response(url, pages),
+        ), patch(
+            "sunweg.api.APIHelper.plant", side_effect=lambda id: MagicMock(id=id)
+        ):
+            api = APIHelper("user@acme.com", "password")
+            plants = api.iter_plants(page_size=2)
+            assert [plant.id for plant in plants] == [1, 2, 3]
+
+    def test_iter_plants_completion_order(self) -> None:
+        """Test plants are yielded completed, as soon as they are ready."""
+        pages = [[1, 2, 3, 4, 5]]
+
+        def plant(id: int) -> MagicMock:
+            if id == 1:
+                time.sleep(0.1)
+            if id == 3:
+                raise SunWegApiError("Request failed")
+            return MagicMock(id=id)
+
+        with patch(
+            "requests.Session.get",
+            side_effect=lambda url, **kwargs: self._list_page_response(url, pages),
+        ), patch("sunweg.api.APIHelper.plant", side_effect=plant), patch(
+            "sunweg.api.APIHelper.complete_plant", return_value={}
+        ) as complete_plant:
+            api = APIHelper("user@acme.com", "password")
+            failures: dict[int, Exception] = {}
+            plants = list(
+                api.iter_plants(
+                    page_size=10,
+                    failures=failures,
+                    complete_inverters=True,
+                    max_workers=4,
+                )
+            )
+            assert sorted(plant.id for plant in plants) == [1, 2, 4, 5]
+            assert plants[-1].id == 1
+            assert list(failures.keys()) == [3]
+            assert complete_plant.call_count == 4
+
     def test_list_plants_401(self) -> None:
         """Test list plants with expired token."""
         with patch(
@@ -302,6 +547,22 @@ class Api_Test(TestCase):
                 assert phase.status_voltage == Status.ERROR
                 assert phase.__str__().startswith("<class 'sunweg.device.Phase'>")
 
+    def test_plant_cached(self) -> None:
+        """Test plant detail answered from the response cache."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ) as get:
+            cache = ResponseCache()
+            api = APIHelper("user@acme.com", "password", cache=cache)
+            assert api.plant(16925) is not None
+            plant = api.plant(16925)
+            assert plant is not None
+            assert plant.name == "Plant Name"
+            assert get.call_count == 1
+            assert cache.hits == 1
+            assert cache.misses == 1
+
     def test_inverter_401(self) -> None:
         """Test inverter with expired token."""
         with patch(
@@ -362,6 +623,41 @@ class Api_Test(TestCase):
                 assert phase.status_voltage == Status.ERROR
                 assert phase.__str__().startswith("<class 'sunweg.device.Phase'>")
 
+    def test_complete_inverter_readings(self) -> None:
+        """Test readings are stored in arrays and objects built on demand."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["inverter_success_response.json"],
+        ):
+            api = APIHelper("user@acme.com", "password")
+            inverter = Inverter(
+                id=12345,
+                name="Inverter",
+                sn="1234ABCD",
+                status=Status.OK,
+                temperature=70,
+            )
+            api.complete_inverter(inverter)
+            readings = inverter.readings
+            assert readings is not None
+            assert inverter._mppts is None
+            assert len(readings.string_voltage) == 4
+            assert len(readings.phase_voltage) == 3
+            assert list(readings.string_status) == [Status.OK.value] * 4
+            assert list(readings.phase_status_voltage) == [Status.ERROR.value] * 3
+            strings = [string for mppt in inverter.mppts for string in mppt.strings]
+            assert [string.voltage for string in strings] == list(
+                readings.string_voltage
+            )
+            assert [len(mppt.strings) for mppt in inverter.mppts] == [
+                list(readings.string_mppt).count(index)
+                for index in range(len(readings.mppt_names))
+            ]
+            assert inverter.mppts is inverter.mppts
+            api.complete_inverter(inverter)
+            assert len(inverter.phases) == 3
+            assert sum(len(mppt.strings) for mppt in inverter.mppts) == 4
+
     def test_complete_inverter_401(self) -> None:
         """Test complete inverter with expired token."""
         with patch(
@@ -382,6 +678,50 @@ class Api_Test(TestCase):
             api.complete_inverter(inverter)
             assert not inverter.is_complete
 
+    def test_complete_plants_deduplicate(self) -> None:
+        """Test complete plants requesting each inverter once."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["inverter_success_response.json"],
+        ) as get:
+            api = APIHelper("user@acme.com", "password")
+            plant = MagicMock()
+            plant.inverters = [
+                Inverter(id=1, name="A", sn="A", status=Status.OK, temperature=70),
+                Inverter(id=2, name="B", sn="B", status=Status.OK, temperature=70),
+            ]
+            other = MagicMock()
+            other.inverters = [
+                Inverter(id=2, name="B", sn="B", status=Status.OK, temperature=70)
+            ]
+            failures = api.complete_plants([plant, other], max_workers=4)
+            assert failures == {}
+            assert get.call_count == 2
+            for inverter in plant.inverters + other.inverters:
+                assert inverter.is_complete
+                assert len(inverter.phases) == 3
+
+    def test_complete_plant_failures(self) -> None:
+        """Test complete plant reporting the inverters that failed."""
+        with patch(
+            "requests.Session.get",
+            side_effect=[
+                self.responses["inverter_success_response.json"],
+                self.responses["error_500_response.txt"],
+            ],
+        ):
+            api = APIHelper("user@acme.com", "password")
+            plant = MagicMock()
+            plant.inverters = [
+                Inverter(id=1, name="A", sn="A", status=Status.OK, temperature=70),
+                Inverter(id=2, name="B", sn="B", status=Status.OK, temperature=70),
+            ]
+            failures = api.complete_plant(plant, max_workers=1)
+            assert list(failures.keys()) == [2]
+            assert isinstance(failures[2], SunWegApiError)
+            assert plant.inverters[0].is_complete
+            assert not plant.inverters[1].is_complete
+
     def test_setters(self) -> None:
         """Test API setters."""
         api = APIHelper("user@acme.com", "password")
@@ -441,3 +781,335 @@ class Api_Test(TestCase):
                     "<class 'sunweg.util.ProductionStats'>"
                 )
                 i += 1
+
+    def test_month_stats_store(self) -> None:
+        """Test closed month stats served from the store."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["month_stats_success_response.json"],
+        ) as get:
+            store = ProductionStatsStore()
+            api = APIHelper("user@acme.com", "password", stats_store=store)
+            stats = api.month_stats_production_by_id(2024, 5, 1)
+            stored = api.month_stats_production_by_id(2024, 5, 1)
+            assert get.call_count == 1
+            assert [stat.production for stat in stored] == [
+                stat.production for stat in stats
+            ]
+            api.month_stats_production_by_id(2024, 5, 1, 2)
+            assert get.call_count == 2
+
+    def test_production_stats_range(self) -> None:
+        """Test month stats of a date range trimmed and ordered."""
+        empty = Response()
+        empty.status_code = 200
+        empty._content = b'{"success": true, "graficomes": []}'
+
+        def get_month(url: str, **kwargs):
+            if url.endswith("date=05/2024"):
+                return self.responses["month_stats_success_response.json"]
+            return empty
+
+        with patch("requests.Session.get", side_effect=get_month) as get:
+            api = APIHelper("user@acme.com", "password")
+            stats = api.production_stats_range(
+                1, date(2024, 4, 20), date(2024, 5, 10), max_workers=2
+            )
+            assert get.call_count == 2
+            urls = sorted(call.args[0] for call in get.call_args_list)
+            assert urls[0].endswith("date=04/2024")
+            assert urls[1].endswith("date=05/2024")
+            assert [stat.date for stat in stats] == [
+                date(2024, 5, day) for day in range(1, 11)
+            ]
+
+    def test_transport_timeout(self) -> None:
+        """Test requests are sent with the transport timeouts."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ) as get:
+            api = APIHelper(
+                "user@acme.com",
+                "password",
+                transport=TransportConfig(connect_timeout=2, read_timeout=5),
+            )
+            api.plant(16925)
+            assert get.call_args.kwargs["timeout"] == (2, 5)
+
+    def test_shared_session(self) -> None:
+        """Test a shared session is used as is."""
+        shared = Session()
+        api1 = APIHelper("user@acme.com", "password", session=shared)
+        api2 = APIHelper("other@acme.com", "password", session=shared)
+        assert api1.session is shared
+        assert api2.session is shared
+
+    def test_retry_transient_status(self) -> None:
+        """Test a 503 response is retried after Retry-After."""
+        unavailable = Response()
+        unavailable.status_code = 503
+        unavailable.headers["Retry-After"] = "3"
+        with patch(
+            "requests.Session.get",
+            side_effect=[unavailable, self.responses["plant_success_response.json"]],
+        ) as get, patch("sunweg.api.time.sleep") as sleep:
+            api = APIHelper("user@acme.com", "password")
+            plant = api.plant(16925)
+            assert plant is not None
+            assert get.call_count == 2
+            sleep.assert_called_once_with(3.0)
+
+    def test_retry_connection_error(self) -> None:
+        """Test connection errors are retried until the attempts run out."""
+        with patch(
+            "requests.Session.get", side_effect=ConnectionError("reset")
+        ) as get, patch("sunweg.api.time.sleep") as sleep:
+            api = APIHelper(
+                "user@acme.com", "password", retry_policy=RetryPolicy(max_attempts=4)
+            )
+            with pytest.raises(ConnectionError):
+                api.plant(16925)
+            assert get.call_count == 4
+            assert sleep.call_count == 3
+
+    def test_retry_budget(self) -> None:
+        """Test retries stop when the budget is exhausted."""
+        unavailable = Response()
+        unavailable.status_code = 503
+        policy = RetryPolicy(budget=RetryBudget(ratio=0, min_retries=1))
+        with patch("requests.Session.get", return_value=unavailable) as get, patch(
+            "sunweg.api.time.sleep"
+        ):
+            api = APIHelper("user@acme.com", "password", retry_policy=policy)
+            with pytest.raises(SunWegApiError):
+                api.plant(16925)
+            assert get.call_count == 2
+            with pytest.raises(SunWegApiError):
+                api.plant(16925)
+            assert get.call_count == 3
+
+    def test_default_retry_policy(self) -> None:
+        """Test the default policy is budgeted and does not wait a long Retry-After."""
+        throttled = Response()
+        throttled.status_code = 429
+        throttled.headers["Retry-After"] = "120"
+        with patch("requests.Session.get", return_value=throttled) as get, patch(
+            "sunweg.api.time.sleep"
+        ) as sleep:
+            api = APIHelper("user@acme.com", "password")
+            assert api.retry_policy.budget is not None
+            with pytest.raises(SunWegApiError):
+                api.plant(16925)
+            assert get.call_count == 1
+            sleep.assert_not_called()
+
+    def test_shared_rate_limiter(self) -> None:
+        """Test helpers sharing a rate limiter go through the same bucket."""
+        limiter = RateLimiter(max_in_flight=4)
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ):
+            api1 = APIHelper("user@acme.com", "password", rate_limiter=limiter)
+            api2 = APIHelper("other@acme.com", "password", rate_limiter=limiter)
+            api1.plant(16925)
+            api2.plant(16925)
+            assert limiter.requests == 2
+
+    def test_circuit_breaker(self) -> None:
+        """Test requests fail fast while the circuit is open."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["error_500_response.txt"],
+        ) as get:
+            api = APIHelper("user@acme.com", "password", circuit_breaker=breaker)
+            for _ in range(2):
+                with pytest.raises(SunWegApiError):
+                    api.plant(16925)
+            assert breaker.state == CircuitState.OPEN
+            with pytest.raises(CircuitOpenError):
+                api.plant(16925)
+            assert get.call_count == 2
+
+    def test_circuit_breaker_probe_error(self) -> None:
+        """Test a probe failing with any exception gives back its slot."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        api = APIHelper("user@acme.com", "password", circuit_breaker=breaker)
+        with patch("requests.Session.get", side_effect=ValueError("probe")):
+            with pytest.raises(ValueError):
+                api.plant(16925)
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ):
+            assert api.plant(16925) is not None
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_circuit_breaker_interrupted(self) -> None:
+        """Test an interrupted request is not a failure and gives back its slot."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        api = APIHelper("user@acme.com", "password", circuit_breaker=breaker)
+        with patch("requests.Session.get", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                api.plant(16925)
+            assert breaker.state == CircuitState.CLOSED
+            breaker.record_failure()
+            with pytest.raises(KeyboardInterrupt):
+                api.plant(16925)
+        assert breaker.state == CircuitState.HALF_OPEN
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ):
+            assert api.plant(16925) is not None
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_refresh_plant(self) -> None:
+        """Test refresh reports whether the plant changed."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ) as get:
+            api = APIHelper("user@acme.com", "password")
+            (plant, changed) = api.refresh_plant(PLANT_MOCK)
+            assert changed
+            assert plant is not PLANT_MOCK
+            assert plant.name == "Plant Name"
+            (same, changed) = api.refresh_plant(plant)
+            assert not changed
+            assert same is plant
+            assert get.call_count == 2
+            assert "If-None-Match" not in get.call_args.kwargs["headers"]
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_alt_response.json"],
+        ):
+            (new, changed) = api.refresh_plant(plant)
+            assert changed
+            assert new is not plant
+
+    def test_refresh_plant_not_modified(self) -> None:
+        """Test ETag and Last-Modified are sent back to the server."""
+        response = self.responses["plant_success_response.json"]
+        response.headers["ETag"] = '"v1"'
+        response.headers["Last-Modified"] = "Sat, 25 Feb 2023 08:04:22 GMT"
+        not_modified = Response()
+        not_modified.status_code = 304
+        with patch(
+            "requests.Session.get", side_effect=[response, not_modified]
+        ) as get:
+            api = APIHelper("user@acme.com", "password")
+            (plant, changed) = api.refresh_plant(PLANT_MOCK)
+            assert changed
+            (same, changed) = api.refresh_plant(plant)
+            assert not changed
+            assert same is plant
+            headers = get.call_args.kwargs["headers"]
+            assert headers["If-None-Match"] == '"v1"'
+            assert headers["If-Modified-Since"] == "Sat, 25 Feb 2023 08:04:22 GMT"
+
+    def test_refresh_plant_login_error(self) -> None:
+        """Test an authentication failure is not reported as an unchanged plant."""
+        unauthorized = Response()
+        unauthorized.status_code = 401
+        unauthorized._content = b""
+        with patch(
+            "requests.Session.post",
+            return_value=self.responses["auth_success_response.json"],
+        ), patch("requests.Session.get", return_value=unauthorized):
+            api = APIHelper("user@acme.com", "password")
+            with pytest.raises(LoginError):
+                api.refresh_plant(PLANT_MOCK)
+
+    def test_json_decoder(self) -> None:
+        """Test responses are decoded from raw bytes by the given decoder."""
+        contents: list[bytes] = []
+
+        def decoder(content: bytes) -> dict:
+            contents.append(content)
+            return json.loads(content)
+
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ):
+            api = APIHelper("user@acme.com", "password", json_decoder=decoder)
+            assert api.plant(16925) is not None
+            assert len(contents) == 1
+            assert isinstance(contents[0], bytes)
+
+    def test_invalid_json_failures(self) -> None:
+        """Test a plant answering an invalid body is collected as a failure."""
+        html = Response()
+        html.status_code = 200
+        html._content = b"<html><body>Service unavailable</body></html>"
+
+        def get(url: str, **kwargs) -> Response:
+            if "getpaineloperacao" in url:
+                return self.responses["list_plant_success_2_response.json"]
+            return html
+
+        with patch("requests.Session.get", side_effect=get):
+            api = APIHelper("user@acme.com", "password")
+            failures: dict[int, Exception] = {}
+            assert api.listPlants(failures=failures) == []
+            assert list(failures.keys()) == [16925, 16926]
+            assert isinstance(failures[16925], SunWegApiError)
+            assert str(failures[16925]).startswith("Invalid response: ")
+
+    def test_malformed_payload_failures(self) -> None:
+        """Test a plant or inverter with a malformed payload is collected."""
+        with open(
+            path.join(path.dirname(__file__), "responses", "plant_success_response.json")
+        ) as f:
+            result = json.load(f)
+        result["energiaacumuladanumber"] = None
+        malformed = Response()
+        malformed.status_code = 200
+        malformed._content = json.dumps(result).encode()
+
+        def get(url: str, **kwargs) -> Response:
+            if "getpaineloperacao" in url:
+                return self.responses["list_plant_success_2_response.json"]
+            return malformed
+
+        with patch("requests.Session.get", side_effect=get):
+            api = APIHelper("user@acme.com", "password")
+            failures: dict[int, Exception] = {}
+            assert api.listPlants(max_workers=2, failures=failures) == []
+            assert sorted(failures.keys()) == [16925, 16926]
+            assert isinstance(failures[16925], TypeError)
+            failures = {}
+            assert list(api.iter_plants(failures=failures, max_workers=2)) == []
+            assert sorted(failures.keys()) == [16925, 16926]
+
+        with open(
+            path.join(
+                path.dirname(__file__), "responses", "inverter_success_response.json"
+            )
+        ) as f:
+            result = json.load(f)
+        del result["frequencia"]
+        malformed._content = json.dumps(result).encode()
+        with patch("requests.Session.get", return_value=malformed):
+            plant = MagicMock()
+            plant.inverters = [
+                Inverter(id=1, name="A", sn="A", status=Status.OK, temperature=70)
+            ]
+            failures = api.complete_plant(plant)
+            assert list(failures.keys()) == [1]
+            assert isinstance(failures[1], KeyError)
+
+    def test_lazy_models(self) -> None:
+        """Test lazy plants are built in lazy mode."""
+        with patch(
+            "requests.Session.get",
+            return_value=self.responses["plant_success_response.json"],
+        ):
+            api = APIHelper("user@acme.com", "password", lazy_models=True)
+            plant = api.plant(16925)
+            assert isinstance(plant, LazyPlant)
+            assert plant.name == "Plant Name"
@@ -0,0 +1,574 @@
+"""Test sunweg.async_api."""
+
+import asyncio
+import json
+from datetime import date, datetime
+from os import path
+import os
+from typing import Any
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import pytest
+
+from sunweg.api import CircuitOpenError, LoginError, SunWegApiError
+from sunweg.async_api import AsyncAPIHelper
+from sunweg.circuit import CircuitBreaker, CircuitState
+from sunweg.device import Inverter
+from sunweg.store import ProductionStatsStore
+from sunweg.util import PlantStatus, Status
+
+from .common import PLANT_MOCK
+
+
+class FakeResponse:
+    """Fake aiohttp response."""
+
+    def __init__(
+        self, status: int, content: str, headers: dict[str, str] | None = None
+    ) -> None:
+        """Initialize fake response."""
+        self.status = status
+        self._content = content
+        self.headers = headers or {}
+
+    async def __aenter__(self) -> "FakeResponse":
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Exit the response context."""
+
+    async def read(self) -> bytes:
+        """Read response content."""
+        return self._content.encode()
+
+    async def json(self, content_type: str | None = "application/json") -> Any:
+        """Decode response content."""
+        return json.loads(self._content)
+
+    def __str__(self) -> str:
+        """Cast FakeResponse to str."""
+        return "<FakeResponse [%s]>" % self.status
+
+
+class FakeSession:
+    """Fake aiohttp session returning canned responses."""
+
+    def __init__(
+        self, get: FakeResponse | None = None, post: FakeResponse | None = None
+    ) -> None:
+        """Initialize fake session."""
+        self.get = MagicMock(return_value=get)
+        self.post = MagicMock(return_value=post)
+
+
+class AsyncApi_Test(TestCase):
+    """AsyncAPIHelper test case."""
+
+    responses: dict[str, FakeResponse] = {}
+
+    def setUp(self) -> None:
+        """Set tests up."""
+        for file in os.listdir(path.join(path.dirname(__file__), "responses")):
+            filename = path.basename(file)
+            with open(path.join(path.dirname(__file__), "responses", file)) as f:
+                content = "".join(f.readlines())
+                if filename.startswith("error"):
+                    response = FakeResponse(int(filename.split("_")[1]), content)
+                else:
+                    response = FakeResponse(200, content)
+                self.responses[filename] = response
+
+    def test_error500(self) -> None:
+        """Test error 500."""
+        session = FakeSession(post=self.responses["error_500_response.txt"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        with pytest.raises(SunWegApiError) as e_info:
+            asyncio.run(api.authenticate())
+        assert e_info.value.__str__() == "Request failed: <FakeResponse [500]>"
+
+    def test_authenticate_success(self) -> None:
+        """Test authentication success."""
+        session = FakeSession(post=self.responses["auth_success_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        assert asyncio.run(api.authenticate())
+        assert api._token is not None
+
+    def test_authenticate_token_store(self) -> None:
+        """Test the token store is loaded and saved off the event loop."""
+        session = FakeSession(
+            get=self.responses["plant_success_response.json"],
+            post=self.responses["auth_success_response.json"],
+        )
+        store = MagicMock()
+        store.load.return_value = "stored"
+        api = AsyncAPIHelper(
+            "user@acme.com", "password", session=session, token_store=store
+        )
+        store.load.assert_not_called()
+        with patch(
+            "sunweg.async_api.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            assert asyncio.run(api.plant(16925)) is not None
+            assert api._token == "stored"
+            to_thread.assert_called_once()
+            assert asyncio.run(api.authenticate())
+        store.load.assert_called_once_with("user@acme.com")
+        store.save.assert_called_once_with("user@acme.com", api._token)
+        assert to_thread.call_count == 2
+
+    def test_token_store_errors(self) -> None:
+        """Test a token store that cannot be read or written is skipped."""
+        session = FakeSession(post=self.responses["auth_success_response.json"])
+        store = MagicMock()
+        store.load.side_effect = PermissionError("read-only")
+        store.save.side_effect = PermissionError("read-only")
+        api = AsyncAPIHelper(
+            "user@acme.com", "password", session=session, token_store=store
+        )
+        with self.assertLogs("sunweg.auth", "WARNING"):
+            assert asyncio.run(api.authenticate())
+        assert api._token is not None
+        store.save.assert_called_once()
+
+    def test_authenticate_failed(self) -> None:
+        """Test authentication failed."""
+        session = FakeSession(post=self.responses["auth_fail_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        assert not asyncio.run(api.authenticate())
+        assert not asyncio.run(AsyncAPIHelper().authenticate())
+
+    def test_list_plants_2_success(self) -> None:
+        """Test list plants with two plant in the list."""
+        session = FakeSession(get=self.responses["list_plant_success_2_response.json"])
+        with patch("sunweg.async_api.AsyncAPIHelper.plant", return_value=PLANT_MOCK):
+            api = AsyncAPIHelper("user@acme.com", "password", session=session)
+            assert len(asyncio.run(api.listPlants())) == 2
+
+    def test_plant_invalid_json(self) -> None:
+        """Test an invalid body is reported as an API error."""
+        session = FakeSession(get=FakeResponse(200, "<html></html>"))
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        with pytest.raises(SunWegApiError) as e_info:
+            asyncio.run(api.plant(16925))
+        assert str(e_info.value).startswith("Invalid response: ")
+
+    def test_list_plants_concurrent_failures(self) -> None:
+        """Test list plants fetched concurrently collecting failures."""
+
+        async def plant(id: int) -> MagicMock:
+            if id == 16926:
+                raise SunWegApiError("Request failed")
+            return MagicMock(id=id)
+
+        session = FakeSession(get=self.responses["list_plant_success_2_response.json"])
+        with patch("sunweg.async_api.AsyncAPIHelper.plant", side_effect=plant):
+            api = AsyncAPIHelper("user@acme.com", "password", session=session)
+            failures: dict[int, Exception] = {}
+            plants = asyncio.run(api.listPlants(max_workers=2, failures=failures))
+            assert [plant.id for plant in plants] == [16925]
+            assert list(failures.keys()) == [16926]
+
+    def test_iter_plant_ids_pages(self) -> None:
+        """Test iterating plant ids over every page."""
+        pages = [[1, 2], [3]]
+
+        def get(url: str, **kwargs: Any) -> FakeResponse:
+            page = int(url.split("paginaAtual=")[1])
+            ids = pages[page - 1] if page <= len(pages) else []
+            return FakeResponse(
+                200,
+                json.dumps(
+                    {
+                        "success": True,
+                        "conectadas": [{"id": id} for id in ids],
+                        "nao_comissionadas": [],
+                        "falhas": [],
+                        "alertas": [],
+                        "atendimento": [],
+                    }
+                ),
+            )
+
+        async def collect(api: AsyncAPIHelper) -> list[int]:
+            return [id async for id in api.iter_plant_ids(page_size=2)]
+
+        session = FakeSession()
+        session.get.side_effect = get
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        assert asyncio.run(collect(api)) == [1, 2, 3]
+
+    def test_iter_plant_ids_login_error(self) -> None:
+        """Test an authentication failure after the first page is raised."""
+        first_page = FakeResponse(
+            200,
+            json.dumps(
+                {
+                    "success": True,
+                    "conectadas": [{"id": 1}, {"id": 2}],
+                    "nao_comissionadas": [],
+                    "falhas": [],
+                    "alertas": [],
+                    "atendimento": [],
+                }
+            ),
+        )
+
+        def get(url: str, **kwargs: Any) -> FakeResponse:
+            if "paginaAtual=1" in url:
+                return first_page
+            return FakeResponse(401, "")
+
+        async def collect(api: AsyncAPIHelper) -> list[int]:
+            return [id async for id in api.iter_plant_ids(page_size=2)]
+
+        session = FakeSession(post=self.responses["auth_fail_response.json"])
+        session.get.side_effect = get
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        with pytest.raises(LoginError):
+            asyncio.run(collect(api))
+        session.get.side_effect = None
+        session.get.return_value = FakeResponse(401, "")
+        assert asyncio.run(api.listPlants()) == []
+
+    def test_list_plant_summaries(self) -> None:
+        """Test listing plant summaries with their status bucket."""
+        session = FakeSession(get=self.responses["list_plant_success_2_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        summaries = asyncio.run(api.list_plant_summaries())
+        assert [summary.id for summary in summaries] == [16925, 16926]
+        assert all(summary.status == PlantStatus.CONNECTED for summary in summaries)
+        assert session.get.call_count == 1
+
+    def test_iter_plants_completion_order(self) -> None:
+        """Test plants are yielded completed, as soon as they are ready."""
+        session = FakeSession(
+            get=FakeResponse(
+                200,
+                json.dumps(
+                    {
+                        "success": True,
+                        "conectadas": [{"id": id} for id in range(1, 6)],
+                        "nao_comissionadas": [],
+                        "falhas": [],
+                        "alertas": [],
+                        "atendimento": [],
+                    }
+                ),
+            )
+        )
+
+        async def plant(id: int) -> MagicMock:
+            if id == 1:
+                await asyncio.sleep(0.05)
+            if id == 3:
+                raise SunWegApiError("Request failed")
+            return MagicMock(id=id)
+
+        async def run(api: AsyncAPIHelper, failures: dict) -> list:
+            return [
+                plant
+                async for plant in api.iter_plants(
+                    page_size=10,
+                    failures=failures,
+                    complete_inverters=True,
+                    max_workers=4,
+                )
+            ]
+
+        with patch("sunweg.async_api.AsyncAPIHelper.plant", side_effect=plant), patch(
+            "sunweg.async_api.AsyncAPIHelper.complete_plant", return_value={}
+        ) as complete_plant:
+            api = AsyncAPIHelper("user@acme.com", "password", session=session)
+            failures: dict[int, Exception] = {}
+            plants = asyncio.run(run(api, failures))
+            assert sorted(plant.id for plant in plants) == [1, 2, 4, 5]
+            assert plants[-1].id == 1
+            assert list(failures.keys()) == [3]
+            assert complete_plant.call_count == 4
+
+    def test_list_plants_401(self) -> None:
+        """Test list plants with expired token."""
+        session = FakeSession(
+            get=self.responses["error_401_response.txt"],
+            post=self.responses["auth_success_response.json"],
+        )
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        assert len(asyncio.run(api.listPlants())) == 0
+        assert session.post.call_count == 1
+        assert session.get.call_count == 2
+
+    def test_plant_success(self) -> None:
+        """Test plant success."""
+        session = FakeSession(get=self.responses["plant_success_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        plant = asyncio.run(api.plant(16925))
+        assert plant is not None
+        assert plant.id == 16925
+        assert plant.name == "Plant Name"
+        assert plant.total_power == 25.23
+        assert plant.last_update == datetime(2023, 2, 25, 8, 4, 22)
+        assert plant.today_energy == 1.23
+        assert len(plant.inverters) == 1
+        assert not plant.inverters[0].is_complete
+
+    def test_inverter_success(self) -> None:
+        """Test inverter success."""
+        session = FakeSession(get=self.responses["inverter_success_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        inverter = asyncio.run(api.inverter(21255))
+        assert inverter is not None
+        assert inverter.id == 21255
+        assert inverter.frequency == 59.85
+        assert inverter.status == Status.OK
+        assert inverter.total_energy == 23.2
+        assert sum(len(mppt.strings) for mppt in inverter.mppts) == 4
+        assert len(inverter.phases) == 3
+
+    def test_inverter_401(self) -> None:
+        """Test inverter with expired token."""
+        session = FakeSession(
+            get=self.responses["error_401_response.txt"],
+            post=self.responses["auth_success_response.json"],
+        )
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        assert asyncio.run(api.inverter(21255)) is None
+
+    def test_complete_inverter_success(self) -> None:
+        """Test complete inverter success."""
+        session = FakeSession(get=self.responses["inverter_success_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        inverter = Inverter(
+            id=12345,
+            name="Other inverter name",
+            sn="1234ABCD",
+            status=Status.ERROR,
+            temperature=70,
+        )
+        asyncio.run(api.complete_inverter(inverter))
+        assert inverter.is_complete
+        assert inverter.name == "Other inverter name"
+        assert inverter.frequency == 59.85
+        assert len(inverter.phases) == 3
+
+    def test_complete_plants(self) -> None:
+        """Test complete plants requesting each inverter once."""
+        session = FakeSession(get=self.responses["inverter_success_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        plant = MagicMock()
+        plant.inverters = [
+            Inverter(id=1, name="A", sn="A", status=Status.OK, temperature=70),
+            Inverter(id=1, name="A", sn="A", status=Status.OK, temperature=70),
+        ]
+        assert asyncio.run(api.complete_plant(plant)) == {}
+        assert session.get.call_count == 1
+        assert all(inverter.is_complete for inverter in plant.inverters)
+
+    def test_malformed_payload_failures(self) -> None:
+        """Test a plant or inverter with a malformed payload is collected."""
+        result = json.loads(self.responses["plant_success_response.json"]._content)
+        result["energiaacumuladanumber"] = None
+        malformed = FakeResponse(200, json.dumps(result))
+
+        def get(url: str, **kwargs) -> FakeResponse:
+            if "getpaineloperacao" in url:
+                return self.responses["list_plant_success_2_response.json"]
+            return malformed
+
+        session = FakeSession()
+        session.get.side_effect = get
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        failures: dict[int, Exception] = {}
+        assert asyncio.run(api.listPlants(max_workers=2, failures=failures)) == []
+        assert sorted(failures.keys()) == [16925, 16926]
+        assert isinstance(failures[16925], TypeError)
+
+        async def iterate() -> list:
+            return [plant async for plant in api.iter_plants(failures=failures)]
+
+        failures = {}
+        assert asyncio.run(iterate()) == []
+        assert sorted(failures.keys()) == [16925, 16926]
+
+        result = json.loads(self.responses["inverter_success_response.json"]._content)
+        del result["frequencia"]
+        session.get.side_effect = None
+        session.get.return_value = FakeResponse(200, json.dumps(result))
+        plant = MagicMock()
+        plant.inverters = [
+            Inverter(id=1, name="A", sn="A", status=Status.OK, temperature=70)
+        ]
+        failures = asyncio.run(api.complete_plant(plant))
+        assert list(failures.keys()) == [1]
+        assert isinstance(failures[1], KeyError)
+
+    def test_month_stats_store(self) -> None:
+        """Test closed month stats are read and saved off the event loop."""
+        session = FakeSession(get=self.responses["month_stats_success_response.json"])
+        store = ProductionStatsStore()
+        api = AsyncAPIHelper(
+            "user@acme.com", "password", session=session, stats_store=store
+        )
+        with patch(
+            "sunweg.async_api.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            stats = asyncio.run(api.month_stats_production_by_id(2024, 5, 1))
+            stored = asyncio.run(api.month_stats_production_by_id(2024, 5, 1))
+        assert session.get.call_count == 1
+        assert [stat.production for stat in stored] == [
+            stat.production for stat in stats
+        ]
+        assert [call.args[0] for call in to_thread.call_args_list] == [
+            store.get,
+            store.save,
+            store.get,
+        ]
+
+    def test_month_stats_fail(self) -> None:
+        """Test month stats with error from server."""
+        session = FakeSession(get=self.responses["month_stats_fail_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        with pytest.raises(SunWegApiError) as e_info:
+            asyncio.run(api.month_stats_production_by_id(2013, 12, 1))
+        assert e_info.value.__str__() == "Error message"
+
+    def test_month_stats_success(self) -> None:
+        """Test month stats with data from server."""
+        session = FakeSession(get=self.responses["month_stats_success_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        plant = MagicMock()
+        plant.id = 1
+        stats = asyncio.run(api.month_stats_production(2023, 12, plant))
+        assert len(stats) > 0
+        for i, stat in enumerate(stats, start=1):
+            assert stat.date == date(2024, 5, i)
+            assert stat.prognostic == 111.03225806451613
+
+    def test_production_stats_range(self) -> None:
+        """Test month stats of a date range trimmed and ordered."""
+        empty = FakeResponse(200, '{"success": true, "graficomes": []}')
+
+        def get(url: str, **kwargs: Any) -> FakeResponse:
+            if url.endswith("date=05/2024"):
+                return self.responses["month_stats_success_response.json"]
+            return empty
+
+        session = FakeSession()
+        session.get.side_effect = get
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        stats = asyncio.run(
+            api.production_stats_range(1, date(2024, 3, 1), date(2024, 5, 3))
+        )
+        assert session.get.call_count == 3
+        assert [stat.date.day for stat in stats] == [1, 2, 3]
+
+    def test_owned_session_lifecycle(self) -> None:
+        """Test the helper creates and closes its own session."""
+
+        async def run() -> None:
+            async with AsyncAPIHelper(token="token", limit=5) as api:
+                session = api.session
+                assert session is api.session
+                assert session.connector is not None
+                assert session.connector.limit == 5
+            assert session.closed
+
+        asyncio.run(run())
+
+    def test_retry_transient_status(self) -> None:
+        """Test a 503 response is retried after Retry-After."""
+        session = FakeSession()
+        session.get.side_effect = [
+            FakeResponse(503, "unavailable", {"Retry-After": "2"}),
+            self.responses["plant_success_response.json"],
+        ]
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        with patch("sunweg.async_api.asyncio.sleep") as sleep:
+            plant = asyncio.run(api.plant(16925))
+        assert plant is not None
+        assert session.get.call_count == 2
+        sleep.assert_called_once_with(2.0)
+
+    def test_circuit_breaker(self) -> None:
+        """Test requests fail fast while the circuit is open."""
+        session = FakeSession(get=self.responses["error_500_response.txt"])
+        api = AsyncAPIHelper(
+            "user@acme.com",
+            "password",
+            session=session,
+            circuit_breaker=CircuitBreaker(failure_threshold=1),
+        )
+        with pytest.raises(SunWegApiError):
+            asyncio.run(api.plant(16925))
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(api.plant(16925))
+        assert session.get.call_count == 1
+
+    def test_circuit_breaker_probe_error(self) -> None:
+        """Test a probe failing with any exception gives back its slot."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        session = FakeSession(get=self.responses["plant_success_response.json"])
+        session.get.side_effect = ValueError("probe")
+        api = AsyncAPIHelper(
+            "user@acme.com", "password", session=session, circuit_breaker=breaker
+        )
+        with pytest.raises(ValueError):
+            asyncio.run(api.plant(16925))
+        session.get.side_effect = None
+        assert asyncio.run(api.plant(16925)) is not None
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_circuit_breaker_cancelled(self) -> None:
+        """Test cancelled requests are not failures and give back their slot."""
+
+        class SlowResponse(FakeResponse):
+            async def __aenter__(self) -> "FakeResponse":
+                await asyncio.sleep(10)
+                return self
+
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0)
+        session = FakeSession(get=SlowResponse(200, ""))
+        api = AsyncAPIHelper(
+            "user@acme.com", "password", session=session, circuit_breaker=breaker
+        )
+
+        async def cancel(count: int) -> None:
+            tasks = [asyncio.ensure_future(api.plant(16925)) for _ in range(count)]
+            await asyncio.sleep(0.01)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run(cancel(4))
+        assert breaker.state == CircuitState.CLOSED
+        for _ in range(3):
+            breaker.record_failure()
+        asyncio.run(cancel(1))
+        session.get.return_value = self.responses["plant_success_response.json"]
+        assert asyncio.run(api.plant(16925)) is not None
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_refresh_plant_login_error(self) -> None:
+        """Test an authentication failure is not reported as an unchanged plant."""
+        session = FakeSession(
+            get=self.responses["error_401_response.txt"],
+            post=self.responses["auth_success_response.json"],
+        )
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        with pytest.raises(LoginError):
+            asyncio.run(api.refresh_plant(PLANT_MOCK))
+
+    def test_refresh_plant(self) -> None:
+        """Test refresh reports whether the plant changed."""
+        session = FakeSession(get=self.responses["plant_success_response.json"])
+        api = AsyncAPIHelper("user@acme.com", "password", session=session)
+        plant = PLANT_MOCK
+        refreshed, changed = asyncio.run(api.refresh_plant(plant))
+        assert changed
+        assert refreshed is not plant
+        assert refreshed.id == plant.id
+        same, changed = asyncio.run(api.refresh_plant(refreshed))
+        assert not changed
+        assert same is refreshed
+        assert session.get.call_count == 2
@@ -0,0 +1,171 @@
+"""Test sunweg.auth."""
+
+import asyncio
+import os
+from tempfile import TemporaryDirectory
+from threading import Barrier, Thread
+import time
+from unittest import TestCase
+
+from sunweg.auth import FileTokenStore, TokenManager, TokenStore, token_expiration
+
+JWT_TOKEN = (
+    "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.eyJpYXQiOjE2NzcyNjQzODEsImlzcyI6Imh0dHA6"
+    + "XC9cL2llcy5nb3YiLCJleHAiOjE2Nzc4NjkxODEsImhvc3QiOiIxOTEuMzMuMTg1LjEyOSIsImR"
+    + "hdGEiOnsidXN1YXJpb2lkIjo2NTQzLCJpZHBlcmZpbCI6NiwiaWRyZWxhY2lvbmFkbyI6MTAxOC"
+    + "wiaWRmcmFucXVlYWRvIjpudWxsLCJhbGVydGFzIjp0cnVlLCJjb250cm9sZSI6dHJ1ZSwiZnJlZ"
+    + "SI6ZmFsc2V9fQ.907NnIUaMhVl2HVzAuzPTvVdD-huHNg932Eu2zj7-0"
+)
+
+
+class Auth_Test(TestCase):
+    """TokenManager test case."""
+
+    def test_token_expiration(self) -> None:
+        """Test reading the expiration of a token."""
+        assert token_expiration(JWT_TOKEN) == 1677869181
+        assert token_expiration("token") is None
+        assert token_expiration("a.b.c") is None
+        assert token_expiration(None) is None
+
+    def test_is_expiring(self) -> None:
+        """Test expiring tokens."""
+        assert TokenManager(JWT_TOKEN).is_expiring()
+        assert not TokenManager("token").is_expiring()
+        manager = TokenManager(refresh_margin=60)
+        manager._expires_at = time.time() + 120
+        assert not manager.is_expiring()
+        manager._expires_at = time.time() + 30
+        assert manager.is_expiring()
+
+    def test_single_flight_refresh(self) -> None:
+        """Test concurrent callers reauthenticate only once."""
+        manager = TokenManager("old")
+        barrier = Barrier(8)
+        logins: list[int] = []
+
+        def authenticate() -> bool:
+            logins.append(1)
+            time.sleep(0.05)
+            manager.token = "new"
+            return True
+
+        def worker() -> None:
+            barrier.wait()
+            assert manager.refresh("old", authenticate)
+
+        threads = [Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(logins) == 1
+        assert manager.token == "new"
+
+    def test_async_single_flight_refresh(self) -> None:
+        """Test concurrent tasks reauthenticate only once."""
+        manager = TokenManager("old")
+        logins: list[int] = []
+
+        async def authenticate() -> bool:
+            logins.append(1)
+            await asyncio.sleep(0.01)
+            manager.token = "new"
+            return True
+
+        async def run() -> list[bool]:
+            return await asyncio.gather(
+                *[manager.async_refresh("old", authenticate) for _ in range(8)]
+            )
+
+        assert all(asyncio.run(run()))
+        assert len(logins) == 1
+
+    def test_refresh_if_expiring(self) -> None:
+        """Test callers that saw an expiring token reauthenticate only once."""
+        manager = TokenManager(JWT_TOKEN)
+        barrier = Barrier(8)
+        logins: list[int] = []
+
+        def authenticate() -> bool:
+            logins.append(1)
+            time.sleep(0.05)
+            manager.token = "fresh"
+            return True
+
+        def worker() -> None:
+            barrier.wait()
+            assert manager.refresh_if_expiring(authenticate)
+
+        threads = [Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(logins) == 1
+        assert manager.token == "fresh"
+        assert manager.refresh_if_expiring(authenticate)
+        assert len(logins) == 1
+
+    def test_async_refresh_if_expiring(self) -> None:
+        """Test tasks that saw an expiring token reauthenticate only once."""
+        manager = TokenManager(JWT_TOKEN)
+        logins: list[int] = []
+
+        async def authenticate() -> bool:
+            logins.append(1)
+            await asyncio.sleep(0.01)
+            manager.token = "fresh"
+            return True
+
+        async def run() -> list[bool]:
+            return await asyncio.gather(
+                *[manager.async_refresh_if_expiring(authenticate) for _ in range(8)]
+            )
+
+        assert all(asyncio.run(run()))
+        assert len(logins) == 1
+
+    def test_failed_refresh(self) -> None:
+        """Test a failed reauthentication stops proactive refreshes."""
+        manager = TokenManager(JWT_TOKEN)
+        assert not manager.refresh(JWT_TOKEN, lambda: False)
+        assert not manager.is_expiring()
+
+    def test_file_token_store(self) -> None:
+        """Test saving and loading tokens from a file."""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sub", "tokens.json")
+            store = FileTokenStore(path)
+            assert store.path == path
+            assert store.load("user@acme.com") is None
+            store.save("user@acme.com", "token")
+            store.save("other@acme.com", "other")
+            assert FileTokenStore(path).load("user@acme.com") == "token"
+            assert FileTokenStore(path).load("other@acme.com") == "other"
+            assert os.stat(path).st_mode & 0o777 == 0o600
+            store.save("user@acme.com", JWT_TOKEN)
+            assert store.load("user@acme.com") is None
+
+    def test_token_store_abstract(self) -> None:
+        """Test a token store must implement load and save."""
+
+        class LoadOnlyStore(TokenStore):
+            def load(self, username: str) -> str | None:
+                return None
+
+        with self.assertRaises(TypeError):
+            TokenStore()
+        with self.assertRaises(TypeError):
+            LoadOnlyStore()
+
+    def test_file_token_store_corrupted(self) -> None:
+        """Test a corrupted tokens file is ignored."""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tokens.json")
+            with open(path, "w") as file:
+                file.write("{not json")
+            store = FileTokenStore(path)
+            assert store.load("user@acme.com") is None
+            store.save("user@acme.com", "token")
+            assert store.load("user@acme.com") == "token"
@@ -0,0 +1,80 @@
+"""Test sunweg.cache."""
+
+from datetime import date
+from unittest import TestCase
+from unittest.mock import patch
+
+from sunweg.api import month_stats_path
+from sunweg.cache import ResponseCache
+from sunweg.const import SUNWEG_INVERTER_DETAIL_PATH, SUNWEG_PLANT_DETAIL_PATH
+
+
+class Cache_Test(TestCase):
+    """ResponseCache test case."""
+
+    def test_hit_miss(self) -> None:
+        """Test hit and miss counters."""
+        cache = ResponseCache()
+        path = SUNWEG_PLANT_DETAIL_PATH + "1"
+        assert cache.get(path) is None
+        cache.set(path, {"success": True})
+        assert cache.get(path) == {"success": True}
+        assert cache.hits == 1
+        assert cache.misses == 1
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.hits == 0
+
+    def test_ttl_expiration(self) -> None:
+        """Test entries expire after the endpoint TTL."""
+        cache = ResponseCache(plant_ttl=10, inverter_ttl=100)
+        plant_path = SUNWEG_PLANT_DETAIL_PATH + "1"
+        inverter_path = SUNWEG_INVERTER_DETAIL_PATH + "1"
+        with patch("sunweg.cache.time.monotonic", return_value=1000):
+            cache.set(plant_path, {"success": True})
+            cache.set(inverter_path, {"success": True})
+        with patch("sunweg.cache.time.monotonic", return_value=1050):
+            assert cache.get(plant_path) is None
+            assert cache.get(inverter_path) is not None
+        assert len(cache) == 1
+
+    def test_disabled_endpoint(self) -> None:
+        """Test endpoints with TTL 0 are not cached."""
+        cache = ResponseCache(plant_ttl=0)
+        cache.set(SUNWEG_PLANT_DETAIL_PATH + "1", {"success": True})
+        cache.set("login/autenticacao", {"success": True})
+        assert len(cache) == 0
+
+    def test_lru_eviction(self) -> None:
+        """Test the least recently used entry is evicted."""
+        cache = ResponseCache(max_size=2)
+        cache.set(SUNWEG_PLANT_DETAIL_PATH + "1", {"id": 1})
+        cache.set(SUNWEG_PLANT_DETAIL_PATH + "2", {"id": 2})
+        cache.get(SUNWEG_PLANT_DETAIL_PATH + "1")
+        cache.set(SUNWEG_PLANT_DETAIL_PATH + "3", {"id": 3})
+        assert cache.get(SUNWEG_PLANT_DETAIL_PATH + "1") is not None
+        assert cache.get(SUNWEG_PLANT_DETAIL_PATH + "2") is None
+        assert cache.get(SUNWEG_PLANT_DETAIL_PATH + "3") is not None
+
+    def test_closed_month_stats(self) -> None:
+        """Test month stats of past months are kept forever."""
+        cache = ResponseCache(month_stats_ttl=60)
+        today = date.today()
+        assert cache.ttl(month_stats_path(today.year - 1, 12, 1)) is None
+        assert cache.ttl(month_stats_path(today.year, today.month, 1, 2)) == 60
+        assert cache.ttl(month_stats_path(today.year + 1, 1, 1)) == 60
+
+    def test_month_stats_closed_like_store(self) -> None:
+        """Test the previous month is cached with a TTL until the store closes it."""
+
+        class FixedDate(date):
+            @classmethod
+            def today(cls) -> date:
+                return date(2024, 6, 2)
+
+        cache = ResponseCache(month_stats_ttl=60)
+        path = month_stats_path(2024, 5, 1)
+        with patch("sunweg.store.date", FixedDate):
+            assert cache.ttl(path) == 60
+            FixedDate.today = classmethod(lambda cls: date(2024, 6, 3))
+            assert cache.ttl(path) is None
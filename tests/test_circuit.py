@@ -0,0 +1,96 @@
+"""Test sunweg.circuit."""
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from sunweg.circuit import CircuitBreaker, CircuitState, is_failure_status
+
+
+class Circuit_Test(TestCase):
+    """CircuitBreaker test case."""
+
+    def test_is_failure_status(self) -> None:
+        """Test statuses counted as failures."""
+        assert is_failure_status(None)
+        assert is_failure_status(429)
+        assert is_failure_status(503)
+        assert not is_failure_status(200)
+        assert not is_failure_status(401)
+
+    def test_consecutive_failures(self) -> None:
+        """Test the circuit opens after consecutive failures."""
+        breaker = CircuitBreaker(failure_threshold=3)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+        assert breaker.retry_after > 0
+
+    def test_error_rate(self) -> None:
+        """Test the circuit opens when the failure rate is too high."""
+        breaker = CircuitBreaker(
+            failure_threshold=100, error_rate_threshold=0.5, window=10, min_calls=6
+        )
+        for _ in range(3):
+            breaker.record_success()
+            breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.error_rate == 0.5
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+    def test_half_open(self) -> None:
+        """Test probes close or reopen the circuit."""
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=10, half_open_calls=2
+        )
+        with patch("sunweg.circuit.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+            assert breaker.state == CircuitState.OPEN
+        with patch("sunweg.circuit.time.monotonic", return_value=111.0):
+            assert breaker.state == CircuitState.HALF_OPEN
+            assert breaker.retry_after == 0
+            assert breaker.allow_request()
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+            breaker.record_success()
+            assert breaker.state == CircuitState.HALF_OPEN
+            breaker.record_failure()
+            assert breaker.state == CircuitState.OPEN
+        with patch("sunweg.circuit.time.monotonic", return_value=122.0):
+            assert breaker.allow_request()
+            assert breaker.allow_request()
+            breaker.record_success()
+            breaker.record_success()
+            assert breaker.state == CircuitState.CLOSED
+            assert breaker.allow_request()
+
+    def test_release(self) -> None:
+        """Test a released probe slot lets another probe through."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        with patch("sunweg.circuit.time.monotonic", return_value=100.0):
+            breaker.release()
+            breaker.record_failure()
+        with patch("sunweg.circuit.time.monotonic", return_value=111.0):
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+            breaker.release()
+            assert breaker.state == CircuitState.HALF_OPEN
+            assert breaker.allow_request()
+            breaker.record_success()
+            assert breaker.state == CircuitState.CLOSED
+            breaker.release()
+            assert breaker.state == CircuitState.CLOSED
+
+    def test_reset(self) -> None:
+        """Test reset closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        breaker.reset()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.error_rate == 0.0
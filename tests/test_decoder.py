@@ -0,0 +1,30 @@
+"""Test sunweg.decoder."""
+
+import json
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from sunweg.decoder import decode_json_orjson, decode_json_stdlib, default_decoder
+
+from .common import RESPONSES, read_response
+
+
+class Decoder_Test(TestCase):
+    """JSON decoder test case."""
+
+    def test_decoders_equivalent(self) -> None:
+        """Test every decoder decodes the recorded responses the same way."""
+        for file in os.listdir(RESPONSES):
+            if not file.endswith(".json"):
+                continue
+            content = read_response(file)
+            expected = json.loads(content.decode())
+            assert decode_json_stdlib(content) == expected, file
+            assert decode_json_orjson(content) == expected, file
+
+    def test_default_decoder(self) -> None:
+        """Test orjson is used only when installed."""
+        assert default_decoder() is decode_json_orjson
+        with patch("sunweg.decoder.orjson", None):
+            assert default_decoder() is decode_json_stdlib
@@ -0,0 +1,118 @@
+"""Test sunweg.lazy."""
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from sunweg.api import inverter_from_response, plant_from_response
+from sunweg.lazy import LazyInverter, LazyPlant
+
+from .common import load_response as load
+
+PLANT_FIELDS = [
+    "id",
+    "name",
+    "total_power",
+    "total_power_metric",
+    "total_power_w",
+    "saving",
+    "today_energy",
+    "today_energy_metric",
+    "total_energy",
+    "total_carbon_saving",
+    "last_update",
+]
+
+INVERTER_FIELDS = [
+    "id",
+    "name",
+    "sn",
+    "status",
+    "temperature",
+    "total_energy",
+    "total_energy_metric",
+    "today_energy",
+    "today_energy_metric",
+    "power_factor",
+    "frequency",
+    "power",
+    "power_metric",
+    "is_complete",
+]
+
+
+class Lazy_Test(TestCase):
+    """Lazy models test case."""
+
+    def test_plant_equivalent(self) -> None:
+        """Test lazy plants read the same values as eager ones."""
+        for file in ["plant_success_response.json", "plant_success_alt_response.json"]:
+            result = load(file)
+            eager = plant_from_response(16925, result)
+            lazy = plant_from_response(16925, result, lazy=True)
+            assert isinstance(lazy, LazyPlant)
+            for field in PLANT_FIELDS:
+                assert getattr(lazy, field) == getattr(eager, field), field
+            assert [inverter.id for inverter in lazy.inverters] == [
+                inverter.id for inverter in eager.inverters
+            ]
+            assert str(lazy).startswith("<class 'sunweg.lazy.LazyPlant'>: {'_id'")
+            assert "_result" not in str(lazy)
+
+    def test_plant_on_demand(self) -> None:
+        """Test fields are converted on first access only."""
+        lazy = LazyPlant(16925, load("plant_success_response.json"))
+        with patch("sunweg.lazy.parse_datetime") as parse:
+            assert lazy.name == "Plant Name"
+            assert lazy.today_energy == 1.23
+            parse.assert_not_called()
+        assert lazy.last_update is not None
+        with patch("sunweg.lazy.parse_datetime") as parse:
+            assert lazy.last_update is not None
+            parse.assert_not_called()
+
+    def test_inverter_equivalent(self) -> None:
+        """Test lazy inverters read the same values as eager ones."""
+        result = load("inverter_success_response.json")
+        eager = inverter_from_response(21255, result)
+        lazy = inverter_from_response(21255, result, lazy=True)
+        assert isinstance(lazy, LazyInverter)
+        for field in INVERTER_FIELDS:
+            assert getattr(lazy, field) == getattr(eager, field), field
+        assert [mppt.name for mppt in lazy.mppts] == [mppt.name for mppt in eager.mppts]
+        assert [str(string) for mppt in lazy.mppts for string in mppt.strings] == [
+            str(string) for mppt in eager.mppts for string in mppt.strings
+        ]
+        assert [str(phase) for phase in lazy.phases] == [
+            str(phase) for phase in eager.phases
+        ]
+
+    def test_inverter_readings_on_demand(self) -> None:
+        """Test readings are parsed only when MPPTs or phases are read."""
+        lazy = LazyInverter(21255, load("inverter_success_response.json"))
+        with patch("sunweg.lazy.readings_from_response") as readings:
+            assert lazy.power_metric == "kW"
+            readings.assert_not_called()
+        assert len(lazy.phases) == 3
+        assert lazy.readings is not None
+
+    def test_set_before_metric(self) -> None:
+        """Test reading a metric keeps the value set before it."""
+        lazy = inverter_from_response(
+            21255, load("inverter_success_response.json"), lazy=True
+        )
+        lazy.power = 123.0
+        lazy.today_energy = 4.5
+        lazy.total_energy = 67.0
+        assert lazy.power_metric == "kW"
+        assert lazy.today_energy_metric == "kWh"
+        assert lazy.total_energy_metric == "kWh"
+        assert (lazy.power, lazy.today_energy, lazy.total_energy) == (123.0, 4.5, 67.0)
+
+        lazy.power_metric = "W"
+        assert lazy.power == 123.0
+        assert lazy.power_metric == "W"
+
+        plant = LazyPlant(16925, load("plant_success_response.json"))
+        plant._today_energy = 2.0
+        assert plant.today_energy_metric == "kWh"
+        assert plant.today_energy == 2.0
@@ -0,0 +1,93 @@
+"""Test sunweg.ratelimit."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+
+from sunweg.ratelimit import RateLimiter
+
+
+class RateLimiter_Test(TestCase):
+    """RateLimiter test case."""
+
+    def test_reserve_rate(self) -> None:
+        """Test requests are spaced after the burst."""
+        limiter = RateLimiter(rate=2, burst=3)
+        with patch("sunweg.ratelimit.time.monotonic", return_value=100.0):
+            delays = [limiter.reserve() for _ in range(5)]
+        assert delays == [0.0, 0.0, 0.0, 0.5, 1.0]
+        with patch("sunweg.ratelimit.time.monotonic", return_value=110.0):
+            assert limiter.reserve() == 0.0
+
+    def test_unlimited(self) -> None:
+        """Test a limiter without rate never waits."""
+        limiter = RateLimiter()
+        assert all(limiter.reserve() == 0.0 for _ in range(100))
+
+    def test_invalid(self) -> None:
+        """Test invalid settings."""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+        with pytest.raises(ValueError):
+            RateLimiter(rate=1, burst=0)
+
+    def test_acquire_stats(self) -> None:
+        """Test waits are slept and recorded."""
+        limiter = RateLimiter(rate=10)
+        with patch("sunweg.ratelimit.time.sleep") as sleep:
+            for _ in range(3):
+                with limiter.acquire():
+                    pass
+        assert limiter.requests == 3
+        assert sleep.call_count >= 1
+        assert limiter.max_wait >= 0
+        assert limiter.mean_wait == limiter.total_wait / 3
+        limiter.reset_stats()
+        assert limiter.requests == 0
+        assert limiter.mean_wait == 0.0
+
+    def test_max_in_flight(self) -> None:
+        """Test the number of simultaneous requests is limited."""
+        limiter = RateLimiter(max_in_flight=2)
+        lock = Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def request(_: int) -> None:
+            with limiter.acquire():
+                with lock:
+                    in_flight[0] += 1
+                    peak[0] = max(peak[0], in_flight[0])
+                time.sleep(0.01)
+                with lock:
+                    in_flight[0] -= 1
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(request, range(16)))
+        assert peak[0] <= 2
+        assert limiter.requests == 16
+
+    def test_async_max_in_flight(self) -> None:
+        """Test the number of simultaneous tasks is limited."""
+        limiter = RateLimiter(max_in_flight=3)
+        in_flight = [0]
+        peak = [0]
+
+        async def request() -> None:
+            async with limiter.async_acquire():
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+                await asyncio.sleep(0.01)
+                in_flight[0] -= 1
+
+        async def run() -> None:
+            await asyncio.gather(*(request() for _ in range(10)))
+
+        asyncio.run(run())
+        assert peak[0] == 3
+        assert limiter.requests == 10
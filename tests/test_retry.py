@@ -0,0 +1,80 @@
+"""Test sunweg.retry."""
+
+from datetime import datetime, timezone
+from unittest import TestCase
+
+from sunweg.const import SUNWEG_LOGIN_PATH, SUNWEG_PLANT_DETAIL_PATH
+from sunweg.retry import (
+    RetryBudget,
+    RetryPolicy,
+    default_retry_policy,
+    parse_retry_after,
+)
+
+
+class Retry_Test(TestCase):
+    """RetryPolicy test case."""
+
+    def test_parse_retry_after(self) -> None:
+        """Test Retry-After in seconds and as an HTTP date."""
+        now = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("5") == 5.0
+        assert parse_retry_after("-1") == 0.0
+        assert parse_retry_after("Wed, 01 May 2024 12:00:10 GMT", now) == 10.0
+        assert parse_retry_after("Wed, 01 May 2024 11:00:00 GMT", now) == 0.0
+        assert parse_retry_after("soon") is None
+
+    def test_delay_backoff(self) -> None:
+        """Test the delay is capped and stops after the last attempt."""
+        policy = RetryPolicy(max_attempts=10, backoff=1, max_backoff=4)
+        for attempt in range(1, 10):
+            delay = policy.delay(attempt)
+            assert delay is not None
+            assert 0 <= delay <= min(4, 2 ** (attempt - 1))
+        assert policy.delay(10) is None
+
+    def test_delay_retry_after(self) -> None:
+        """Test Retry-After is honoured up to the maximum."""
+        policy = RetryPolicy(max_retry_after=30)
+        assert policy.delay(1, "12") == 12.0
+        assert policy.delay(1, "120") is None
+
+    def test_is_retryable(self) -> None:
+        """Test transient statuses and connection errors are retryable."""
+        policy = RetryPolicy()
+        assert policy.is_retryable(None)
+        assert policy.is_retryable(503)
+        assert policy.is_retryable(429)
+        assert not policy.is_retryable(500)
+        assert not policy.is_retryable(401)
+
+    def test_for_path(self) -> None:
+        """Test endpoint overrides."""
+        login = RetryPolicy(max_attempts=1)
+        policy = RetryPolicy(endpoints={SUNWEG_LOGIN_PATH: login})
+        assert policy.for_path(SUNWEG_LOGIN_PATH) is login
+        assert policy.for_path(SUNWEG_PLANT_DETAIL_PATH + "1") is policy
+        assert login.delay(1) is None
+
+    def test_default_retry_policy(self) -> None:
+        """Test the default policy is budgeted and caps Retry-After."""
+        policy = default_retry_policy()
+        assert policy.budget is not None
+        assert policy.budget is not default_retry_policy().budget
+        assert policy.delay(1, "10") == 10.0
+        assert policy.delay(1, "60") is None
+
+    def test_budget(self) -> None:
+        """Test the budget is earned by requests and capped."""
+        budget = RetryBudget(ratio=0.5, min_retries=2)
+        assert budget.withdraw()
+        assert budget.withdraw()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert budget.withdraw()
+        for _ in range(10):
+            budget.deposit()
+        assert budget.balance == 2
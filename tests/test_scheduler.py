@@ -0,0 +1,158 @@
+"""Test sunweg.scheduler."""
+
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from sunweg.api import CircuitOpenError, SunWegApiError
+from sunweg.plant import Plant
+from sunweg.scheduler import PollingScheduler
+
+
+def make_plant(
+    last_update: datetime | None, today_energy: float = 1.0, id: int = 1
+) -> Plant:
+    """Build a plant updated at `last_update`."""
+    return Plant(
+        id, "Plant", 1.0, 0.0, 0.0, 0.0, today_energy, "kWh", 1.0, 0.0, last_update
+    )
+
+
+class Scheduler_Test(TestCase):
+    """PollingScheduler test case."""
+
+    def setUp(self) -> None:
+        """Set tests up without jitter."""
+        patcher = patch("sunweg.scheduler.random.random", return_value=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_add_poll(self) -> None:
+        """Test added plants are polled right away."""
+        now = datetime(2024, 5, 1, 10, 0)
+        api = MagicMock()
+        plant = make_plant(now)
+        api.refresh_plant.side_effect = lambda p: (make_plant(now, 2.0, p.id), True)
+        scheduler = PollingScheduler(api)
+        scheduler.add(plant, now)
+        scheduler.add(make_plant(now, id=2), now)
+        assert len(scheduler) == 2
+        assert scheduler.next_due() == now
+        changed = scheduler.poll_due(now)
+        assert [p.id for p in changed] == [1, 2]
+        assert scheduler.plant(1).today_energy == 2.0
+        assert scheduler.next_due() == now + timedelta(minutes=5)
+        assert scheduler.poll_due(now + timedelta(minutes=1)) == []
+
+    def test_cadence(self) -> None:
+        """Test plants are polled right after the predicted update."""
+        start = datetime(2024, 5, 1, 10, 0)
+        scheduler = PollingScheduler(MagicMock())
+        scheduler.add(make_plant(start), start)
+        scheduler.record(
+            make_plant(start + timedelta(minutes=10)),
+            True,
+            start + timedelta(minutes=10, seconds=5),
+        )
+        assert scheduler.cadence(1) == timedelta(minutes=10)
+        assert scheduler.next_due() == start + timedelta(minutes=20, seconds=35)
+        scheduler.record(
+            make_plant(start + timedelta(minutes=30)),
+            True,
+            start + timedelta(minutes=30, seconds=30),
+        )
+        assert scheduler.cadence(1) == timedelta(minutes=13)
+        assert scheduler.next_due() == start + timedelta(minutes=43, seconds=35)
+
+    def test_clock_offset(self) -> None:
+        """Test predictions hold when the API clock differs from the local one."""
+        api_start = datetime(2024, 5, 1, 10, 0)
+        offset = timedelta(hours=3, seconds=5)
+        scheduler = PollingScheduler(MagicMock())
+        scheduler.add(make_plant(api_start), api_start + offset)
+        for minutes in (10, 20, 30):
+            last_update = api_start + timedelta(minutes=minutes)
+            now = scheduler.next_due() if minutes > 10 else last_update + offset
+            scheduler.record(make_plant(last_update), True, now)
+            assert (
+                scheduler.next_due()
+                == last_update + timedelta(minutes=10, seconds=30) + offset
+            )
+
+    def test_late_update(self) -> None:
+        """Test polls back off while the update is late."""
+        start = datetime(2024, 5, 1, 10, 0)
+        scheduler = PollingScheduler(MagicMock())
+        scheduler.add(make_plant(start), start)
+        scheduler.record(make_plant(start + timedelta(minutes=30)), True, start)
+        now = start + timedelta(minutes=61)
+        late = make_plant(start + timedelta(minutes=30), 2.0)
+        scheduler.record(late, False, now)
+        assert scheduler.next_due() == now + timedelta(minutes=2)
+        scheduler.record(late, False, now)
+        assert scheduler.next_due() == now + timedelta(minutes=4)
+
+    def test_night_skip(self) -> None:
+        """Test flat plants are not polled at night."""
+        now = datetime(2024, 5, 1, 21, 0)
+        scheduler = PollingScheduler(MagicMock())
+        scheduler.add(make_plant(now, 5.0), now)
+        scheduler.record(make_plant(now, 5.0), False, now)
+        assert scheduler.next_due() == datetime(2024, 5, 2, 6, 0)
+        day = datetime(2024, 5, 2, 12, 0)
+        scheduler.record(make_plant(day, 5.0), False, day)
+        assert scheduler.next_due() == datetime(2024, 5, 2, 13, 0, 30)
+
+    def test_remove(self) -> None:
+        """Test removed plants are not polled."""
+        now = datetime(2024, 5, 1, 10, 0)
+        api = MagicMock()
+        scheduler = PollingScheduler(api)
+        scheduler.add(make_plant(now), now)
+        scheduler.remove(1)
+        assert scheduler.next_due() is None
+        assert scheduler.poll_due(now) == []
+        api.refresh_plant.assert_not_called()
+
+    def test_errors(self) -> None:
+        """Test failed polls back off and an open circuit stops the cycle."""
+        now = datetime(2024, 5, 1, 10, 0)
+        api = MagicMock()
+        api.circuit_breaker.retry_after = 20
+        api.refresh_plant.side_effect = [
+            SunWegApiError("Request failed"),
+            CircuitOpenError("Circuit open"),
+        ]
+        scheduler = PollingScheduler(api)
+        for id in range(1, 4):
+            scheduler.add(make_plant(now, id=id), now)
+        assert scheduler.poll_due(now) == []
+        assert api.refresh_plant.call_count == 2
+        assert scheduler.next_due() == now
+        scheduler.poll_due(now - timedelta(seconds=1))
+        assert api.refresh_plant.call_count == 2
+
+    def test_unexpected_error(self) -> None:
+        """Test a poll failing with any error keeps the plant scheduled."""
+        now = datetime(2024, 5, 1, 10, 0)
+        api = MagicMock()
+        api.refresh_plant.side_effect = [KeyError("AcumuladoPotencia"), TypeError()]
+        scheduler = PollingScheduler(api)
+        scheduler.add(make_plant(now, id=1), now)
+        scheduler.add(make_plant(now, id=2), now)
+        with self.assertLogs("sunweg.scheduler", "WARNING"):
+            assert scheduler.poll_due(now) == []
+        assert api.refresh_plant.call_count == 2
+        assert len(scheduler) == 2
+        assert scheduler.next_due() == now + timedelta(minutes=2)
+
+    def test_error_jitter(self) -> None:
+        """Test failed polls are rescheduled with a jitter."""
+        now = datetime(2024, 5, 1, 10, 0)
+        api = MagicMock()
+        api.refresh_plant.side_effect = SunWegApiError("Request failed")
+        scheduler = PollingScheduler(api)
+        scheduler.add(make_plant(now), now)
+        with patch("sunweg.scheduler.random.random", return_value=1.0):
+            scheduler.poll_due(now)
+        assert scheduler.next_due() == now + timedelta(minutes=2, seconds=30)
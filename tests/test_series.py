@@ -0,0 +1,63 @@
+"""Test sunweg.series."""
+
+from datetime import date
+from unittest import TestCase
+
+import numpy as np
+import pytest
+
+from sunweg.series import ProductionSeries
+from sunweg.util import ProductionStats
+
+
+class Series_Test(TestCase):
+    """ProductionSeries test case."""
+
+    def setUp(self) -> None:
+        """Set tests up."""
+        self.stats = [
+            ProductionStats(date(2024, 5, 1), 10.0, 12.0),
+            ProductionStats(date(2024, 5, 2), 14.0, 12.0),
+            ProductionStats(date(2024, 5, 3), 6.0, 0.0),
+        ]
+
+    def test_from_to_stats(self) -> None:
+        """Test conversion from and to production statistics."""
+        series = ProductionSeries.from_stats(self.stats)
+        assert len(series) == 3
+        assert series.dates[0] == np.datetime64("2024-05-01")
+        stats = series.to_stats()
+        assert [stat.date for stat in stats] == [stat.date for stat in self.stats]
+        assert [stat.production for stat in stats] == [10.0, 14.0, 6.0]
+        assert isinstance(stats[0].date, date)
+        assert series.__str__().startswith("<class 'sunweg.series.ProductionSeries'>")
+
+    def test_aggregations(self) -> None:
+        """Test vectorized aggregations."""
+        series = ProductionSeries.from_stats(self.stats)
+        assert series.total_production() == 30.0
+        assert series.total_prognostic() == 24.0
+        ratio = series.ratio()
+        assert ratio[0] == pytest.approx(10 / 12)
+        assert np.isnan(ratio[2])
+        assert series.shortfall().tolist() == [2.0, 0.0, 0.0]
+        rolling = series.rolling_mean(2)
+        assert np.isnan(rolling[0])
+        assert rolling[1:].tolist() == [12.0, 10.0]
+        assert np.isnan(series.rolling_mean(5)).all()
+        with pytest.raises(ValueError):
+            series.rolling_mean(0)
+
+    def test_concatenate(self) -> None:
+        """Test concatenating series."""
+        first = ProductionSeries.from_stats(self.stats[:2])
+        second = ProductionSeries.from_stats(self.stats[2:])
+        series = ProductionSeries.concatenate([first, second])
+        assert len(series) == 3
+        assert series.production.tolist() == [10.0, 14.0, 6.0]
+        assert len(ProductionSeries.concatenate([])) == 0
+
+    def test_length_mismatch(self) -> None:
+        """Test arrays with different lengths."""
+        with pytest.raises(ValueError):
+            ProductionSeries(np.array(["2024-05-01"]), np.array([1.0, 2.0]), [1.0])
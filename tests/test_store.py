@@ -0,0 +1,52 @@
+"""Test sunweg.store."""
+
+from datetime import date
+from unittest import TestCase
+
+from sunweg.store import ProductionStatsStore, is_month_closed
+from sunweg.util import ProductionStats
+
+
+class Store_Test(TestCase):
+    """ProductionStatsStore test case."""
+
+    def test_is_month_closed(self) -> None:
+        """Test month closing one day after it ends."""
+        assert not is_month_closed(2024, 5, date(2024, 5, 31))
+        assert not is_month_closed(2024, 5, date(2024, 6, 2))
+        assert is_month_closed(2024, 5, date(2024, 6, 3))
+        assert is_month_closed(2023, 12, date(2024, 1, 3))
+
+    def test_save_get(self) -> None:
+        """Test saving and merging month statistics."""
+        store = ProductionStatsStore()
+        assert store.get(1, None, 2024, 5) is None
+        store.save(
+            1,
+            None,
+            2024,
+            5,
+            [
+                ProductionStats(date(2024, 5, 2), 2.0, 1.5),
+                ProductionStats(date(2024, 5, 1), 1.0, 1.5),
+            ],
+        )
+        store.save(1, None, 2024, 5, [ProductionStats(date(2024, 5, 2), 3.0, 1.5)])
+        stats = store.get(1, None, 2024, 5, closed_only=True)
+        assert stats is not None
+        assert [(stat.date.day, stat.production) for stat in stats] == [
+            (1, 1.0),
+            (2, 3.0),
+        ]
+        assert store.get(1, 10, 2024, 5) is None
+        store.close()
+
+    def test_open_month(self) -> None:
+        """Test the current month is not served as closed."""
+        store = ProductionStatsStore()
+        today = date.today()
+        store.save(1, 2, today.year, today.month, [ProductionStats(today, 1.0, 1.0)])
+        assert store.get(1, 2, today.year, today.month, closed_only=True) is None
+        stats = store.get(1, 2, today.year, today.month)
+        assert stats is not None
+        assert len(stats) == 1
@@ -0,0 +1,39 @@
+"""Test sunweg.transport."""
+
+from unittest import TestCase
+
+from requests.adapters import HTTPAdapter
+
+from sunweg.const import SUNWEG_URL
+from sunweg.transport import TransportConfig
+
+
+class Transport_Test(TestCase):
+    """TransportConfig test case."""
+
+    def test_build_session_pool(self) -> None:
+        """Test the session adapter uses the pool settings."""
+        session = TransportConfig(pool_maxsize=32, pool_block=True).build_session()
+        adapter = session.get_adapter(SUNWEG_URL)
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+        assert session.headers["Connection"] == "keep-alive"
+
+    def test_build_session_custom_adapter(self) -> None:
+        """Test a custom adapter is mounted as is."""
+        adapter = HTTPAdapter(max_retries=3)
+        session = TransportConfig(adapter=adapter).build_session()
+        assert session.get_adapter(SUNWEG_URL) is adapter
+
+    def test_no_keep_alive(self) -> None:
+        """Test connections are closed when keep-alive is disabled."""
+        session = TransportConfig(keep_alive=False).build_session()
+        assert session.headers["Connection"] == "close"
+
+    def test_timeout(self) -> None:
+        """Test the requests timeout tuple."""
+        assert TransportConfig().timeout == (10, 30)
+        assert TransportConfig(connect_timeout=1, read_timeout=None).timeout == (
+            1,
+            None,
+        )
@@ -0,0 +1,96 @@
+"""Test sunweg.units."""
+
+from unittest import TestCase
+
+import pytest
+
+from sunweg.api import inverter_from_response, plant_from_response
+from sunweg.device import Inverter
+from sunweg.units import (
+    EnergyUnit,
+    PowerUnit,
+    canonical_sum,
+    canonical_values,
+    energy_unit,
+    power_unit,
+)
+from sunweg.util import Status
+
+from .common import load_response
+
+
+class Units_Test(TestCase):
+    """Units test case."""
+
+    def test_energy_unit(self) -> None:
+        """Test parsing energy metrics."""
+        assert energy_unit("Wh") == EnergyUnit.WH
+        assert energy_unit("kWh") == EnergyUnit.KWH
+        assert energy_unit("KWH") == EnergyUnit.KWH
+        assert energy_unit(" MWh ") == EnergyUnit.MWH
+        assert energy_unit("") == EnergyUnit.KWH
+        assert energy_unit("", EnergyUnit.WH) == EnergyUnit.WH
+        assert EnergyUnit.MWH.factor == 1e6
+        with self.assertLogs("sunweg.units", "WARNING"):
+            assert energy_unit("kW") is None
+
+    def test_power_unit(self) -> None:
+        """Test parsing power metrics."""
+        assert power_unit("W") == PowerUnit.W
+        assert power_unit("kw") == PowerUnit.KW
+        assert power_unit("MW") == PowerUnit.MW
+        assert power_unit("") == PowerUnit.KW
+        assert PowerUnit.KW.factor == 1e3
+        with self.assertLogs("sunweg.units", "WARNING"):
+            assert power_unit("kWh") is None
+
+    def test_canonical(self) -> None:
+        """Test converting and summing values of mixed units."""
+        values = [1.5, 250.0, 0.001]
+        units = [EnergyUnit.KWH, EnergyUnit.WH, EnergyUnit.MWH]
+        assert list(canonical_values(values, units)) == [1500.0, 250.0, 1000.0]
+        assert canonical_sum(values, units) == 2750.0
+        assert canonical_sum([], []) == 0.0
+        assert canonical_sum([0.1] * 10, [PowerUnit.W] * 10) == 1.0
+
+    def test_inverter(self) -> None:
+        """Test inverter values in canonical units."""
+        result = load_response("inverter_success_response.json")
+        for lazy in (False, True):
+            inverter = inverter_from_response(21255, result, lazy=lazy)
+            assert inverter.total_energy_unit == EnergyUnit.KWH
+            assert inverter.total_energy_wh == pytest.approx(23200.0)
+            assert inverter.power_unit == PowerUnit.KW
+        assert inverter.total_energy_unit == EnergyUnit.KWH
+        assert inverter.total_energy_wh == pytest.approx(23200.0)
+        assert inverter.today_energy_wh == 0.0
+        assert inverter.power_unit == PowerUnit.KW
+        inverter = Inverter(
+            1,
+            "Inverter",
+            "SN",
+            Status.OK,
+            40.0,
+            total_energy=2.5,
+            total_energy_metric="MWh",
+            power=800.0,
+            power_metric="W",
+        )
+        assert inverter.total_energy_wh == 2.5e6
+        assert inverter.power_w == 800.0
+        inverter.power_metric = "kW"
+        assert inverter.power_unit == PowerUnit.KW
+        assert inverter.power_w == 800e3
+        with self.assertLogs("sunweg.units", "WARNING"):
+            inverter.power_metric = "hp"
+        assert inverter.power_unit is None
+        assert inverter.power_w is None
+
+    def test_plant(self) -> None:
+        """Test plant values in canonical units."""
+        result = load_response("plant_success_response.json")
+        for lazy in (False, True):
+            plant = plant_from_response(16925, result, lazy=lazy)
+            assert plant.today_energy_unit == EnergyUnit.KWH
+            assert plant.today_energy_wh == pytest.approx(1230.0)
+            assert plant.total_energy_wh == pytest.approx(23200.0)
@@ -0,0 +1,148 @@
+"""Test sunweg.util."""
+
+from datetime import date
+import os
+from unittest import TestCase
+
+from dateutil import parser
+
+import pytest
+
+from sunweg.device import MPPT, Phase, String
+from sunweg.plant import PlantSummary
+from sunweg.util import (
+    PlantStatus,
+    ProductionStats,
+    Status,
+    months_between,
+    parse_date,
+    parse_datetime,
+    separate_value_metric,
+    slots_dict,
+)
+
+from .common import INVERTER_MOCK, PLANT_MOCK, RESPONSES, load_response
+
+VALUE_METRIC_KEYS = {
+    "AcumuladoPotencia",
+    "energiadia",
+    "energiaacumulada",
+    "energiadodia",
+    "potenciaativa",
+}
+
+
+def recorded_values(keys: set[str]) -> list[str]:
+    """Collect the string values of the given keys in the recorded responses."""
+    values: list[str] = []
+
+    def collect(node: object) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in keys and isinstance(value, str):
+                    values.append(value)
+                collect(value)
+        elif isinstance(node, list):
+            for item in node:
+                collect(item)
+
+    for file in sorted(os.listdir(RESPONSES)):
+        if file.endswith(".json"):
+            collect(load_response(file))
+    return values
+
+
+def split_value_metric(
+    value_with_metric: str, default_metric: str = "", metric_before: bool = False
+) -> tuple[float, str]:
+    """Separate value and metric splitting on spaces, as the API helper used to."""
+    split = value_with_metric.split(" ")
+    if len(split) < 2:
+        return (float(split[0].replace(",", ".")), default_metric)
+    if metric_before:
+        return (float(split[1].replace(",", ".")), split[0])
+    return (float(split[0].replace(",", ".")), split[1])
+
+
+class Util_Test(TestCase):
+    """Util test case."""
+
+    def test_months_between(self) -> None:
+        """Test listing the months of a date range."""
+        assert months_between(date(2023, 11, 15), date(2024, 2, 1)) == [
+            (2023, 11),
+            (2023, 12),
+            (2024, 1),
+            (2024, 2),
+        ]
+        assert months_between(date(2024, 5, 1), date(2024, 5, 31)) == [(2024, 5)]
+        assert months_between(date(2024, 5, 1), date(2024, 4, 30)) == []
+
+    def test_slots(self) -> None:
+        """Test models have no instance dict and keep their str."""
+        models = [
+            PLANT_MOCK,
+            PlantSummary(1, PlantStatus.CONNECTED),
+            INVERTER_MOCK,
+            MPPT("MPPT1"),
+            String("STR1", 1.0, 2.0, Status.OK),
+            Phase("A", 220.0, 1.0, Status.OK, Status.OK),
+            ProductionStats(date(2024, 5, 1), 1.0, 2.0),
+        ]
+        for model in models:
+            assert not hasattr(model, "__dict__")
+            with pytest.raises(AttributeError):
+                model.unknown = 1  # type: ignore[attr-defined]
+        assert slots_dict(models[-1]) == {
+            "_date": date(2024, 5, 1),
+            "_production": 1.0,
+            "_prognostic": 2.0,
+        }
+        assert str(models[3]) == (
+            str(MPPT) + ": " + str({"_name": "MPPT1", "_strings": []})
+        )
+
+    def test_separate_value_metric_equivalent(self) -> None:
+        """Test the value and metric parser against the split implementation."""
+        values = recorded_values(VALUE_METRIC_KEYS)
+        assert len(values) >= 5
+        values += ["12", "12,5", "0,00 kWh ", "1,5  kWh", "3 MWh x"]
+        for value in values:
+            assert separate_value_metric(value, "kWh") == split_value_metric(
+                value, "kWh"
+            ), value
+        for value in recorded_values({"economia"}) + ["R$ 12,78", "R$ 12,78 x"]:
+            assert separate_value_metric(
+                value, metric_before=True
+            ) == split_value_metric(value, metric_before=True), value
+        with pytest.raises(ValueError):
+            separate_value_metric("R$  12,78", metric_before=True)
+        assert separate_value_metric(None, "kW") == (0.0, "kW")
+        assert separate_value_metric("", "kW") == (0.0, "kW")
+
+    def test_parse_date_equivalent(self) -> None:
+        """Test the date parser against dateutil."""
+        values = recorded_values({"tempoatual"})
+        assert len(values) >= 2
+        values += [
+            "Sun, 31 Dec 2023 23:59:59 GMT",
+            "Thu, 29 Feb 2024 12:00:00 GMT",
+            "2024-02-29",
+            "May 3 2024",
+            "03/05/2024",
+        ]
+        for value in values:
+            assert parse_date(value) == parser.parse(value).date(), value
+        for value in ["2024-13-01", "Fri, 31 Feb 2024 00:00:00 GMT", "Fri, 03 Foo"]:
+            with pytest.raises(ValueError):
+                parse_date(value)
+
+    def test_parse_datetime_equivalent(self) -> None:
+        """Test the date and time parser against dateutil."""
+        values = recorded_values({"ultimaAtualizacao"})
+        assert len(values) >= 1
+        values += ["2024-02-29 23:59:59", "2024-05-03T10:00:00", "2024-05-03 10:00"]
+        for value in values:
+            assert parse_datetime(value) == parser.parse(value), value
+        with pytest.raises(ValueError):
+            parse_datetime("2024-05-03 25:00:00")